@@ -0,0 +1,239 @@
+"""Benchmark da geração de decks com curvas de escala
+
+Uso:
+    python benchmark.py                              # 10, 100, 1.000 e 10.000 slides, com e sem fotos
+    python benchmark.py -t 10 100 1000 -o base.json
+    python benchmark.py -t 10 100 1000 -r 3 --comparar base.json
+    python benchmark.py --inicio                     # partida a frio da CLI contra o orçamento
+
+Os decks são sintéticos: sem fotos, os slides do deck_brk.json em ciclo; com
+fotos, registros de ImageMetadata com imagens distintas geradas na hora (o
+tempo de gerá-las é descontado). Cada caso roda num processo novo, para que o
+pico de RSS seja só dele, com cache de imagens vazio. Por etapa são medidos o
+tempo de montagem dos slides, de preparo/incorporação das fotos (parte da
+montagem) e de gravação, além do pico de RSS e do tamanho do arquivo.
+
+Com --inicio, mede só a partida a frio do gerar_pptx.py (--help e um deck de um
+slide, cada execução num processo novo) e falha se passar de ORCAMENTO_AJUDA_S
+ou ORCAMENTO_INICIO_S.
+"""
+import argparse
+import io
+import itertools
+import json
+import os
+import platform
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+DIRETORIO = os.path.dirname(os.path.abspath(__file__))
+TAMANHOS_PADRAO = (10, 100, 1000, 10000)
+STATUS = ('Pendente', 'Concluido', 'Atrasado')
+MIN_DIFERENCA_S = 0.05  # abaixo disso a variação de tempo é ruído
+
+def _pico_rss_mb():
+    return round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1)
+
+def _foto_sintetica(n):
+    """JPEG 1600x1200 diferente para cada n (ruído + gradiente)"""
+    import numpy as np
+    from PIL import Image
+    rng = np.random.default_rng(n)
+    base = np.linspace(0, 255, 1600, dtype=np.float32)[None, :, None]
+    pixels = (base * 0.6 + rng.random((1200, 1, 3), dtype=np.float32) * 100).astype(np.uint8)
+    pixels = np.broadcast_to(pixels, (1200, 1600, 3)).copy()
+    pixels[::8] = rng.integers(0, 255, (150, 1600, 3), dtype=np.uint8)
+    saida = io.BytesIO()
+    Image.fromarray(pixels).save(saida, 'JPEG', quality=85)
+    return saida.getvalue()
+
+def slides_sinteticos(total, fotos, cronometro):
+    """Gera as specs dos slides sob demanda; o tempo gasto aqui vai para `cronometro['entrada']`"""
+    import base64
+    if not fotos:
+        with open(os.path.join(DIRETORIO, 'deck_brk.json'), encoding='utf-8') as f:
+            modelo = json.load(f)['slides']
+        yield from itertools.islice(itertools.cycle(modelo), total)
+        return
+    for n in range(total):
+        inicio = time.perf_counter()
+        registro = {
+            'tipo': 'foto',
+            'name': f'IMG_{n:05d}.jpg',
+            'status': STATUS[n % 3],
+            'description': f'Vistoria {n}: vazamento em ramal predial, calçada com afundamento.',
+            'date': '18/10/2026, 10:00:00',
+            'predictionDate': '2026-11-%02d' % (n % 28 + 1),
+            'Latitude': -25.43 + (n % 100) * 1e-3,
+            'Longitude': -49.27 - (n // 100) * 1e-3,
+            'thumbnail': 'data:image/jpeg;base64,' + base64.b64encode(_foto_sintetica(n)).decode(),
+        }
+        cronometro['entrada'] += time.perf_counter() - inicio
+        yield registro
+
+def medir_caso(total, fotos):
+    """Roda um caso no processo atual e devolve as medições"""
+    import imagens
+    import montagem
+    import pacote
+    import telemetria
+
+    cronometro = {'entrada': 0.0}
+    rss_inicial = _pico_rss_mb()
+    with tempfile.TemporaryDirectory() as pasta:
+        imagens.DIRETORIO_CACHE = os.path.join(pasta, 'cache')
+        saida = os.path.join(pasta, 'deck.pptx')
+
+        with telemetria.sessao() as medicao:
+            inicio = time.perf_counter()
+            prs = montagem.build_deck({'slides': slides_sinteticos(total, fotos, cronometro)})
+            montado = time.perf_counter()
+            rss_build = _pico_rss_mb()
+            pacote.salvar(prs, saida)
+            fim = time.perf_counter()
+        tamanho = os.path.getsize(saida)
+
+    build = montado - inicio - cronometro['entrada']
+    imagens_s = medicao.etapas['add_picture_fit'][1]
+    return {
+        'slides': total,
+        'fotos': fotos,
+        'build_s': round(build - imagens_s, 4),
+        'imagens_s': round(imagens_s, 4),
+        'save_s': round(fim - montado, 4),
+        'total_s': round(build + fim - montado, 4),
+        'slides_por_s': round(total / (build + fim - montado), 1),
+        'rss_inicial_mb': rss_inicial,
+        'rss_pico_build_mb': rss_build,
+        'rss_pico_mb': _pico_rss_mb(),
+        'bytes': tamanho,
+        'telemetria': medicao.relatorio(por_slide=False),
+    }
+
+def rodar_caso(total, fotos, repeticoes=1):
+    """Roda um caso em processos novos e fica com a execução mais rápida"""
+    comando = [sys.executable, os.path.abspath(__file__), '--caso', str(total), '--com-fotos' if fotos else '--sem-fotos']
+    execucoes = []
+    for _ in range(repeticoes):
+        resultado = subprocess.run(comando, cwd=DIRETORIO, capture_output=True, text=True)
+        if resultado.returncode != 0:
+            raise RuntimeError(f"caso {total} slides{' com fotos' if fotos else ''} falhou:\n{resultado.stderr}")
+        execucoes.append(json.loads(resultado.stdout))
+    return min(execucoes, key=lambda caso: caso['total_s'])
+
+def medir_inicio(repeticoes=5):
+    """Partida a frio da CLI em processos novos; vale a execução mais rápida de cada caso"""
+    with open(os.path.join(DIRETORIO, 'deck_brk.json'), encoding='utf-8') as f:
+        capa = json.load(f)['slides'][0]
+    with tempfile.TemporaryDirectory() as pasta:
+        spec = os.path.join(pasta, 'trivial.json')
+        with open(spec, 'w', encoding='utf-8') as f:
+            json.dump({'slides': [capa]}, f)
+        casos = {
+            'ajuda_s': ['--help'],
+            'deck_trivial_s': [spec, '-o', os.path.join(pasta, 'trivial.pptx')],
+        }
+        tempos = {}
+        for caso, argumentos in casos.items():
+            execucoes = []
+            for _ in range(repeticoes):
+                inicio = time.perf_counter()
+                subprocess.run([sys.executable, os.path.join(DIRETORIO, 'gerar_pptx.py'), *argumentos],
+                               cwd=DIRETORIO, capture_output=True, check=True)
+                execucoes.append(time.perf_counter() - inicio)
+            tempos[caso] = round(min(execucoes), 4)
+    return tempos
+
+def _commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', 'HEAD'], cwd=DIRETORIO, capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def ambiente():
+    """Commit e máquina, para comparar resultados entre execuções"""
+    import pptx
+    return {
+        'commit': _commit(),
+        'data': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'python': platform.python_version(),
+        'python_pptx': pptx.__version__,
+        'maquina': platform.platform(),
+        'cpus': os.cpu_count(),
+    }
+
+def comparar(atual, anterior, limite):
+    """Imprime a variação por caso e devolve quantos casos pioraram além de `limite`"""
+    casos_anteriores = {(c['slides'], c['fotos']): c for c in anterior['casos']}
+    regressoes = 0
+    print(f"\nComparação com {anterior.get('commit') or '?'} ({anterior.get('data', '?')}):")
+    for caso in atual['casos']:
+        base = casos_anteriores.get((caso['slides'], caso['fotos']))
+        if base is None:
+            continue
+        tempo = caso['total_s'] / base['total_s'] if base['total_s'] else 1
+        memoria = caso['rss_pico_mb'] / base['rss_pico_mb'] if base['rss_pico_mb'] else 1
+        pior = ((tempo > 1 + limite and caso['total_s'] - base['total_s'] > MIN_DIFERENCA_S)
+                or memoria > 1 + limite)
+        regressoes += pior
+        print(f"{'⚠️ ' if pior else '  '} {caso['slides']:>6} slides {'com fotos' if caso['fotos'] else 'sem fotos'}: "
+              f"tempo {tempo - 1:+.0%}, RSS {memoria - 1:+.0%}")
+    return regressoes
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark da geração de decks")
+    parser.add_argument('-t', '--tamanhos', type=int, nargs='+', default=TAMANHOS_PADRAO, help="quantidades de slides (padrão: 10 100 1000 10000)")
+    parser.add_argument('-r', '--repeticoes', type=int, default=1, help="execuções por caso; vale a mais rápida (padrão: 1)")
+    parser.add_argument('--so-texto', action='store_true', help="só decks sem fotos")
+    parser.add_argument('-o', '--saida', help="arquivo JSON de resultados (padrão: benchmark_<commit>.json)")
+    parser.add_argument('--comparar', metavar='JSON', help="resultado anterior para comparar")
+    parser.add_argument('--limite', type=float, default=0.10, help="piora relativa tolerada na comparação (padrão: 0.10)")
+    parser.add_argument('--inicio', action='store_true', help="mede só a partida a frio do gerar_pptx.py contra o orçamento")
+    parser.add_argument('--caso', type=int, help=argparse.SUPPRESS)
+    parser.add_argument('--com-fotos', dest='fotos', action='store_true', help=argparse.SUPPRESS)
+    parser.add_argument('--sem-fotos', dest='fotos', action='store_false', help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.caso is not None:
+        # Processo filho: um caso, resultado em JSON no stdout
+        json.dump(medir_caso(args.caso, args.fotos), sys.stdout)
+        return 0
+
+    if args.inicio:
+        import gerar_pptx
+        tempos = medir_inicio(max(args.repeticoes, 5))
+        estouros = 0
+        for caso, orcamento in (('ajuda_s', gerar_pptx.ORCAMENTO_AJUDA_S), ('deck_trivial_s', gerar_pptx.ORCAMENTO_INICIO_S)):
+            estourou = tempos[caso] > orcamento
+            estouros += estourou
+            print(f"{'⚠️ ' if estourou else '✅'} {caso[:-2]}: {tempos[caso]:.3f}s (orçamento {orcamento:.2f}s)")
+        return 1 if estouros else 0
+
+    resultado = ambiente()
+    resultado['casos'] = []
+    for fotos in (False,) if args.so_texto else (False, True):
+        for total in args.tamanhos:
+            caso = rodar_caso(total, fotos, args.repeticoes)
+            resultado['casos'].append(caso)
+            print(f"⏱️  {total:>6} slides {'com fotos' if fotos else 'sem fotos'}: {caso['total_s']:.2f}s "
+                  f"(build {caso['build_s']:.2f}s, imagens {caso['imagens_s']:.2f}s, save {caso['save_s']:.2f}s), "
+                  f"pico {caso['rss_pico_mb']:.0f} MB, {caso['bytes'] / 1e6:.1f} MB", flush=True)
+
+    saida = args.saida or f"benchmark_{(resultado['commit'] or 'local')[:8]}.json"
+    with open(saida, 'w', encoding='utf-8') as f:
+        json.dump(resultado, f, ensure_ascii=False, indent=2)
+    print(f"📁 Resultados: {saida}")
+
+    if args.comparar:
+        with open(args.comparar, encoding='utf-8') as f:
+            anterior = json.load(f)
+        if comparar(resultado, anterior, args.limite):
+            return 1
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,133 @@
+"""Componentes pré-estilizados (caixa, texto, cabeçalho, cards, passos, listas)
+
+Cada forma estilizada é montada uma única vez com python-pptx, guardada como
+XML em cache e depois copiada (deepcopy) para os slides. Assim o preenchimento,
+a borda e a fonte não são refeitos atributo por atributo a cada card.
+"""
+from pptx import Presentation
+from pptx.oxml.ns import qn
+from pptx.shapes.autoshape import Shape
+from pptx.util import Inches, Pt
+import copy
+import functools
+
+from estilo import COR_AZUL, COR_BRANCO, COR_CIANO, COR_FUNDO, COR_TEXTO
+import telemetria
+
+@functools.lru_cache(maxsize=1)
+def _rascunho():
+    """Slide descartável onde os moldes são montados"""
+    prs = Presentation()
+    return prs.slides.add_slide(prs.slide_layouts[6])
+
+def _destacar(shape):
+    """Remove a forma do rascunho e devolve seu XML como molde"""
+    sp = shape._element
+    sp.getparent().remove(sp)
+    return sp
+
+@functools.lru_cache(maxsize=None)
+def molde_caixa(forma, fill, line, line_width):
+    """XML de caixa preenchida com borda"""
+    box = _rascunho().shapes.add_shape(forma, 0, 0, 0, 0)
+    box.fill.solid()
+    box.fill.fore_color.rgb = fill
+    if line is not None:
+        box.line.color.rgb = line
+        box.line.width = Pt(line_width)
+    return _destacar(box)
+
+@functools.lru_cache(maxsize=None)
+def molde_texto(font_size, bold, color, subtitulo=None):
+    """XML de caixa de texto com a fonte já definida no parágrafo
+
+    `subtitulo` (tamanho, cor) acrescenta um segundo parágrafo estilizado.
+    """
+    txBox = _rascunho().shapes.add_textbox(0, 0, 0, 0)
+    tf = txBox.text_frame
+    tf.word_wrap = True
+    p = tf.paragraphs[0]
+    p.font.size = Pt(font_size)
+    p.font.bold = bold
+    p.font.color.rgb = color
+    if subtitulo:
+        p2 = tf.add_paragraph()
+        p2.font.size = Pt(subtitulo[0])
+        p2.font.color.rgb = subtitulo[1]
+    return _destacar(txBox)
+
+_CNVPR = '%s/%s' % (qn('p:nvSpPr'), qn('p:cNvPr'))
+_XFRM = '%s/%s' % (qn('p:spPr'), qn('a:xfrm'))
+
+def carimbar(slide, molde, left, top, width, height):
+    """Insere uma cópia do molde no slide e devolve a forma"""
+    shapes = slide.shapes
+    sp = copy.deepcopy(molde)
+    shape_id = shapes._next_shape_id
+    cNvPr = sp.find(_CNVPR)
+    cNvPr.set('id', str(shape_id))
+    cNvPr.set('name', '%s %d' % (cNvPr.get('name').rsplit(' ', 1)[0], shape_id - 1))
+    # Acesso direto ao lxml: os setters de posição do python-pptx refazem buscas a cada atributo
+    off, ext = sp.find(_XFRM)
+    off.set('x', str(int(left)))
+    off.set('y', str(int(top)))
+    ext.set('cx', str(int(width)))
+    ext.set('cy', str(int(height)))
+    shapes._spTree.insert_element_before(sp, 'p:extLst')
+    return Shape(sp, shapes)
+
+@telemetria.medir()
+def caixa(slide, left, top, width, height, fill=COR_AZUL, line=COR_CIANO, line_width=2, forma=1):
+    """Caixa preenchida com borda"""
+    return carimbar(slide, molde_caixa(forma, fill, line, line_width), left, top, width, height)
+
+@telemetria.medir()
+def texto(slide, text, left, top, width, height, font_size=18, bold=False, color=COR_BRANCO):
+    """Caixa de texto de um parágrafo"""
+    txBox = carimbar(slide, molde_texto(font_size, bold, color), left, top, width, height)
+    txBox._element.txBody.p_lst[0].append_text(text)
+    return txBox
+
+@telemetria.medir()
+def cabecalho(slide, titulo, subtitulo=""):
+    """Faixa azul do topo com título e subtítulo opcional"""
+    caixa(slide, Inches(0), Inches(0), Inches(16), Inches(1.5), line_width=4)
+    molde = molde_texto(40, True, COR_CIANO, (20, COR_TEXTO) if subtitulo else None)
+    txBox = carimbar(slide, molde, Inches(0.5), Inches(0.3), Inches(15), Inches(1))
+    paragrafos = txBox._element.txBody.p_lst
+    paragrafos[0].append_text(titulo)
+    if subtitulo:
+        paragrafos[1].append_text(subtitulo)
+    return txBox
+
+@telemetria.medir()
+def cartao_metrica(slide, number, label, left, top):
+    """Card com número em destaque e rótulo"""
+    caixa(slide, left, top, Inches(4), Inches(2))
+    texto(slide, number, left, top + Inches(0.3), Inches(4), Inches(1), 60, True, COR_CIANO)
+    texto(slide, label, left, top + Inches(1.2), Inches(4), Inches(0.7), 16, False, COR_TEXTO)
+
+@telemetria.medir()
+def passo_numerado(slide, num, titulo, desc, top, left=Inches(0.8), width=Inches(14.7), altura=Inches(0.8),
+                   tamanho_desc=14):
+    """Marcador numerado seguido de caixa (de `altura`, a partir de top - 0,1in) com título e descrição"""
+    caixa(slide, left, top, Inches(0.6), Inches(0.6), fill=COR_CIANO, line=None, forma=3)
+    texto(slide, num, left, top, Inches(0.6), Inches(0.6), 24, True, COR_FUNDO)
+
+    x = left + Inches(1.2)
+    caixa(slide, x, top - Inches(0.1), width - Inches(1.2), altura)
+    texto(slide, titulo, x + Inches(0.2), top - Inches(0.05), width - Inches(1.7), Inches(0.3), 20, True, COR_CIANO)
+    texto(slide, desc, x + Inches(0.2), top + Inches(0.28), width - Inches(1.7), altura - Inches(0.3), tamanho_desc, False, COR_TEXTO)
+
+@telemetria.medir()
+def lista_duas_colunas(slide, pares, top, passo=Inches(0.9), font_size=18):
+    """Linhas de caixas lado a lado (esquerda, direita)"""
+    for esq, dir in pares:
+        caixa(slide, Inches(0.5), top, Inches(7.2), Inches(0.7))
+        texto(slide, esq, Inches(0.7), top + Inches(0.15), Inches(6.8), Inches(0.5), font_size, False, COR_BRANCO)
+
+        caixa(slide, Inches(8.3), top, Inches(7.2), Inches(0.7))
+        texto(slide, dir, Inches(8.5), top + Inches(0.15), Inches(6.8), Inches(0.5), font_size, False, COR_BRANCO)
+
+        top += passo
+    return top
@@ -0,0 +1,344 @@
+"""Índice SQLite dos registros ImageMetadata e consultas por status, datas e região
+
+Os registros ingeridos vão para um banco SQLite local: as colunas filtráveis
+(status, data da foto, previsão, latitude, longitude) ficam numa tabela com
+índices B-tree, a posição numa tabela R*Tree e o JSON completo, com a
+thumbnail, numa tabela à parte, lida só para os registros selecionados.
+Um registro é identificado pelo nome e pela data da foto: indexar de novo o
+mesmo backup atualiza os registros no lugar em vez de duplicá-los.
+
+Uso:
+    python consulta.py indexar ingest.jsonl backup.json --banco fotos.sqlite
+    python consulta.py buscar --status Atrasado --raio -25.43 -49.27 2000 --ultimos-dias 30 --pptx atrasados.pptx
+    python consulta.py buscar --poligono bairro.geojson --previsao-ate 2026-10-31 --pdf bairro.pdf --kmz bairro.kmz
+    python consulta.py buscar --poligono="-25.40,-49.30;-25.40,-49.25;-25.45,-49.25" -o pontos.jsonl
+    python consulta.py buscar --status Pendente -o - | python gerar_planilha.py /dev/stdin -o pendentes.xlsx
+
+Lista de vértices começando com "-" vai com "=" (--poligono="-25.4,..."), senão
+o argparse a toma por uma opção.
+
+Raio e polígono primeiro restringem os candidatos pelo retângulo envolvente no
+R*Tree e depois testam a distância (Haversine) ou o ponto no polígono só
+nesses candidatos. A consulta devolve os registros na ordem de ingestão e roda
+uma vez só: com mais de uma saída (-o, --pptx, --pdf, --kmz), o resultado vai
+para um JSONL temporário que cada gerador relê.
+"""
+import argparse
+import datetime
+import json
+import math
+import sqlite3
+import sys
+import tempfile
+import time
+
+import coordenadas
+import metadados
+
+BANCO_PADRAO = 'fotos.sqlite'
+LOTE = 10000
+RAIO_TERRA = 6371e3  # mesmo raio de coordenadas.calcular_distancia
+
+ESQUEMA = """
+CREATE TABLE IF NOT EXISTS registros (
+    id INTEGER PRIMARY KEY,
+    status TEXT,
+    data TEXT,      -- 'AAAA-MM-DD HH:MM:SS'
+    previsao TEXT,  -- 'AAAA-MM-DD'
+    latitude REAL,
+    longitude REAL,
+    chave TEXT      -- identidade do registro (_chave)
+);
+CREATE TABLE IF NOT EXISTS dados (id INTEGER PRIMARY KEY, json TEXT NOT NULL);
+CREATE VIRTUAL TABLE IF NOT EXISTS posicoes USING rtree(id, lat_min, lat_max, lon_min, lon_max);
+"""
+INDICE_CHAVE = 'CREATE UNIQUE INDEX IF NOT EXISTS registros_chave ON registros(chave)'
+INDICES = """
+CREATE INDEX IF NOT EXISTS registros_status_data ON registros(status, data);
+CREATE INDEX IF NOT EXISTS registros_status_previsao ON registros(status, previsao);
+CREATE INDEX IF NOT EXISTS registros_data ON registros(data);
+CREATE INDEX IF NOT EXISTS registros_previsao ON registros(previsao);
+"""
+
+def conectar(caminho=BANCO_PADRAO):
+    """Abre (ou cria) o banco com as tabelas e a função distancia_m registrada"""
+    conexao = sqlite3.connect(caminho)
+    conexao.execute('PRAGMA journal_mode = WAL')  # leitores (servidor, outras consultas) não esperam a ingestão
+    conexao.executescript(ESQUEMA)
+    if 'chave' not in {coluna[1] for coluna in conexao.execute('PRAGMA table_info(registros)')}:
+        conexao.execute('ALTER TABLE registros ADD COLUMN chave TEXT')  # banco anterior à chave
+    conexao.execute(INDICE_CHAVE)
+    conexao.create_function('distancia_m', 4, _distancia_m, deterministic=True)
+    return conexao
+
+def _distancia_m(lat1, lon1, lat2, lon2):
+    if lat1 is None or lon1 is None:
+        return None
+    return coordenadas.calcular_distancia(lat1, lon1, lat2, lon2)
+
+def _linha(registro):
+    """Colunas filtráveis de um registro (status ausente conta como Pendente, como nos relatórios)"""
+    data = metadados.ler_data(registro.get('date'))
+    previsao = metadados.ler_previsao(registro.get('predictionDate'))
+    lat = coordenadas.normalizar_coordenada(registro.get('Latitude'))
+    lon = coordenadas.normalizar_coordenada(registro.get('Longitude'))
+    return (registro.get('status') or "Pendente",
+            data.isoformat(' ', 'seconds') if data else None,
+            previsao.isoformat() if previsao else None,
+            None if lat == "N/A" else float(lat),
+            None if lon == "N/A" else float(lon))
+
+def _chave(registro):
+    """Identidade do registro: nome e data da foto como vieram no backup (sem nome, o registro inteiro)"""
+    if registro.get('name'):
+        return json.dumps([registro['name'], registro.get('date')], ensure_ascii=False)
+    return json.dumps(registro, sort_keys=True, ensure_ascii=False)
+
+def _gravar_lote(conexao, lote):
+    """Grava o lote; registro já indexado mantém o id (e a ordem de ingestão) e é substituído"""
+    proximo = conexao.execute('SELECT coalesce(max(id), 0) + 1 FROM registros').fetchone()[0]
+    ids, por_id = {}, {}
+    for registro in lote:
+        chave = _chave(registro)
+        if chave not in ids:
+            existente = conexao.execute('SELECT id FROM registros WHERE chave = ?', (chave,)).fetchone()
+            if existente:
+                ids[chave] = existente[0]
+            else:
+                ids[chave] = proximo
+                proximo += 1
+        por_id[ids[chave]] = (chave, registro)  # repetido no lote: vale o último
+    linhas = {i: _linha(registro) for i, (_, registro) in por_id.items()}
+    conexao.executemany('INSERT OR REPLACE INTO registros (id, status, data, previsao, latitude, longitude, chave) '
+                        'VALUES (?, ?, ?, ?, ?, ?, ?)',
+                        [(i, *linhas[i], chave) for i, (chave, _) in por_id.items()])
+    conexao.executemany('INSERT OR REPLACE INTO dados VALUES (?, ?)',
+                        [(i, json.dumps(registro, ensure_ascii=False)) for i, (_, registro) in por_id.items()])
+    # A posição antiga sai do R*Tree mesmo que a nova não tenha coordenadas
+    conexao.executemany('DELETE FROM posicoes WHERE id = ?', [(i,) for i in por_id])
+    conexao.executemany('INSERT INTO posicoes VALUES (?, ?, ?, ?, ?)',
+                        [(i, lat, lat, lon, lon) for i, (_, _, _, lat, lon) in linhas.items()
+                         if lat is not None and lon is not None])
+
+def indexar(conexao, registros, lote=LOTE):
+    """Acrescenta ou atualiza os registros numa transação; devolve quantos foram lidos
+
+    Os índices B-tree são criados depois da carga quando ainda não existem.
+    """
+    total = 0
+    conexao.execute('PRAGMA synchronous = OFF')
+    with conexao:
+        pendentes = []
+        for registro in registros:
+            pendentes.append(registro)
+            if len(pendentes) == lote:
+                _gravar_lote(conexao, pendentes)
+                total += len(pendentes)
+                pendentes = []
+        if pendentes:
+            _gravar_lote(conexao, pendentes)
+            total += len(pendentes)
+        conexao.executescript(INDICES)
+    conexao.execute('PRAGMA synchronous = FULL')
+    conexao.execute('ANALYZE')
+    return total
+
+def ler_poligono(texto):
+    """Vértices (lat, lon) de um arquivo GeoJSON (Polygon, Feature ou FeatureCollection)
+    ou de uma lista "lat,lon;lat,lon;..." """
+    if ';' in texto:
+        return [tuple(float(v) for v in ponto.split(',')) for ponto in texto.split(';') if ponto.strip()]
+    with open(texto, encoding='utf-8') as f:
+        geojson = json.load(f)
+    if geojson.get('type') == 'FeatureCollection':
+        geojson = geojson['features'][0]
+    if geojson.get('type') == 'Feature':
+        geojson = geojson['geometry']
+    if geojson.get('type') != 'Polygon':
+        raise ValueError(f"GeoJSON deve conter um Polygon, não {geojson.get('type')!r}")
+    return [(lat, lon) for lon, lat, *_ in geojson['coordinates'][0]]  # anel externo, em lon/lat
+
+def dentro_do_poligono(lat, lon, vertices):
+    """Teste do raio (par-ímpar) em graus: bom para polígonos de bairro ou município"""
+    if lat is None or lon is None:
+        return False
+    dentro = False
+    anterior_lat, anterior_lon = vertices[-1]
+    for vertice_lat, vertice_lon in vertices:
+        if (vertice_lat > lat) != (anterior_lat > lat):
+            cruzamento = vertice_lon + (lat - vertice_lat) * (anterior_lon - vertice_lon) / (anterior_lat - vertice_lat)
+            if lon < cruzamento:
+                dentro = not dentro
+        anterior_lat, anterior_lon = vertice_lat, vertice_lon
+    return dentro
+
+def _retangulo_raio(lat, lon, metros):
+    """Retângulo (lat_min, lat_max, lon_min, lon_max) que contém o círculo"""
+    dlat = math.degrees(metros / RAIO_TERRA)
+    cos_lat = math.cos(math.radians(lat))
+    dlon = 180.0 if cos_lat < 1e-9 else min(180.0, math.degrees(metros / (RAIO_TERRA * cos_lat)))
+    return lat - dlat, lat + dlat, lon - dlon, lon + dlon
+
+def montar_consulta(conexao, status=None, data_de=None, data_ate=None, previsao_de=None, previsao_ate=None,
+                    raio=None, poligono=None):
+    """Cláusula WHERE e parâmetros para os filtros dados (todos combinados com E)
+
+    Datas são datetime.date e inclusivas; `raio` é (lat, lon, metros) e
+    `poligono` uma lista de vértices (lat, lon).
+    """
+    condicoes, parametros = [], []
+    if status:
+        condicoes.append(f"r.status IN ({', '.join('?' * len(status))})")
+        parametros.extend(status)
+    if data_de:
+        condicoes.append('r.data >= ?')
+        parametros.append(data_de.isoformat())
+    if data_ate:
+        condicoes.append('r.data < ?')  # até o fim do dia
+        parametros.append((data_ate + datetime.timedelta(days=1)).isoformat())
+    if previsao_de:
+        condicoes.append('r.previsao >= ?')
+        parametros.append(previsao_de.isoformat())
+    if previsao_ate:
+        condicoes.append('r.previsao <= ?')
+        parametros.append(previsao_ate.isoformat())
+
+    retangulos = []
+    if raio:
+        lat, lon, metros = raio
+        retangulos.append(_retangulo_raio(lat, lon, metros))
+    if poligono:
+        lats, lons = [v[0] for v in poligono], [v[1] for v in poligono]
+        retangulos.append((min(lats), max(lats), min(lons), max(lons)))
+        conexao.create_function('no_poligono', 2, lambda la, lo: dentro_do_poligono(la, lo, poligono),
+                                deterministic=True)
+    for lat_min, lat_max, lon_min, lon_max in retangulos:
+        # O R*Tree guarda float32 arredondado para fora: o teste exato vem depois, nas colunas REAL
+        condicoes.append('r.id IN (SELECT id FROM posicoes WHERE lat_max >= ? AND lat_min <= ? '
+                         'AND lon_max >= ? AND lon_min <= ?)')
+        parametros.extend((lat_min, lat_max, lon_min, lon_max))
+    if raio:
+        condicoes.append('distancia_m(r.latitude, r.longitude, ?, ?) <= ?')
+        parametros.extend(raio)
+    if poligono:
+        condicoes.append('no_poligono(r.latitude, r.longitude)')
+    return ' AND '.join(condicoes) or '1', parametros
+
+def contar(conexao, **filtros):
+    onde, parametros = montar_consulta(conexao, **filtros)
+    return conexao.execute(f'SELECT count(*) FROM registros r WHERE {onde}', parametros).fetchone()[0]
+
+def buscar(conexao, limite=None, **filtros):
+    """Gera os registros ImageMetadata (dicts, com thumbnail) que atendem aos filtros"""
+    onde, parametros = montar_consulta(conexao, **filtros)
+    sql = f'SELECT d.json FROM registros r JOIN dados d ON d.id = r.id WHERE {onde} ORDER BY r.id'
+    if limite:
+        sql += ' LIMIT ?'
+        parametros.append(limite)
+    for (texto,) in conexao.execute(sql, parametros):
+        yield json.loads(texto)
+
+def _gravar_jsonl(registros, arquivo):
+    for registro in registros:
+        arquivo.write(json.dumps(registro, ensure_ascii=False) + '\n')
+
+def _data(texto):
+    try:
+        return datetime.date.fromisoformat(texto)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"data inválida: {texto!r} (use AAAA-MM-DD)")
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Índice SQLite e consultas sobre registros ImageMetadata")
+    subcomandos = parser.add_subparsers(dest='comando', required=True)
+
+    indexacao = subcomandos.add_parser('indexar', help="acrescenta (ou atualiza) backups JSON/JSONL no banco")
+    indexacao.add_argument('backups', nargs='+', help="backups JSON/JSONL de ImageMetadata")
+    indexacao.add_argument('--banco', default=BANCO_PADRAO, help=f"arquivo SQLite (padrão: {BANCO_PADRAO})")
+
+    busca = subcomandos.add_parser('buscar', help="filtra os registros e gera os relatórios")
+    busca.add_argument('--banco', default=BANCO_PADRAO, help=f"arquivo SQLite (padrão: {BANCO_PADRAO})")
+    busca.add_argument('--status', nargs='+', choices=metadados.STATUS, help="um ou mais status")
+    inicio_periodo = busca.add_mutually_exclusive_group()
+    inicio_periodo.add_argument('--data-de', type=_data, metavar='AAAA-MM-DD', help="fotos tiradas a partir do dia")
+    inicio_periodo.add_argument('--ultimos-dias', type=int, metavar='N', help="fotos tiradas nos últimos N dias")
+    busca.add_argument('--data-ate', type=_data, metavar='AAAA-MM-DD', help="fotos tiradas até o dia (inclusive)")
+    busca.add_argument('--previsao-de', type=_data, metavar='AAAA-MM-DD', help="previsão a partir do dia")
+    busca.add_argument('--previsao-ate', type=_data, metavar='AAAA-MM-DD', help="previsão até o dia (inclusive)")
+    busca.add_argument('--raio', nargs=3, type=float, metavar=('LAT', 'LON', 'METROS'), help="fotos a até METROS do ponto")
+    busca.add_argument('--poligono', metavar='GEOJSON', help="arquivo GeoJSON com um Polygon ou lista \"lat,lon;lat,lon;...\"")
+    busca.add_argument('--limite', type=int, help="no máximo N registros")
+    busca.add_argument('-o', '--saida', help="registros em JSONL ('-' para stdout)")
+    busca.add_argument('--pptx', help="gera o relatório fotográfico .pptx")
+    busca.add_argument('--pdf', help="gera o relatório .pdf")
+    busca.add_argument('--kmz', help="gera o .kmz com os pontos")
+    args = parser.parse_args(argv)
+
+    if args.comando == 'indexar':
+        conexao = conectar(args.banco)
+        inicio = time.perf_counter()
+        total = sum(indexar(conexao, metadados.iterar_registros(backup)) for backup in args.backups)
+        segundos = time.perf_counter() - inicio
+        print(f"✅ {total} registros indexados em {segundos:.2f}s")
+        print(f"📁 Arquivo: {args.banco}")
+        return
+
+    filtros = {'status': args.status, 'data_de': args.data_de, 'data_ate': args.data_ate,
+               'previsao_de': args.previsao_de, 'previsao_ate': args.previsao_ate, 'raio': args.raio}
+    if args.ultimos_dias is not None:
+        filtros['data_de'] = datetime.date.today() - datetime.timedelta(days=args.ultimos_dias)
+    if args.poligono:
+        try:
+            filtros['poligono'] = ler_poligono(args.poligono)
+        except (OSError, ValueError, KeyError, IndexError) as erro:
+            parser.error(f"--poligono: {erro}")
+        if len(filtros['poligono']) < 3:
+            parser.error("--poligono precisa de pelo menos 3 vértices")
+
+    conexao = conectar(args.banco)
+    inicio = time.perf_counter()
+    total = contar(conexao, **filtros)
+    if args.limite:
+        total = min(total, args.limite)
+    # Com JSONL em stdout, as mensagens vão para stderr
+    mensagens = sys.stderr if args.saida == '-' else sys.stdout
+    print(f"🔎 {total} registros em {(time.perf_counter() - inicio) * 1000:.1f} ms", file=mensagens)
+
+    resultado = buscar(conexao, args.limite, **filtros)
+    if sum(1 for s in (args.saida, args.pptx, args.pdf, args.kmz) if s) > 1:
+        copia = tempfile.TemporaryFile('w+', encoding='utf-8')
+        _gravar_jsonl(resultado, copia)
+
+        def registros():
+            copia.seek(0)
+            return (json.loads(linha) for linha in copia)
+    else:
+        def registros():
+            return resultado
+
+    if args.saida:
+        saida = sys.stdout if args.saida == '-' else open(args.saida, 'w', encoding='utf-8')
+        try:
+            _gravar_jsonl(registros(), saida)
+        finally:
+            if saida is not sys.stdout:
+                saida.close()
+        if args.saida != '-':
+            print(f"📁 Arquivo: {args.saida}", file=mensagens)
+    # Geradores importados só quando pedidos (python-pptx, reportlab e lxml)
+    if args.pptx:
+        import montagem
+        import pacote
+        pacote.salvar(montagem.build_deck({'slides': (dict(r, tipo='foto') for r in registros())}), args.pptx)
+        print(f"📁 Arquivo: {args.pptx}", file=mensagens)
+    if args.pdf:
+        import gerar_pdf
+        gerar_pdf.gerar_pdf(registros(), args.pdf)
+        print(f"📁 Arquivo: {args.pdf}", file=mensagens)
+    if args.kmz:
+        import gerar_kmz
+        gerar_kmz.gerar_kmz(registros(), args.kmz)
+        print(f"📁 Arquivo: {args.kmz}", file=mensagens)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,48 @@
+"""Coordenadas: mesma lógica de lib/coordinates.ts e lib/coordinate-utils.ts"""
+import math
+
+def normalizar_coordenada(valor):
+    """Número válido ou "N/A" (trata None, strings vazias, "null", "undefined"...)"""
+    if valor is None or isinstance(valor, bool):
+        return "N/A"
+    if isinstance(valor, (int, float)):
+        return "N/A" if math.isnan(valor) else valor
+    if isinstance(valor, str):
+        texto = valor.strip()
+        if texto in ("", "N/A", "null", "undefined"):
+            return "N/A"
+        try:
+            return float(texto)
+        except ValueError:
+            return "N/A"
+    return "N/A"
+
+def tem_coordenadas_validas(registro):
+    """Verifica se o registro ImageMetadata possui latitude e longitude válidas"""
+    return (normalizar_coordenada(registro.get('Latitude')) != "N/A"
+            and normalizar_coordenada(registro.get('Longitude')) != "N/A")
+
+def formatar_gps(lat, lon):
+    """Coordenadas com 6 casas decimais ou "N/A" """
+    lat, lon = normalizar_coordenada(lat), normalizar_coordenada(lon)
+    if lat == "N/A" or lon == "N/A":
+        return "N/A"
+    return f"{lat:.6f}, {lon:.6f}"
+
+def calcular_utm(latitude, longitude):
+    """Easting e northing UTM formatados como "e, n" ou "N/A" (fórmulas em geodesia.utm)"""
+    lat, lon = normalizar_coordenada(latitude), normalizar_coordenada(longitude)
+    if lat == "N/A" or lon == "N/A":
+        return "N/A"
+    import geodesia  # NumPy só quando há coordenada para converter
+    _, _, easting, northing = geodesia.utm(lat, lon)
+    return f"{float(easting):.3f}, {float(northing):.3f}"
+
+def calcular_distancia(lat1, lon1, lat2, lon2):
+    """Distância em metros pela fórmula de Haversine (raio médio 6371 km)"""
+    R = 6371e3
+    phi1, phi2 = math.radians(lat1), math.radians(lat2)
+    dphi = math.radians(lat2 - lat1)
+    dlmb = math.radians(lon2 - lon1)
+    a = math.sin(dphi / 2) ** 2 + math.cos(phi1) * math.cos(phi2) * math.sin(dlmb / 2) ** 2
+    return R * 2 * math.atan2(math.sqrt(a), math.sqrt(1 - a))
@@ -0,0 +1,277 @@
+"""Índice espacial e agrupamento de pontos de fotos (Latitude/Longitude)
+
+O índice é uma grade regular em graus guardada em formato CSR (pontos
+ordenados por célula + início de cada célula), o que permite consultas por
+raio e por retângulo sem percorrer todos os pontos. O agrupamento usa a mesma
+ideia: células de tamanho eps/√2 com pelo menos `min_pontos` são núcleos,
+núcleos a até duas células formam um grupo e os demais pontos entram no grupo
+do ponto de núcleo mais próximo até `eps` metros. Em núcleos densos (mais de
+DENSA pontos) a distância vai até a subcélula 4x menor mais próxima, sem
+comparar com cada ponto; aí o ponto solto fica a até 1,25·eps de algum ponto
+do núcleo. É uma aproximação de DBSCAN que
+agrupa 100k pontos em poucos décimos de segundo, mas mais permissiva: duas
+células núcleo ligadas diretamente podem estar a até 3 células de lado eps/√2
+de distância em cada eixo, ou seja, pontos a até 3·eps uns dos outros (o
+DBSCAN só ligaria a até eps). Os grupos tendem a ser maiores que os do DBSCAN
+com o mesmo eps.
+"""
+from collections import Counter
+import math
+
+import numpy as np
+
+import geodesia
+from coordenadas import normalizar_coordenada
+
+METROS_POR_GRAU = 111320.0
+METROS_POR_GRAU_MIN = 110574.0  # grau de latitude no equador (menor valor)
+DENSA = 64  # núcleos com mais pontos são medidos pelas subcélulas, não ponto a ponto
+FINO = 4  # subdivisões por lado da célula núcleo densa
+
+def coordenadas_validas(registros):
+    """Arrays (lat, lon) dos registros ImageMetadata; inválidas viram NaN"""
+    lat = np.array([normalizar_coordenada(r.get('Latitude')) for r in registros], dtype=object)
+    lon = np.array([normalizar_coordenada(r.get('Longitude')) for r in registros], dtype=object)
+    lat[lat == "N/A"] = np.nan
+    lon[lon == "N/A"] = np.nan
+    return lat.astype(np.float64), lon.astype(np.float64)
+
+class IndiceEspacial:
+    """Grade de células de `celula_m` metros sobre arrays de latitude/longitude"""
+
+    def __init__(self, lat, lon, celula_m=500.0):
+        self.lat = np.asarray(lat, dtype=np.float64)
+        self.lon = np.asarray(lon, dtype=np.float64)
+        validos = np.flatnonzero(np.isfinite(self.lat) & np.isfinite(self.lon))
+
+        lat_ref = float(np.max(np.abs(self.lat[validos]))) if validos.size else 0.0
+        self.dlat = celula_m / METROS_POR_GRAU
+        self.dlon = celula_m / (METROS_POR_GRAU * max(math.cos(math.radians(lat_ref)), 1e-6))
+
+        ix, iy = self._celula(self.lat[validos], self.lon[validos])
+        chaves = self._chave(ix, iy)
+        ordem = np.argsort(chaves, kind='stable')
+        self.pontos = validos[ordem]
+        self.chaves, self.inicio = np.unique(chaves[ordem], return_index=True)
+        self.fim = np.append(self.inicio[1:], len(self.pontos))
+
+    def _celula(self, lat, lon):
+        return (np.floor((np.asarray(lon) + 180) / self.dlon).astype(np.int64),
+                np.floor((np.asarray(lat) + 90) / self.dlat).astype(np.int64))
+
+    @staticmethod
+    def _chave(ix, iy):
+        return np.asarray(ix, dtype=np.int64) * (1 << 32) + np.asarray(iy, dtype=np.int64)
+
+    def retangulo(self, lat_min, lon_min, lat_max, lon_max):
+        """Índices dos pontos dentro do retângulo (graus)"""
+        (ix0, ix1), (iy0, iy1) = (np.floor((np.array([lon_min, lon_max]) + 180) / self.dlon).astype(np.int64),
+                                  np.floor((np.array([lat_min, lat_max]) + 90) / self.dlat).astype(np.int64))
+        n_celulas = (ix1 - ix0 + 1) * (iy1 - iy0 + 1)
+        if n_celulas > len(self.chaves):
+            candidatos = self.pontos  # retângulo maior que a área ocupada: filtra direto
+        else:
+            gx, gy = np.meshgrid(np.arange(ix0, ix1 + 1), np.arange(iy0, iy1 + 1), indexing='ij')
+            candidatos = self._pontos_das_celulas(self._chave(gx.ravel(), gy.ravel()))
+        la, lo = self.lat[candidatos], self.lon[candidatos]
+        dentro = (la >= lat_min) & (la <= lat_max) & (lo >= lon_min) & (lo <= lon_max)
+        return np.sort(candidatos[dentro])
+
+    def raio(self, lat, lon, raio_m):
+        """Índices dos pontos a até `raio_m` metros de (lat, lon), do mais próximo ao mais distante"""
+        dlat = raio_m / METROS_POR_GRAU_MIN
+        lat_borda = min(abs(lat) + dlat, 89.9)
+        dlon = raio_m / (METROS_POR_GRAU_MIN * math.cos(math.radians(lat_borda)))
+        candidatos = self.retangulo(lat - dlat, lon - dlon, lat + dlat, lon + dlon)
+        d = geodesia.haversine(lat, lon, self.lat[candidatos], self.lon[candidatos])
+        dentro = d <= raio_m
+        return candidatos[dentro][np.argsort(d[dentro], kind='stable')]
+
+    def _pontos_das_celulas(self, chaves):
+        if not len(self.chaves):
+            return np.empty(0, dtype=np.int64)
+        pos = np.searchsorted(self.chaves, chaves)
+        pos[pos == len(self.chaves)] = 0
+        pos = pos[self.chaves[pos] == chaves]
+        if not pos.size:
+            return np.empty(0, dtype=np.int64)
+        return np.concatenate([self.pontos[i:j] for i, j in zip(self.inicio[pos], self.fim[pos])])
+
+def _projetar(lat, lon):
+    """Projeção equiretangular local (metros), centrada na latitude média"""
+    lat0 = math.radians(float(np.nanmean(lat))) if np.isfinite(lat).any() else 0.0
+    x = np.radians(lon) * geodesia.RAIO_MEDIO * math.cos(lat0)
+    y = np.radians(lat) * geodesia.RAIO_MEDIO
+    return x, y
+
+def _componentes(pares, n):
+    """Rótulo do componente conexo de cada nó (propagação do menor rótulo)"""
+    rotulo = np.arange(n)
+    if not len(pares):
+        return rotulo
+    a, b = pares[:, 0], pares[:, 1]
+    while True:
+        menor = np.minimum(rotulo[a], rotulo[b])
+        novo = rotulo.copy()
+        np.minimum.at(novo, a, menor)
+        np.minimum.at(novo, b, menor)
+        novo = novo[novo]  # salto de ponteiro acelera a convergência
+        if np.array_equal(novo, rotulo):
+            return rotulo
+        rotulo = novo
+
+def _subcelula_mais_proxima(x, y, soltos, membros, grupo, lado, eps_m, melhor_d, melhor_g, k):
+    """Atualiza melhor_d/melhor_g[k] com a subcélula (de `lado` metros) de `membros` mais próxima
+
+    A distância é a do ponto solto ao retângulo da subcélula, até eps_m: são
+    no máximo (2·eps/lado + 3)² consultas por ponto, por mais membros que haja.
+    """
+    chaves, primeiro = np.unique(np.floor(x[membros] / lado).astype(np.int64) * (1 << 32)
+                                 + np.floor(y[membros] / lado).astype(np.int64), return_index=True)
+    grupo_sub = grupo[membros[primeiro]]
+    sx, sy = x[soltos], y[soltos]
+    px, py = np.floor(sx / lado).astype(np.int64), np.floor(sy / lado).astype(np.int64)
+    alcance = int(math.ceil(eps_m / lado)) + 1
+    for dx in range(-alcance, alcance + 1):
+        for dy in range(-alcance, alcance + 1):
+            if (max(abs(dx) - 1, 0) ** 2 + max(abs(dy) - 1, 0) ** 2) * lado * lado > eps_m * eps_m:
+                continue  # nenhum ponto dessa subcélula pode estar a até eps
+            vx, vy = px + dx, py + dy
+            vizinha = vx * (1 << 32) + vy
+            pos = np.searchsorted(chaves, vizinha)
+            pos[pos == len(chaves)] = 0
+            i = np.flatnonzero(chaves[pos] == vizinha)
+            if not i.size:
+                continue
+            ddx = np.maximum(np.maximum(vx[i] * lado - sx[i], sx[i] - (vx[i] + 1) * lado), 0)
+            ddy = np.maximum(np.maximum(vy[i] * lado - sy[i], sy[i] - (vy[i] + 1) * lado), 0)
+            d = np.hypot(ddx, ddy)
+            melhor = (d <= eps_m) & (d < melhor_d[k[i]])
+            melhor_d[k[i[melhor]]] = d[melhor]
+            melhor_g[k[i[melhor]]] = grupo_sub[pos[i[melhor]]]
+
+def agrupar(lat, lon, eps_m=100.0, min_pontos=5):
+    """Agrupamento estilo DBSCAN em grade; devolve rótulos (-1 = ruído/sem coordenadas)"""
+    lat, lon = np.asarray(lat, dtype=np.float64), np.asarray(lon, dtype=np.float64)
+    n = len(lat)
+    rotulos = np.full(n, -1, dtype=np.int64)
+    validos = np.flatnonzero(np.isfinite(lat) & np.isfinite(lon))
+    if not validos.size:
+        return rotulos
+
+    # Células com diagonal eps: quaisquer dois pontos da mesma célula estão a até eps
+    lado = eps_m / math.sqrt(2)
+    x, y = _projetar(lat[validos], lon[validos])
+    cx = np.floor(x / lado).astype(np.int64)
+    cy = np.floor(y / lado).astype(np.int64)
+    chaves, primeiro, celula, contagem = np.unique(
+        cx * (1 << 32) + cy, return_index=True, return_inverse=True, return_counts=True)
+    ucx, ucy = cx[primeiro], cy[primeiro]
+
+    nucleo = np.flatnonzero(contagem >= min_pontos)
+    if not nucleo.size:
+        return rotulos
+
+    # Liga núcleos a até 2 células de distância: cobre todo par a até eps, mas aceita até 3·eps
+    chaves_nucleo = chaves[nucleo]
+    pares = []
+    for dx in range(-2, 3):
+        for dy in range(-2, 3):
+            if (dx, dy) <= (0, 0):
+                continue
+            vizinha = (ucx[nucleo] + dx) * (1 << 32) + (ucy[nucleo] + dy)
+            pos = np.searchsorted(chaves_nucleo, vizinha)
+            pos[pos == len(nucleo)] = 0
+            achou = chaves_nucleo[pos] == vizinha
+            pares.append(np.column_stack([np.flatnonzero(achou), pos[achou]]))
+    comp = _componentes(np.concatenate(pares), len(nucleo))
+
+    grupo_da_celula = np.full(len(chaves), -1, dtype=np.int64)
+    _, grupo_da_celula[nucleo] = np.unique(comp, return_inverse=True)
+    grupo = grupo_da_celula[celula]
+
+    # Pontos fora de núcleos: grupo do núcleo vizinho mais próximo até eps
+    soltos = np.flatnonzero(grupo < 0)
+    if soltos.size:
+        melhor_d = np.full(soltos.size, np.inf)
+        melhor_g = np.full(soltos.size, -1, dtype=np.int64)
+        ordem = np.argsort(celula, kind='stable')
+        inicio = np.searchsorted(celula[ordem], np.arange(len(chaves)))
+        for dx in range(-2, 3):
+            for dy in range(-2, 3):
+                vizinha = (cx[soltos] + dx) * (1 << 32) + (cy[soltos] + dy)
+                pos = np.searchsorted(chaves, vizinha)
+                pos[pos == len(chaves)] = 0
+                k = np.flatnonzero((chaves[pos] == vizinha) & (grupo_da_celula[pos] >= 0) & (contagem[pos] <= DENSA))
+                if not k.size:
+                    continue
+                # Expande (ponto solto, membro da célula núcleo) e pega a menor distância por ponto
+                c = pos[k]
+                n_m = contagem[c]
+                partida = np.cumsum(n_m) - n_m
+                deslocamento = np.arange(n_m.sum()) - np.repeat(partida, n_m)
+                membros = ordem[np.repeat(inicio[c], n_m) + deslocamento]
+                p = np.repeat(soltos[k], n_m)
+                d = np.minimum.reduceat(np.hypot(x[membros] - x[p], y[membros] - y[p]), partida)
+                melhor = (d <= eps_m) & (d < melhor_d[k])
+                melhor_d[k[melhor]] = d[melhor]
+                melhor_g[k[melhor]] = grupo_da_celula[c[melhor]]
+
+        # Núcleos densos: a distância vai até as subcélulas, sem comparar com cada membro
+        densas = nucleo[contagem[nucleo] > DENSA]
+        if densas.size:
+            chaves_densas = chaves[densas]
+            perto = np.zeros(soltos.size, dtype=bool)
+            for dx in range(-2, 3):
+                for dy in range(-2, 3):
+                    vizinha = (cx[soltos] + dx) * (1 << 32) + (cy[soltos] + dy)
+                    pos = np.searchsorted(chaves_densas, vizinha)
+                    pos[pos == len(densas)] = 0
+                    perto |= chaves_densas[pos] == vizinha
+            k = np.flatnonzero(perto)
+            membros = np.flatnonzero(np.isin(celula, densas))
+            _subcelula_mais_proxima(x, y, soltos[k], membros, grupo, lado / FINO, eps_m, melhor_d, melhor_g, k)
+        grupo[soltos] = melhor_g
+
+    rotulos[validos] = grupo
+    return rotulos
+
+def resumir_grupos(registros, rotulos, lat, lon):
+    """Resumo por grupo: total, contagem por status, centro, raio e previsões"""
+    grupos = []
+    com_grupo = np.flatnonzero(rotulos >= 0)
+    ordem = com_grupo[np.argsort(rotulos[com_grupo], kind='stable')]
+    _, inicio = np.unique(rotulos[ordem], return_index=True)
+    for membros in np.split(ordem, inicio[1:]) if ordem.size else []:
+        centro_lat, centro_lon = float(np.mean(lat[membros])), float(np.mean(lon[membros]))
+        raio = float(np.max(geodesia.haversine(centro_lat, centro_lon, lat[membros], lon[membros])))
+        status = Counter(registros[i].get('status') or "Pendente" for i in membros)
+        previsoes = sorted(p for p in (registros[i].get('predictionDate') for i in membros) if p)
+        grupos.append({
+            'total': int(membros.size),
+            'status': dict(status),
+            'centro': [centro_lat, centro_lon],
+            'raio_m': raio,
+            'previsao_min': previsoes[0] if previsoes else None,
+            'previsao_max': previsoes[-1] if previsoes else None,
+        })
+    # Grupos com mais atrasos primeiro, depois os maiores; numerados nessa ordem
+    grupos.sort(key=lambda g: (-g['status'].get('Atrasado', 0), -g['total']))
+    for i, g in enumerate(grupos, 1):
+        g['nome'] = f"Grupo {i}"
+    return grupos
+
+def slides_grupos(grupos, titulo="Resumo por Região", por_slide=6):
+    """Specs de slide 'grupos', paginadas em até `por_slide` cards"""
+    paginas = max(1, math.ceil(len(grupos) / por_slide))
+    for p in range(paginas):
+        sufixo = f" ({p + 1}/{paginas})" if paginas > 1 else ""
+        yield {'tipo': 'grupos', 'titulo': titulo + sufixo, 'grupos': grupos[p * por_slide:(p + 1) * por_slide]}
+
+def grupos_do_arquivo(caminho, eps_m=100.0, min_pontos=5):
+    """Lê o backup JSON/JSONL (sem guardar thumbnails) e devolve o resumo dos grupos"""
+    from metadados import iterar_registros
+    campos = ('Latitude', 'Longitude', 'status', 'predictionDate')
+    registros = [{c: r.get(c) for c in campos} for r in iterar_registros(caminho)]
+    lat, lon = coordenadas_validas(registros)
+    return resumir_grupos(registros, agrupar(lat, lon, eps_m, min_pontos), lat, lon)
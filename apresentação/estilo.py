@@ -0,0 +1,23 @@
+from pptx.dml.color import RGBColor
+from pptx.util import Inches
+
+# Cores corporativas
+COR_FUNDO = RGBColor(10, 14, 39)  # #0a0e27
+COR_AZUL = RGBColor(30, 60, 114)  # #1e3c72
+COR_CIANO = RGBColor(0, 212, 255)  # #00d4ff
+COR_BRANCO = RGBColor(255, 255, 255)
+COR_TEXTO = RGBColor(184, 197, 214)  # #b8c5d6
+COR_VERDE = RGBColor(16, 185, 129)  # #10b981
+COR_VERMELHO = RGBColor(239, 68, 68)  # #ef4444
+
+# Cor de destaque por status de ImageMetadata
+COR_STATUS = {
+    "Pendente": COR_CIANO,
+    "Concluido": COR_VERDE,
+    "Atrasado": COR_VERMELHO,
+}
+
+# Área da foto no slide de foto e na página do PDF: o mesmo tamanho alvo faz
+# os dois relatórios usarem a mesma entrada do cache de imagens
+LARGURA_FOTO = Inches(8.8)
+ALTURA_FOTO = Inches(6.3)
@@ -0,0 +1,384 @@
+"""Extração de GPS/EXIF de fotos de campo para registros ImageMetadata
+
+Equivalente de servidor do readImageMetadata da aplicação web
+(lib/image-processor.ts): gera o mesmo formato de types/image-metadata.ts, em
+JSONL (padrão) ou array JSON, que o gerar_pptx.py --fotos e a importação JSON
+da aplicação leem.
+
+Uso:
+    python extrair_exif.py fotos/ -o ingest.jsonl
+    python extrair_exif.py fotos/ -o backup.json --formato json --miniatura reduzida
+
+Cada arquivo é mapeado com mmap e só o cabeçalho é lido: os segmentos JPEG até
+o APP1 (EXIF), onde estão as coordenadas e a miniatura embutida pela câmera. Um
+TIFF já é o próprio bloco EXIF; PNG, WebP e HEIC (este com o plugin
+pillow-heif) têm o EXIF lido pelo Pillow. Fotos sem EXIF saem sem coordenadas e
+são avisadas no stderr. As fotos são processadas num pool de threads e os
+registros saem na ordem dos arquivos.
+
+Miniaturas (campo thumbnail):
+    exif      miniatura embutida no EXIF, sem ler a imagem (padrão)
+    reduzida  foto decodificada em escala reduzida e recomprimida (lê o arquivo todo)
+    original  arquivo inteiro em base64, como o navegador faz
+    nenhuma   campo vazio
+"""
+from concurrent.futures import ThreadPoolExecutor
+import argparse
+import base64
+import collections
+import datetime
+import functools
+import io
+import itertools
+import json
+import mimetypes
+import mmap
+import os
+import struct
+import sys
+import time
+
+import metadados
+
+EXTENSOES_FOTO = ('.jpg', '.jpeg', '.jpe', '.jfif', '.png', '.heic', '.heif', '.tif', '.tiff', '.webp')
+MINIATURAS = ('exif', 'reduzida', 'original', 'nenhuma')
+LADO_REDUZIDA = 1280
+DIAS_PREVISAO = 7
+
+# Tags EXIF
+_IFD_GPS = 0x8825
+_ORIENTACAO = 0x0112
+_MINIATURA_INICIO = 0x0201
+_MINIATURA_TAMANHO = 0x0202
+_GPS_LAT_REF, _GPS_LAT, _GPS_LON_REF, _GPS_LON = 1, 2, 3, 4
+_RACIONAIS = {5: 'I', 10: 'i'}  # RATIONAL e SRATIONAL
+_CABECALHOS_TIFF = (b'II*\x00', b'MM\x00*')
+
+def segmento_exif(dados):
+    """Bytes TIFF do APP1 "Exif" de um JPEG, ou None; só percorre os marcadores do cabeçalho"""
+    if dados[:2] != b'\xff\xd8':
+        return None
+    pos = 2
+    while pos + 4 <= len(dados):
+        if dados[pos] != 0xFF:
+            return None
+        marcador = dados[pos + 1]
+        if marcador == 0xFF:  # bytes de preenchimento
+            pos += 1
+            continue
+        if marcador == 0x01 or 0xD0 <= marcador <= 0xD7:  # marcadores sem tamanho
+            pos += 2
+            continue
+        if marcador in (0xD9, 0xDA):  # fim da imagem / início dos dados: não há APP1
+            return None
+        tamanho = int.from_bytes(dados[pos + 2:pos + 4], 'big')
+        if marcador == 0xE1 and dados[pos + 4:pos + 10] == b'Exif\x00\x00':
+            return dados[pos + 10:pos + 2 + tamanho]
+        pos += 2 + tamanho
+    return None
+
+@functools.lru_cache(maxsize=1)
+def _pillow():
+    """Módulo PIL.Image, com HEIC/HEIF registrado quando o plugin pillow-heif está instalado"""
+    from PIL import Image  # Pillow só para os formatos que o leitor de cabeçalho não cobre
+    try:
+        import pillow_heif
+    except ImportError:
+        pass
+    else:
+        pillow_heif.register_heif_opener()
+    return Image
+
+def exif_pillow(caminho):
+    """Bytes TIFF do EXIF de uma foto que não é JPEG nem TIFF (PNG, WebP, HEIC...), ou None"""
+    with _pillow().open(caminho) as img:
+        exif = img.getexif()
+        if not exif:
+            return None
+        dados = exif.tobytes()
+    return dados[6:] if dados[:6] == b'Exif\x00\x00' else dados
+
+class _Tiff:
+    """Leitura das IFDs de um bloco TIFF (EXIF)"""
+
+    def __init__(self, dados):
+        if dados[:2] == b'II':
+            self.ordem = '<'
+        elif dados[:2] == b'MM':
+            self.ordem = '>'
+        else:
+            raise ValueError("cabeçalho TIFF inválido")
+        self.dados = dados
+
+    def u32(self, pos):
+        return struct.unpack_from(self.ordem + 'I', self.dados, pos)[0]
+
+    def ifd(self, pos):
+        """({tag: (tipo, quantidade, posição do valor)}, posição da próxima IFD)"""
+        total = struct.unpack_from(self.ordem + 'H', self.dados, pos)[0]
+        entradas = {}
+        for i in range(total):
+            entrada = pos + 2 + 12 * i
+            tag, tipo, quantidade = struct.unpack_from(self.ordem + 'HHI', self.dados, entrada)
+            entradas[tag] = (tipo, quantidade, entrada + 8)
+        return entradas, self.u32(pos + 2 + 12 * total)
+
+    def inteiro(self, entrada):
+        tipo, _, pos = entrada
+        return struct.unpack_from(self.ordem + ('H' if tipo == 3 else 'I'), self.dados, pos)[0]
+
+    def texto(self, entrada):
+        _, quantidade, pos = entrada
+        if quantidade > 4:
+            pos = self.u32(pos)
+        return self.dados[pos:pos + quantidade].split(b'\x00')[0].decode('ascii', 'replace').strip()
+
+    def racionais(self, entrada):
+        tipo, quantidade, pos = entrada
+        if tipo not in _RACIONAIS:
+            raise ValueError(f"tipo {tipo} não é racional")
+        valores = struct.unpack_from(self.ordem + _RACIONAIS[tipo] * 2 * quantidade, self.dados, self.u32(pos))
+        return [n / d for n, d in zip(valores[::2], valores[1::2])]
+
+def _dms_para_decimal(dms, negativo):
+    """Graus/minutos/segundos para graus decimais (convertDMSToDD)"""
+    if len(dms) < 3:
+        return 0
+    decimal = dms[0] + dms[1] / 60 + dms[2] / 3600
+    return -decimal if negativo else decimal
+
+def ler_exif(tiff):
+    """{'latitude', 'longitude', 'orientacao', 'miniatura'} de um bloco TIFF/EXIF"""
+    t = _Tiff(tiff)
+    ifd0, proxima = t.ifd(t.u32(4))
+    resultado = {'latitude': "N/A", 'longitude': "N/A", 'orientacao': 1, 'miniatura': None}
+    if _ORIENTACAO in ifd0:
+        resultado['orientacao'] = t.inteiro(ifd0[_ORIENTACAO])
+
+    if _IFD_GPS in ifd0:
+        try:
+            gps, _ = t.ifd(t.inteiro(ifd0[_IFD_GPS]))
+            if _GPS_LAT in gps and _GPS_LON in gps:
+                lat_ref = t.texto(gps[_GPS_LAT_REF]) if _GPS_LAT_REF in gps else 'N'
+                lon_ref = t.texto(gps[_GPS_LON_REF]) if _GPS_LON_REF in gps else 'E'
+                resultado['latitude'] = _dms_para_decimal(t.racionais(gps[_GPS_LAT]), lat_ref == 'S')
+                resultado['longitude'] = _dms_para_decimal(t.racionais(gps[_GPS_LON]), lon_ref == 'W')
+        except (struct.error, ValueError, ZeroDivisionError):
+            resultado['latitude'] = resultado['longitude'] = "N/A"
+
+    # IFD1 guarda a miniatura JPEG que a câmera grava junto do EXIF
+    if proxima:
+        try:
+            ifd1, _ = t.ifd(proxima)
+            if _MINIATURA_INICIO in ifd1 and _MINIATURA_TAMANHO in ifd1:
+                inicio = t.inteiro(ifd1[_MINIATURA_INICIO])
+                miniatura = tiff[inicio:inicio + t.inteiro(ifd1[_MINIATURA_TAMANHO])]
+                if miniatura[:2] == b'\xff\xd8':
+                    resultado['miniatura'] = bytes(miniatura)
+        except struct.error:
+            pass
+    return resultado
+
+def _girar(miniatura, orientacao):
+    """Aplica a orientação EXIF da foto à miniatura (que não tem EXIF próprio)"""
+    from PIL import Image
+    transposicoes = {2: [Image.FLIP_LEFT_RIGHT], 3: [Image.ROTATE_180], 4: [Image.FLIP_TOP_BOTTOM],
+                     5: [Image.ROTATE_90, Image.FLIP_TOP_BOTTOM], 6: [Image.ROTATE_270],
+                     7: [Image.ROTATE_270, Image.FLIP_TOP_BOTTOM], 8: [Image.ROTATE_90]}
+    with Image.open(io.BytesIO(miniatura)) as img:
+        img = img.convert('RGB')
+        for transposicao in transposicoes.get(orientacao, []):
+            img = img.transpose(transposicao)
+        saida = io.BytesIO()
+        img.save(saida, 'JPEG', quality=90)
+        return saida.getvalue()
+
+def _reduzida(caminho):
+    """Foto decodificada em escala reduzida (draft do JPEG) e recomprimida"""
+    from PIL import ImageOps
+    with _pillow().open(caminho) as original:
+        original.draft('RGB', (LADO_REDUZIDA, LADO_REDUZIDA))
+        img = ImageOps.exif_transpose(original).convert('RGB')
+        img.thumbnail((LADO_REDUZIDA, LADO_REDUZIDA))
+        saida = io.BytesIO()
+        img.save(saida, 'JPEG', quality=85)
+        return saida.getvalue()
+
+def _data_uri(dados, tipo='image/jpeg'):
+    return f'data:{tipo};base64,' + base64.b64encode(dados).decode('ascii') if dados else ""
+
+def _miniatura(caminho, exif, tipo, miniatura):
+    """Conteúdo do campo thumbnail no modo `miniatura`"""
+    if miniatura == 'exif':
+        thumbnail = exif['miniatura'] or b''
+        if thumbnail and exif['orientacao'] != 1:
+            thumbnail = _girar(thumbnail, exif['orientacao'])
+        return _data_uri(thumbnail)
+    if miniatura == 'reduzida':
+        return _data_uri(_reduzida(caminho))
+    if miniatura == 'original':
+        with open(caminho, 'rb') as f:
+            return _data_uri(f.read(), tipo)
+    return ""
+
+def _ler_exif(tiff):
+    """(exif, motivo): EXIF corrompido sai como None, e o registro sem coordenadas, como no navegador"""
+    if not tiff:
+        return None, "EXIF não encontrado"
+    try:
+        return ler_exif(tiff), None
+    except (struct.error, ValueError) as erro:
+        return None, f"EXIF corrompido: {erro}"
+
+def registro(caminho, indice, previsao, miniatura='exif', ao_avisar=None, ao_sem_exif=None):
+    """Registro ImageMetadata de uma foto
+
+    Se a miniatura não puder ser gerada (imagem truncada ou num formato que o
+    Pillow não lê), o registro sai sem thumbnail, mantendo GPS e data, e o erro
+    vai para ao_avisar(caminho, erro). Foto sem EXIF legível sai sem
+    coordenadas e o motivo vai para ao_sem_exif(caminho, motivo).
+    """
+    info = os.stat(caminho)
+    tipo = mimetypes.guess_type(caminho)[0] or ""
+    exif, motivo, pillow = None, "arquivo vazio", False
+    if info.st_size:
+        with open(caminho, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as dados:
+            if dados[:2] == b'\xff\xd8':
+                exif, motivo = _ler_exif(segmento_exif(dados))
+            elif dados[:4] in _CABECALHOS_TIFF:
+                exif, motivo = _ler_exif(dados)
+            else:
+                pillow = True
+        if pillow:
+            try:
+                exif, motivo = _ler_exif(exif_pillow(caminho))
+            except (OSError, SyntaxError, ValueError) as erro:  # formato que o Pillow não abre
+                motivo = f"formato não lido pelo Pillow: {erro}"
+    if exif is None:
+        if ao_sem_exif:
+            ao_sem_exif(caminho, motivo)
+        exif = {'latitude': "N/A", 'longitude': "N/A", 'orientacao': 1, 'miniatura': None}
+
+    try:
+        thumbnail = _miniatura(caminho, exif, tipo, miniatura)
+    except Exception as erro:  # o Pillow sinaliza imagem inválida com OSError, ValueError, SyntaxError...
+        if ao_avisar:
+            ao_avisar(caminho, erro)
+        thumbnail = ""
+
+    return {
+        'index': indice,
+        'name': os.path.basename(caminho),
+        'status': "Pendente",
+        'description': "",
+        'fileSize': f"{info.st_size / 1024:.2f} KB",
+        'fileType': tipo,
+        'date': time.strftime('%d/%m/%Y, %H:%M:%S', time.localtime(info.st_mtime)),
+        'Latitude': exif['latitude'],
+        'Longitude': exif['longitude'],
+        'thumbnail': thumbnail,
+        'predictionDate': previsao,
+    }
+
+def listar_fotos(origens):
+    """Arquivos de foto das origens (arquivos ou diretórios, recursivo), em ordem"""
+    for origem in origens:
+        if not os.path.isdir(origem):
+            yield origem
+            continue
+        for pasta, subpastas, arquivos in os.walk(origem):
+            subpastas.sort()
+            for nome in sorted(arquivos):
+                if nome.lower().endswith(EXTENSOES_FOTO):
+                    yield os.path.join(pasta, nome)
+
+def extrair(caminhos, workers=None, inicio=0, miniatura='exif', previsao=None, ao_falhar=None, ao_avisar=None,
+            ao_sem_exif=None):
+    """Gera os registros na ordem de `caminhos`, processando em paralelo
+
+    Fotos ilegíveis são puladas e repassadas a ao_falhar(caminho, erro); fotos
+    cuja miniatura falhou saem sem thumbnail e vão para ao_avisar(caminho, erro);
+    fotos sem EXIF vão para ao_sem_exif(caminho, motivo).
+    """
+    workers = workers or min(32, (os.cpu_count() or 1) + 4)
+    previsao = previsao or metadados.adicionar_dias_uteis(datetime.date.today(), DIAS_PREVISAO).isoformat()
+    indices = itertools.count(inicio)
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        pendentes = collections.deque()
+
+        def proximo():
+            caminho, futuro = pendentes.popleft()
+            try:
+                resultado = futuro.result()
+            except OSError as e:
+                if ao_falhar:
+                    ao_falhar(caminho, e)
+                return None
+            resultado['index'] = next(indices)
+            return resultado
+
+        # Pendências limitadas: a lista de arquivos pode ter centenas de milhares de entradas
+        for caminho in caminhos:
+            pendentes.append((caminho, pool.submit(registro, caminho, None, previsao, miniatura, ao_avisar, ao_sem_exif)))
+            if len(pendentes) >= 4 * workers:
+                resultado = proximo()
+                if resultado:
+                    yield resultado
+        while pendentes:
+            resultado = proximo()
+            if resultado:
+                yield resultado
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Extrai GPS/EXIF de fotos para registros ImageMetadata")
+    parser.add_argument('origens', nargs='+', help="fotos ou diretórios (percorridos recursivamente)")
+    parser.add_argument('-o', '--saida', default='-', help="arquivo de saída (padrão: stdout)")
+    parser.add_argument('--formato', choices=('jsonl', 'json'), default='jsonl', help="JSONL (padrão) ou array JSON")
+    parser.add_argument('--miniatura', choices=MINIATURAS, default='exif', help="conteúdo do campo thumbnail (padrão: exif)")
+    parser.add_argument('-w', '--workers', type=int, help="threads de leitura")
+    parser.add_argument('--inicio', type=int, default=0, help="index do primeiro registro (padrão: 0)")
+    args = parser.parse_args(argv)
+
+    falhas, sem_miniatura, sem_exif = [], [], []
+
+    def ao_falhar(caminho, erro):
+        falhas.append(caminho)
+        print(f"⚠️  {caminho}: {erro}", file=sys.stderr)
+
+    def ao_avisar(caminho, erro):
+        sem_miniatura.append(caminho)
+        print(f"⚠️  {caminho}: miniatura não gerada ({erro}); registro segue sem thumbnail", file=sys.stderr)
+
+    def ao_sem_exif(caminho, motivo):
+        sem_exif.append(caminho)
+        print(f"⚠️  {caminho}: {motivo}; registro segue sem coordenadas", file=sys.stderr)
+
+    total = com_gps = 0
+    inicio = time.perf_counter()
+    saida = sys.stdout if args.saida == '-' else open(args.saida, 'w', encoding='utf-8')
+    try:
+        registros = extrair(listar_fotos(args.origens), args.workers, args.inicio, args.miniatura,
+                            ao_falhar=ao_falhar, ao_avisar=ao_avisar, ao_sem_exif=ao_sem_exif)
+        if args.formato == 'json':
+            saida.write('[')
+        for item in registros:
+            if args.formato == 'json':
+                saida.write(',\n' if total else '\n')
+            saida.write(json.dumps(item, ensure_ascii=False))
+            if args.formato == 'jsonl':
+                saida.write('\n')
+            total += 1
+            com_gps += item['Latitude'] != "N/A"
+        if args.formato == 'json':
+            saida.write('\n]\n')
+    finally:
+        if saida is not sys.stdout:
+            saida.close()
+
+    duracao = time.perf_counter() - inicio
+    print(f"📷 {total} fotos ({com_gps} com GPS, {len(sem_exif)} sem EXIF, {len(falhas)} com erro, {len(sem_miniatura)} sem miniatura) em {duracao:.1f}s "
+          f"({total / duracao if duracao else 0:.0f} fotos/s)", file=sys.stderr)
+    return 1 if falhas else 0
+
+if __name__ == '__main__':
+    sys.exit(main())
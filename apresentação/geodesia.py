@@ -0,0 +1,252 @@
+"""Geodésia vetorizada (NumPy) para lotes de milhões de pontos
+
+Mesmas fórmulas de lib/coordinates.ts (calculateUTM, calculateDistance) e
+lib/geodesic.ts (Geodesic.Inverse / Geodesic.Direct), aplicadas a arrays,
+mais a inversa elipsoidal de Vincenty no WGS84.
+
+    python geodesia.py --verificar   # confere contra geodesia_referencia.json
+    python -m pytest tests           # idem, em tests/test_geodesia.py
+
+O arquivo de referência guarda as saídas das implementações TypeScript; as
+diferenças aceitas são de no máximo 1 mm.
+"""
+import argparse
+import json
+import os
+
+import numpy as np
+
+# Elipsoide WGS84
+WGS84_A = 6378137.0
+WGS84_F = 1 / 298.257223563
+WGS84_B = WGS84_A * (1 - WGS84_F)
+K0 = 0.9996
+
+RAIO_MEDIO = 6371e3  # calculateDistance
+RAIO_EQUATORIAL = WGS84_A  # Geodesic (lib/geodesic.ts)
+
+REFERENCIA = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'geodesia_referencia.json')
+TOLERANCIA_M = 1e-3
+
+def _array(valores):
+    return np.asarray(valores, dtype=np.float64)
+
+def utm(lat, lon):
+    """Converte arrays de latitude/longitude em (zona, hemisfério, easting, northing)
+
+    Hemisfério é 'N' ou 'S'. Pontos inválidos (NaN) resultam em zona 0 e NaN.
+    """
+    lat, lon = np.broadcast_arrays(_array(lat), _array(lon))
+    validos = np.isfinite(lat) & np.isfinite(lon)
+    zona = np.where(validos, np.floor((np.where(validos, lon, 0) + 180) / 6) + 1, 0).astype(np.int16)
+
+    f = WGS84_F
+    e = np.sqrt(2 * f - f * f)
+    n = f / (2 - f)
+    A = (WGS84_A / (1 + n)) * (1 + (n * n) / 4 + (n * n * n * n) / 64)
+    alpha1 = (1 / 2) * n - (2 / 3) * n * n + (5 / 16) * n * n * n
+    alpha2 = (13 / 48) * n * n - (3 / 5) * n * n * n
+    alpha3 = (61 / 240) * n * n * n
+
+    lat_rad = lat * np.pi / 180
+    dlon = lon * np.pi / 180 - ((zona - 1) * 6 - 180 + 3) * np.pi / 180
+    sin_lat = np.sin(lat_rad)
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        t = np.sinh(np.arctanh(sin_lat) - e * np.arctanh(e * sin_lat))
+        xi = np.arctan(t / np.cos(dlon))
+        eta = np.arctanh(np.sin(dlon) / np.sqrt(1 + t * t))
+
+    easting = 500000 + K0 * A * (
+        eta
+        + alpha1 * np.cos(2 * xi) * np.sinh(2 * eta)
+        + alpha2 * np.cos(4 * xi) * np.sinh(4 * eta)
+        + alpha3 * np.cos(6 * xi) * np.sinh(6 * eta))
+    northing = K0 * A * (
+        xi
+        + alpha1 * np.sin(2 * xi) * np.cosh(2 * eta)
+        + alpha2 * np.sin(4 * xi) * np.cosh(4 * eta)
+        + alpha3 * np.sin(6 * xi) * np.cosh(6 * eta))
+
+    sul = lat < 0
+    northing = np.where(sul, northing + 10000000, northing)
+    hemisferio = np.where(sul, 'S', 'N')
+    easting = np.where(validos, easting, np.nan)
+    northing = np.where(validos, northing, np.nan)
+    return zona, hemisferio, easting, northing
+
+def haversine(lat1, lon1, lat2, lon2, raio=RAIO_MEDIO):
+    """Distância em metros entre pares de pontos (broadcast NumPy)"""
+    phi1 = _array(lat1) * np.pi / 180
+    phi2 = _array(lat2) * np.pi / 180
+    dphi = (_array(lat2) - _array(lat1)) * np.pi / 180
+    dlmb = (_array(lon2) - _array(lon1)) * np.pi / 180
+    a = np.sin(dphi / 2) * np.sin(dphi / 2) + np.cos(phi1) * np.cos(phi2) * np.sin(dlmb / 2) * np.sin(dlmb / 2)
+    return raio * 2 * np.arctan2(np.sqrt(a), np.sqrt(1 - a))
+
+def inversa_esferica(lat1, lon1, lat2, lon2):
+    """Equivalente vetorizado de Geodesic.Inverse: (s12, azi1, azi2)"""
+    s12 = haversine(lat1, lon1, lat2, lon2, RAIO_EQUATORIAL)
+    phi1 = _array(lat1) * np.pi / 180
+    phi2 = _array(lat2) * np.pi / 180
+    dlmb = (_array(lon2) - _array(lon1)) * np.pi / 180
+    y = np.sin(dlmb) * np.cos(phi2)
+    x = np.cos(phi1) * np.sin(phi2) - np.sin(phi1) * np.cos(phi2) * np.cos(dlmb)
+    azi1 = np.arctan2(y, x) * 180 / np.pi
+    azi1 = np.where(azi1 < 0, azi1 + 360, azi1)
+    return s12, azi1, np.fmod(azi1 + 180, 360)
+
+def direta_esferica(lat1, lon1, azi1, s12):
+    """Equivalente vetorizado de Geodesic.Direct: (lat2, lon2, azi2)"""
+    phi1 = _array(lat1) * np.pi / 180
+    lmb1 = _array(lon1) * np.pi / 180
+    theta = _array(azi1) * np.pi / 180
+    delta = _array(s12) / RAIO_EQUATORIAL
+
+    phi2 = np.arcsin(np.sin(phi1) * np.cos(delta) + np.cos(phi1) * np.sin(delta) * np.cos(theta))
+    y = np.sin(theta) * np.sin(delta) * np.cos(phi1)
+    x = np.cos(delta) - np.sin(phi1) * np.sin(phi2)
+    lmb2 = lmb1 + np.arctan2(y, x)
+
+    lon2 = np.fmod(lmb2 * 180 / np.pi + 540, 360) - 180
+    azi2 = np.fmod(np.arctan2(y, x) * 180 / np.pi + 180, 360)
+    return phi2 * 180 / np.pi, lon2, azi2
+
+def vincenty(lat1, lon1, lat2, lon2, tolerancia=1e-12, max_iter=200):
+    """Inversa elipsoidal de Vincenty no WGS84: (s12 em metros, azi1, azi2 em graus)
+
+    Pares quase antípodas em que a iteração não converge resultam em NaN; se o
+    pacote geographiclib estiver instalado eles são resolvidos pelo algoritmo de Karney.
+    """
+    lat1, lon1, lat2, lon2 = np.broadcast_arrays(_array(lat1), _array(lon1), _array(lat2), _array(lon2))
+    forma = lat1.shape
+    # Entradas escalares (0-d) viram arrays de 1 elemento: a iteração escreve via .flat
+    lat1, lon1, lat2, lon2 = (x.reshape(-1) for x in (lat1, lon1, lat2, lon2))
+    a, b, f = WGS84_A, WGS84_B, WGS84_F
+
+    L = (lon2 - lon1) * np.pi / 180
+    U1 = np.arctan((1 - f) * np.tan(lat1 * np.pi / 180))
+    U2 = np.arctan((1 - f) * np.tan(lat2 * np.pi / 180))
+    sinU1, cosU1 = np.sin(U1), np.cos(U1)
+    sinU2, cosU2 = np.sin(U2), np.cos(U2)
+
+    lmb = L.copy()
+    convergiu = np.zeros(L.shape, dtype=bool)
+    sin_sigma = np.zeros(L.shape)
+    cos_sigma = np.ones(L.shape)
+    sigma = np.zeros(L.shape)
+    cos_sq_alpha = np.ones(L.shape)
+    cos_2sm = np.zeros(L.shape)
+
+    # Cada iteração só recalcula os pares ainda não convergidos
+    idx = np.flatnonzero(np.isfinite(L) & np.isfinite(U1) & np.isfinite(U2))
+    with np.errstate(invalid='ignore', divide='ignore'):
+        for _ in range(max_iter):
+            if not idx.size:
+                break
+            l_i = lmb.flat[idx]
+            s1, c1, s2, c2 = sinU1.flat[idx], cosU1.flat[idx], sinU2.flat[idx], cosU2.flat[idx]
+            sin_l, cos_l = np.sin(l_i), np.cos(l_i)
+            ss = np.sqrt((c2 * sin_l) ** 2 + (c1 * s2 - s1 * c2 * cos_l) ** 2)
+            cs = s1 * s2 + c1 * c2 * cos_l
+            sg = np.arctan2(ss, cs)
+            sin_alpha = np.where(ss == 0, 0, c1 * c2 * sin_l / ss)
+            csa = 1 - sin_alpha ** 2
+            # Linha equatorial: cos²α = 0
+            c2sm = np.where(csa == 0, 0, cs - 2 * s1 * s2 / csa)
+            C = f / 16 * csa * (4 + f * (4 - 3 * csa))
+            novo = L.flat[idx] + (1 - C) * f * sin_alpha * (
+                sg + C * ss * (c2sm + C * cs * (-1 + 2 * c2sm ** 2)))
+
+            sin_sigma.flat[idx], cos_sigma.flat[idx], sigma.flat[idx] = ss, cs, sg
+            cos_sq_alpha.flat[idx], cos_2sm.flat[idx] = csa, c2sm
+            lmb.flat[idx] = novo
+            pronto = np.abs(novo - l_i) <= tolerancia
+            convergiu.flat[idx[pronto]] = True
+            idx = idx[~pronto]
+
+        u_sq = cos_sq_alpha * (a * a - b * b) / (b * b)
+        A = 1 + u_sq / 16384 * (4096 + u_sq * (-768 + u_sq * (320 - 175 * u_sq)))
+        B = u_sq / 1024 * (256 + u_sq * (-128 + u_sq * (74 - 47 * u_sq)))
+        delta_sigma = B * sin_sigma * (cos_2sm + B / 4 * (
+            cos_sigma * (-1 + 2 * cos_2sm ** 2)
+            - B / 6 * cos_2sm * (-3 + 4 * sin_sigma ** 2) * (-3 + 4 * cos_2sm ** 2)))
+        s12 = b * A * (sigma - delta_sigma)
+
+        sin_l, cos_l = np.sin(lmb), np.cos(lmb)
+        azi1 = np.arctan2(cosU2 * sin_l, cosU1 * sinU2 - sinU1 * cosU2 * cos_l) * 180 / np.pi
+        azi2 = np.arctan2(cosU1 * sin_l, -sinU1 * cosU2 + cosU1 * sinU2 * cos_l) * 180 / np.pi
+
+    s12 = np.where(convergiu, s12, np.nan)
+    azi1 = np.where(convergiu, azi1, np.nan)
+    azi2 = np.where(convergiu, azi2, np.nan)
+
+    if idx.size:
+        _resolver_karney(lat1, lon1, lat2, lon2, s12, azi1, azi2, idx)
+    return tuple(x.reshape(forma)[()] for x in (s12, azi1, azi2))
+
+def _resolver_karney(lat1, lon1, lat2, lon2, s12, azi1, azi2, indices):
+    """Completa os pares não convergentes com geographiclib, se disponível"""
+    try:
+        from geographiclib.geodesic import Geodesic
+    except ImportError:
+        return
+    planos = [x.reshape(-1) for x in (lat1, lon1, lat2, lon2, s12, azi1, azi2)]
+    for i in indices:
+        r = Geodesic.WGS84.Inverse(planos[0][i], planos[1][i], planos[2][i], planos[3][i])
+        planos[4][i], planos[5][i], planos[6][i] = r['s12'], r['azi1'], r['azi2']
+
+def verificar(caminho=REFERENCIA, tolerancia=TOLERANCIA_M):
+    """Compara as funções vetorizadas com as saídas das implementações TypeScript
+
+    Devolve a lista de divergências (vazia quando tudo confere).
+    """
+    with open(caminho, encoding='utf-8') as f:
+        ref = json.load(f)
+    erros = []
+
+    pontos = ref['utm']
+    _, _, e, n = utm([p['lat'] for p in pontos], [p['lon'] for p in pontos])
+    for p, ei, ni in zip(pontos, e, n):
+        esperado_e, esperado_n = (float(v) for v in p['calculateUTM'].split(','))
+        if abs(ei - esperado_e) > tolerancia or abs(ni - esperado_n) > tolerancia:
+            erros.append(f"UTM {p['lat']}, {p['lon']}: {ei:.3f}, {ni:.3f} != {p['calculateUTM']}")
+
+    pares = ref['distancias']
+    cols = [np.array([p[k] for p in pares]) for k in ('lat1', 'lon1', 'lat2', 'lon2')]
+    d = haversine(*cols)
+    s12, azi1, azi2 = inversa_esferica(*cols)
+    for p, di, si, a1, a2 in zip(pares, d, s12, azi1, azi2):
+        if abs(di - p['calculateDistance']) > tolerancia:
+            erros.append(f"calculateDistance {p}: {di}")
+        inv = p['Inverse']
+        if abs(si - inv['s12']) > tolerancia or abs(a1 - inv['azi1']) > 1e-9 or abs(a2 - inv['azi2']) > 1e-9:
+            erros.append(f"Geodesic.Inverse {p}: {si}, {a1}, {a2}")
+
+    diretas = ref['diretas']
+    cols = [np.array([p[k] for p in diretas]) for k in ('lat1', 'lon1', 'azi1', 's12')]
+    lat2, lon2, azi2 = direta_esferica(*cols)
+    for p, la, lo, az in zip(diretas, lat2, lon2, azi2):
+        dr = p['Direct']
+        # 1e-8 grau ~ 1 mm
+        if abs(la - dr['lat2']) > 1e-8 or abs(lo - dr['lon2']) > 1e-8 or abs(az - dr['azi2']) > 1e-8:
+            erros.append(f"Geodesic.Direct {p}: {la}, {lo}, {az}")
+    return erros
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Geodésia vetorizada (UTM, Haversine, Vincenty)")
+    parser.add_argument('--verificar', action='store_true', help="confere contra as saídas TypeScript de referência")
+    parser.add_argument('--referencia', default=REFERENCIA, help="arquivo JSON de referência")
+    args = parser.parse_args(argv)
+
+    if args.verificar:
+        erros = verificar(args.referencia)
+        for erro in erros:
+            print(f"❌ {erro}")
+        if erros:
+            return 1
+        print("✅ Resultados idênticos às implementações TypeScript (tolerância 1 mm)")
+    return 0
+
+if __name__ == '__main__':
+    raise SystemExit(main())
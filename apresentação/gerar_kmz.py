@@ -0,0 +1,172 @@
+"""Exportação KML/KMZ dos registros ImageMetadata, em fluxo
+
+Mesmo conteúdo de lib/export/kml.ts e lib/export/kmz.ts (placemarks com
+estilos Pendente/Concluido/Atrasado), mas o XML é escrito elemento por
+elemento e cada foto vai para o KMZ assim que é lida, então a memória não
+cresce com o número de pontos.
+
+Uso:
+    python gerar_kmz.py backup.json                      # relatorio_AAAA-MM-DD.kmz
+    python gerar_kmz.py ingest.jsonl -o pontos.kml       # KML com miniaturas embutidas
+
+No KMZ as fotos ficam em images/ e o doc.kml é gravado por último, a partir de
+um arquivo temporário (é o único .kml do pacote, então é o que o Google Earth
+abre).
+"""
+import argparse
+import base64
+import datetime
+import hashlib
+import html
+import tempfile
+import zipfile
+
+from lxml import etree
+
+import coordenadas
+import imagens
+import metadados
+
+NS_KML = 'http://www.opengis.net/kml/2.2'
+ESTILOS = {
+    'pendente': 'http://maps.google.com/mapfiles/kml/pushpin/ylw-pushpin.png',
+    'concluido': 'http://maps.google.com/mapfiles/kml/pushpin/grn-pushpin.png',
+    'atrasado': 'http://maps.google.com/mapfiles/kml/pushpin/red-pushpin.png',
+}
+TAMANHO_MINIATURA = (300, 200)  # resizeImage(item.thumbnail, 300, 200) do kml.ts
+BLOCO = 1 << 20
+
+def _numero(valor):
+    """Número como o JavaScript imprime (25 e não 25.0)"""
+    return str(int(valor)) if float(valor).is_integer() else repr(float(valor))
+
+def _estilo(status):
+    estilo = (status or '').lower()
+    return estilo if estilo in ESTILOS else 'pendente'
+
+def _elemento_estilo(nome, icone):
+    estilo = etree.Element('Style', id=nome)
+    href = etree.SubElement(etree.SubElement(etree.SubElement(estilo, 'IconStyle'), 'Icon'), 'href')
+    href.text = icone
+    return estilo
+
+def placemark(registro, src, kmz=True):
+    """<Placemark> de um registro com coordenadas válidas; `src` é a imagem do balão"""
+    campos = [("Status", registro.get('status')), ("Descrição", registro.get('description')),
+              ("Data", registro.get('date'))]
+    if not kmz:
+        campos.append(("Previsão", registro.get('predictionDate')))
+    linhas = ''.join(f'<p><strong>{rotulo}:</strong> {html.escape(str(valor or ""))}</p>' for rotulo, valor in campos)
+    imagem = f'<img src="{html.escape(src)}" width="300" />' if src else ''
+    conteudo = f'<div style="width: 300px;">{linhas}{imagem}</div>' if kmz else linhas + imagem
+
+    lat = coordenadas.normalizar_coordenada(registro.get('Latitude'))
+    lon = coordenadas.normalizar_coordenada(registro.get('Longitude'))
+    elemento = etree.Element('Placemark')
+    etree.SubElement(elemento, 'name').text = str(registro.get('name') or '')
+    etree.SubElement(elemento, 'styleUrl').text = '#' + _estilo(registro.get('status'))
+    etree.SubElement(elemento, 'description').text = etree.CDATA(conteudo)
+    ponto = etree.SubElement(elemento, 'Point')
+    etree.SubElement(ponto, 'coordinates').text = f'{_numero(lon)},{_numero(lat)}'
+    return elemento
+
+def escrever_kml(destino, registros, nome, imagem, kmz=True, descricao=None):
+    """Escreve o documento KML em `destino` (arquivo binário), um placemark por vez
+
+    `imagem(indice, registro)` devolve o src da foto no balão (ou None) e é chamada
+    só para registros com coordenadas válidas. Devolve quantos placemarks foram escritos.
+    """
+    total = 0
+    with etree.xmlfile(destino, encoding='UTF-8') as xf:
+        xf.write_declaration()
+        # Tags sem namespace: herdam o xmlns padrão do <kml> no texto, sem prefixos
+        with xf.element('kml', xmlns=NS_KML):
+            with xf.element('Document'):
+                elemento = etree.Element('name')
+                elemento.text = nome
+                xf.write(elemento)
+                if descricao:
+                    elemento = etree.Element('description')
+                    elemento.text = descricao
+                    xf.write(elemento)
+                for estilo, icone in ESTILOS.items():
+                    xf.write(_elemento_estilo(estilo, icone))
+                for indice, registro in enumerate(registros):
+                    if not coordenadas.tem_coordenadas_validas(registro):
+                        continue
+                    xf.write(placemark(registro, imagem(indice, registro), kmz))
+                    total += 1
+    return total
+
+def _extensao(data_uri):
+    return '.png' if (data_uri or '').startswith('data:image/png') else '.jpg'
+
+def gerar_kmz(registros, destino, nome="Relatório de Pendências"):
+    """KMZ com as fotos em images/ (sem recompressão) e o doc.kml; devolve o total de pontos
+
+    Fotos repetidas são gravadas uma vez só e os placemarks apontam para o mesmo arquivo.
+    """
+    gravadas = {}  # sha1 da foto -> arquivo em images/
+    with zipfile.ZipFile(destino, 'w', zipfile.ZIP_DEFLATED) as zd, tempfile.TemporaryFile() as kml:
+
+        def imagem(indice, registro):
+            try:
+                blob = metadados.decodificar_thumbnail(registro.get('thumbnail'))
+            except imagens.ERROS_IMAGEM as erro:
+                imagens.avisar_invalida(registro.get('name'), erro)
+                return None
+            if not blob:
+                return None
+            chave = hashlib.sha1(blob).digest()
+            arquivo = gravadas.get(chave)
+            if arquivo is None:
+                arquivo = gravadas[chave] = f"images/img_{indice}{_extensao(registro.get('thumbnail'))}"
+                zd.writestr(arquivo, blob, zipfile.ZIP_STORED)
+            return arquivo
+
+        total = escrever_kml(kml, registros, nome, imagem)
+        kml.seek(0)
+        with zd.open('doc.kml', 'w', force_zip64=True) as dst:
+            while True:
+                dados = kml.read(BLOCO)
+                if not dados:
+                    break
+                dst.write(dados)
+    return total
+
+def gerar_kml(registros, destino, nome="Pontos de Monitoramento"):
+    """KML com a miniatura de cada foto embutida no balão (300x200); devolve o total de pontos"""
+
+    def imagem(indice, registro):
+        try:
+            blob = metadados.decodificar_thumbnail(registro.get('thumbnail'))
+            if not blob:
+                return None
+            reduzida = imagens.reduzir_imagem(blob, TAMANHO_MINIATURA)
+        except imagens.ERROS_IMAGEM as erro:
+            imagens.avisar_invalida(registro.get('name'), erro)
+            return None
+        tipo = 'image/png' if reduzida[:4] == b'\x89PNG' else 'image/jpeg'
+        return f'data:{tipo};base64,' + base64.b64encode(reduzida).decode('ascii')
+
+    with open(destino, 'wb') as f:
+        return escrever_kml(f, registros, nome, imagem, kmz=False,
+                            descricao="Exportado do Gerenciador de Metadados")
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Exporta registros ImageMetadata para KMZ/KML")
+    parser.add_argument('backup', help="backup JSON/JSONL de ImageMetadata")
+    parser.add_argument('-o', '--saida', help="arquivo .kmz ou .kml (padrão: relatorio_AAAA-MM-DD.kmz)")
+    args = parser.parse_args(argv)
+
+    saida = args.saida or f"relatorio_{datetime.date.today().isoformat()}.kmz"
+    registros = metadados.iterar_registros(args.backup)
+    if saida.lower().endswith('.kml'):
+        total = gerar_kml(registros, saida)
+    else:
+        total = gerar_kmz(registros, saida)
+    print(f"✅ {total} pontos exportados")
+    print(f"📁 Arquivo: {saida}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,145 @@
+"""Geração em lote de apresentações (uma por município, região, mês...)
+
+Uso:
+    python gerar_lote.py specs/            # diretório com *.json / *.yaml
+    python gerar_lote.py decks.jsonl -o saida/ -w 32
+
+Cada processo do pool importa python-pptx e carrega o modelo uma única vez;
+os decks terminados são gravados em disco assim que ficam prontos. O resumo
+traz a telemetria de cada deck (etapas e contadores, telemetria.py).
+"""
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+import argparse
+import json
+import os
+import statistics
+import time
+
+import gerar_pptx
+import montagem
+import pacote
+import telemetria
+
+EXTENSOES_SPEC = ('.json', '.yaml', '.yml')
+
+def listar_jobs(origem):
+    """Gera (nome, spec ou caminho da spec) a partir de um diretório ou JSONL"""
+    if os.path.isdir(origem):
+        for nome in sorted(os.listdir(origem)):
+            if nome.endswith(EXTENSOES_SPEC):
+                yield os.path.splitext(nome)[0], os.path.join(origem, nome)
+        return
+
+    with open(origem, encoding='utf-8') as f:
+        for n, linha in enumerate(f, 1):
+            if not linha.strip():
+                continue
+            spec = json.loads(linha)
+            nome = spec.get('nome') or os.path.splitext(spec.get('arquivo') or f'deck_{n:04d}')[0]
+            yield nome, spec
+
+def _inicializar_worker(modelo):
+    """Pré-carrega o modelo no processo do pool"""
+    montagem.nova_apresentacao(modelo)
+
+def renderizar(nome, spec, pasta_saida, perfil=None, modelo=None):
+    """Monta e salva um deck (no `modelo` do lote, se a spec não trouxer o seu); devolve as medições"""
+    inicio = time.perf_counter()
+    if isinstance(spec, str):
+        spec = gerar_pptx.carregar_spec(spec)
+    if modelo:
+        spec.setdefault('modelo', modelo)
+    destino = os.path.join(pasta_saida, spec.get('arquivo') or nome + '.pptx')
+    destino_perfil = destino + ('.prof' if perfil == 'cprofile' else '.perfil.html') if perfil else None
+    with telemetria.sessao(perfil, destino_perfil) as medicao:
+        prs = montagem.build_deck(spec)
+        montado = time.perf_counter()
+        pacote.salvar(prs, destino)
+    fim = time.perf_counter()
+    return {
+        'nome': nome,
+        'arquivo': destino,
+        'slides': len(prs.slides),  # specs 'cards' podem virar vários slides
+        'build_s': round(montado - inicio, 4),
+        'save_s': round(fim - montado, 4),
+        'total_s': round(fim - inicio, 4),
+        'bytes': os.path.getsize(destino),
+        'telemetria': medicao.relatorio(por_slide=False),
+    }
+
+def gerar_lote(origem, pasta_saida, workers=None, modelo=None, ao_concluir=None, perfil=None):
+    """Renderiza todos os decks de `origem` em paralelo e devolve o resumo"""
+    os.makedirs(pasta_saida, exist_ok=True)
+    workers = workers or os.cpu_count() or 1
+    resultados, erros = [], []
+    inicio = time.perf_counter()
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=_inicializar_worker, initargs=(modelo,)) as pool:
+        pendentes = {}
+
+        def coletar(concluidos):
+            for futuro in concluidos:
+                nome = pendentes.pop(futuro)
+                try:
+                    resultado = futuro.result()
+                except Exception as e:
+                    erros.append({'nome': nome, 'erro': f'{type(e).__name__}: {e}'})
+                    continue
+                resultados.append(resultado)
+                if ao_concluir:
+                    ao_concluir(resultado)
+
+        # Mantém no máximo 2 jobs por worker em voo para não ler toda a origem na memória
+        for nome, spec in listar_jobs(origem):
+            if len(pendentes) >= 2 * workers:
+                concluidos, _ = wait(pendentes, return_when=FIRST_COMPLETED)
+                coletar(concluidos)
+            pendentes[pool.submit(renderizar, nome, spec, pasta_saida, perfil, modelo)] = nome
+        while pendentes:
+            concluidos, _ = wait(pendentes, return_when=FIRST_COMPLETED)
+            coletar(concluidos)
+
+    return resumir(resultados, erros, time.perf_counter() - inicio, workers)
+
+def resumir(resultados, erros, duracao, workers):
+    """Estatísticas de tempo por deck e vazão total"""
+    tempos = sorted(r['total_s'] for r in resultados)
+    return {
+        'workers': workers,
+        'decks': len(resultados),
+        'erros': erros,
+        'duracao_s': round(duracao, 3),
+        'decks_por_minuto': round(60 * len(resultados) / duracao, 1) if duracao else 0.0,
+        'deck_medio_s': round(statistics.fmean(tempos), 4) if tempos else 0.0,
+        'deck_p50_s': tempos[len(tempos) // 2] if tempos else 0.0,
+        'deck_max_s': tempos[-1] if tempos else 0.0,
+        'resultados': sorted(resultados, key=lambda r: r['nome']),
+    }
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Gera vários decks em paralelo a partir de specs")
+    parser.add_argument('origem', help="diretório com specs JSON/YAML ou arquivo JSONL (uma spec por linha)")
+    parser.add_argument('-o', '--saida', default='decks', help="diretório de saída (padrão: decks)")
+    parser.add_argument('-w', '--workers', type=int, help="processos no pool (padrão: núcleos da máquina)")
+    parser.add_argument('--modelo', help="modelo .pptx usado como base")
+    parser.add_argument('--resumo', help="grava o resumo com tempos e telemetria por deck neste arquivo JSON")
+    parser.add_argument('--perfil', choices=telemetria.PERFIS, help="grava um perfil de cada deck ao lado dele (<deck>.prof ou <deck>.perfil.html)")
+    args = parser.parse_args(argv)
+
+    def progresso(r):
+        print(f"✅ {r['nome']}: {r['slides']} slides em {r['total_s']:.2f}s "
+              f"(build {r['build_s']:.2f}s, save {r['save_s']:.2f}s)")
+
+    resumo = gerar_lote(args.origem, args.saida, args.workers, args.modelo, progresso, args.perfil)
+    for erro in resumo['erros']:
+        print(f"❌ {erro['nome']}: {erro['erro']}")
+    print(f"📊 {resumo['decks']} decks em {resumo['duracao_s']:.1f}s com {resumo['workers']} workers "
+          f"({resumo['decks_por_minuto']} decks/min, p50 {resumo['deck_p50_s']:.2f}s)")
+
+    if args.resumo:
+        with open(args.resumo, 'w', encoding='utf-8') as f:
+            json.dump(resumo, f, ensure_ascii=False, indent=2)
+    return 1 if resumo['erros'] else 0
+
+if __name__ == '__main__':
+    raise SystemExit(main())
@@ -0,0 +1,225 @@
+"""Relatório fotográfico em PDF, renderizado em paralelo
+
+Uma página por foto com o layout e as cores do slide de foto do deck
+(estilo.py): faixa com nome e data, foto à esquerda e status, previsão, GPS,
+UTM e descrição à direita. A ordem é a do relatório da aplicação
+(lib/export/pdf.ts): Atrasado, Pendente, Concluido.
+
+Uso:
+    python gerar_pdf.py backup.json                  # relatorio_AAAA-MM-DD.pdf
+    python gerar_pdf.py ingest.jsonl -o obra.pdf -w 8
+
+As páginas são renderizadas em blocos por um pool de processos, cada bloco num
+PDF temporário, e os blocos são concatenados na ordem. As fotos passam pelo
+mesmo cache de imagens do gerar_pptx.py e no mesmo tamanho alvo (LARGURA_FOTO x
+ALTURA_FOTO), então uma foto já preparada para o deck não é decodificada de
+novo; o JPEG do cache entra no PDF como está.
+
+Os blocos limitam a memória da renderização (fotos decodificadas). Na
+concatenação, o pypdf mantém as páginas já copiadas até gravar o arquivo final,
+então o teto de memória dessa etapa é da ordem do tamanho do PDF final (fotos
+já comprimidas); cada bloco é aberto um por vez e apagado logo depois de copiado.
+
+Requer reportlab e pypdf.
+"""
+from concurrent.futures import ProcessPoolExecutor
+import argparse
+import collections
+import datetime
+import io
+import json
+import os
+import shutil
+import tempfile
+
+from pypdf import PdfReader, PdfWriter
+from reportlab.lib.colors import Color
+from reportlab.lib.units import inch
+from reportlab.lib.utils import ImageReader, simpleSplit
+from reportlab.pdfgen import canvas
+
+from estilo import COR_FUNDO, COR_AZUL, COR_CIANO, COR_BRANCO, COR_TEXTO, COR_STATUS, LARGURA_FOTO, ALTURA_FOTO
+import coordenadas
+import imagens
+import metadados
+
+LARGURA, ALTURA = 16 * inch, 9 * inch  # mesmo tamanho do slide
+ORDEM_STATUS = ("Atrasado", "Pendente", "Concluido")
+PAGINAS_POR_BLOCO = 50
+MARGEM_X, MARGEM_Y = 0.1 * inch, 0.05 * inch  # margens internas das caixas de texto do PowerPoint
+
+def _cor(rgb):
+    return Color(rgb[0] / 255, rgb[1] / 255, rgb[2] / 255)
+
+def _caixa(c, left, top, width, height, line_width=2):
+    """Caixa azul com borda ciano (componentes.caixa); coordenadas em polegadas a partir do topo"""
+    c.setFillColor(_cor(COR_AZUL))
+    c.setStrokeColor(_cor(COR_CIANO))
+    c.setLineWidth(line_width)
+    c.rect(left * inch, ALTURA - (top + height) * inch, width * inch, height * inch, fill=1, stroke=1)
+
+def _texto(c, text, left, top, width, font_size=18, bold=False, color=COR_BRANCO, max_linhas=None):
+    """Texto com quebra de linha (componentes.texto); devolve a altura usada em polegadas"""
+    fonte = 'Helvetica-Bold' if bold else 'Helvetica'
+    linhas = []
+    for paragrafo in str(text).split('\n'):
+        linhas.extend(simpleSplit(paragrafo, fonte, font_size, width * inch - 2 * MARGEM_X) or [''])
+    if max_linhas and len(linhas) > max_linhas:
+        linhas = linhas[:max_linhas]
+        linhas[-1] = linhas[-1].rstrip() + '…'
+    c.setFillColor(_cor(color))
+    c.setFont(fonte, font_size)
+    y = ALTURA - top * inch - MARGEM_Y - font_size
+    for linha in linhas:
+        c.drawString(left * inch + MARGEM_X, y, linha)
+        y -= font_size * 1.2
+    return (len(linhas) * font_size * 1.2 + 2 * MARGEM_Y) / inch
+
+def _foto(c, registro, left, top, width, height):
+    """Foto centralizada na área, mantendo a proporção (add_picture_fit)"""
+    try:
+        blob = metadados.decodificar_thumbnail(registro.get('thumbnail'))
+        if not blob:
+            return False
+        caminho = imagens.arquivo_imagem(blob, LARGURA_FOTO, ALTURA_FOTO)
+        imagem = ImageReader(caminho or io.BytesIO(imagens.preparar_imagem(blob, LARGURA_FOTO, ALTURA_FOTO)))
+    except imagens.ERROS_IMAGEM as erro:
+        imagens.avisar_invalida(registro.get('name'), erro)
+        return False
+    largura, altura = imagem.getSize()
+    escala = min(width * inch / largura, height * inch / altura)
+    w, h = largura * escala, altura * escala
+    x = left * inch + (width * inch - w) / 2
+    y = ALTURA - top * inch - height * inch + (height * inch - h) / 2
+    c.drawImage(imagem, x, y, w, h)
+    return True
+
+def desenhar_pagina(c, registro, numero):
+    """Uma página no layout do slide_foto do montagem.py"""
+    c.setFillColor(_cor(COR_FUNDO))
+    c.rect(0, 0, LARGURA, ALTURA, fill=1, stroke=0)
+
+    # Cabeçalho
+    _caixa(c, 0, 0, 16, 1.5, line_width=4)
+    usado = _texto(c, f"{numero}. {registro.get('name') or 'Sem nome'}", 0.5, 0.3, 15, 40, True, COR_CIANO, max_linhas=1)
+    _texto(c, registro.get('date') or "", 0.5, 0.3 + usado, 15, 20, False, COR_TEXTO, max_linhas=1)
+
+    # Foto (esquerda)
+    _caixa(c, 0.5, 2, 9, 6.5)
+    if not _foto(c, registro, 0.6, 2.1, LARGURA_FOTO / imagens.EMU_POR_POLEGADA, ALTURA_FOTO / imagens.EMU_POR_POLEGADA):
+        _texto(c, "Sem imagem", 0.5, 4.9, 9, 24, False, COR_TEXTO)
+
+    # Detalhes (direita)
+    _caixa(c, 10, 2, 5.5, 6.5)
+    status = registro.get('status') or "Pendente"
+    campos = [
+        ("Status", status, COR_STATUS.get(status, COR_BRANCO)),
+        ("Previsão", registro.get('predictionDate') or "Não definida", COR_BRANCO),
+        ("GPS", coordenadas.formatar_gps(registro.get('Latitude'), registro.get('Longitude')), COR_BRANCO),
+        ("Coordenadas UTM", coordenadas.calcular_utm(registro.get('Latitude'), registro.get('Longitude')), COR_BRANCO),
+    ]
+    y = 2.2
+    for rotulo, valor, cor in campos:
+        _texto(c, rotulo, 10.2, y, 5.1, 14, True, COR_CIANO)
+        _texto(c, valor, 10.2, y + 0.35, 5.1, 18, True, cor, max_linhas=1)
+        y += 0.95
+    _texto(c, "Descrição", 10.2, y, 5.1, 14, True, COR_CIANO)
+    _texto(c, registro.get('description') or "-", 10.2, y + 0.35, 5.1, 16, False, COR_TEXTO, max_linhas=6)
+    c.showPage()
+
+def renderizar_bloco(itens, destino, dpi=None):
+    """Renderiza pares (número, registro) em `destino`; devolve o número de páginas"""
+    if dpi:
+        imagens.DPI = dpi
+    c = canvas.Canvas(destino, pagesize=(LARGURA, ALTURA), pageCompression=1)
+    c.setTitle("Relatório de Monitoramento")
+    paginas = 0
+    for numero, registro in itens:
+        desenhar_pagina(c, registro, numero)
+        paginas += 1
+    c.save()
+    return paginas
+
+def ordenar_por_status(registros):
+    """Registros na ordem Atrasado, Pendente, Concluido, sem manter todos na memória
+
+    Cada registro é despejado num arquivo temporário do seu status e os arquivos
+    são relidos em sequência (a ordem original é mantida dentro de cada status).
+    """
+    arquivos = {status: tempfile.TemporaryFile('w+', encoding='utf-8') for status in ORDEM_STATUS}
+    try:
+        for registro in registros:
+            status = registro.get('status')
+            arquivo = arquivos.get(status, arquivos["Pendente"])
+            arquivo.write(json.dumps(registro, ensure_ascii=False) + '\n')
+        for status in ORDEM_STATUS:
+            arquivo = arquivos[status]
+            arquivo.seek(0)
+            for linha in arquivo:
+                yield json.loads(linha)
+    finally:
+        for arquivo in arquivos.values():
+            arquivo.close()
+
+def _blocos(registros, tamanho):
+    bloco = []
+    for numero, registro in enumerate(registros, 1):
+        bloco.append((numero, registro))
+        if len(bloco) == tamanho:
+            yield bloco
+            bloco = []
+    if bloco:
+        yield bloco
+
+def gerar_pdf(registros, destino, workers=None, por_bloco=PAGINAS_POR_BLOCO, dpi=None):
+    """Gera o PDF em `destino` e devolve o número de páginas
+
+    Com mais de um worker, a concatenação dos blocos ocupa memória da ordem do
+    tamanho do PDF final (ver docstring do módulo).
+    """
+    workers = workers or os.cpu_count() or 1
+    registros = ordenar_por_status(registros)
+    if workers == 1:
+        return renderizar_bloco(enumerate(registros, 1), destino, dpi)
+
+    with tempfile.TemporaryDirectory() as pasta:
+        partes, pendentes, total = [], collections.deque(), 0
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            # No máximo 2 blocos por worker em voo: os registros trazem as fotos
+            for i, bloco in enumerate(_blocos(registros, por_bloco)):
+                parte = os.path.join(pasta, f'bloco_{i:06d}.pdf')
+                pendentes.append(pool.submit(renderizar_bloco, bloco, parte, dpi))
+                partes.append(parte)
+                if len(pendentes) >= 2 * workers:
+                    total += pendentes.popleft().result()
+            while pendentes:
+                total += pendentes.popleft().result()
+
+        if len(partes) == 1:
+            shutil.move(partes[0], destino)
+            return total
+        escritor = PdfWriter()
+        for parte in partes:
+            with open(parte, 'rb') as f:
+                escritor.append(PdfReader(f), import_outline=False)
+            os.unlink(parte)
+        with open(destino, 'wb') as f:
+            escritor.write(f)
+        return total
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Gera o relatório fotográfico em PDF a partir do backup de ImageMetadata")
+    parser.add_argument('backup', help="backup JSON/JSONL de ImageMetadata")
+    parser.add_argument('-o', '--saida', help="arquivo .pdf (padrão: relatorio_AAAA-MM-DD.pdf)")
+    parser.add_argument('-w', '--workers', type=int, help="processos de renderização (padrão: núcleos da máquina)")
+    parser.add_argument('--por-bloco', type=int, default=PAGINAS_POR_BLOCO, help=f"páginas por bloco (padrão: {PAGINAS_POR_BLOCO})")
+    parser.add_argument('--dpi', type=int, help=f"resolução das fotos (padrão: {imagens.DPI})")
+    args = parser.parse_args(argv)
+
+    saida = args.saida or f"relatorio_{datetime.date.today().isoformat()}.pdf"
+    total = gerar_pdf(metadados.iterar_registros(args.backup), saida, args.workers, args.por_bloco, args.dpi)
+    print(f"✅ Relatório PDF criado com {total} páginas")
+    print(f"📁 Arquivo: {saida}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,217 @@
+"""Exportação colunar dos registros ImageMetadata: XLSX e Parquet
+
+Mesmas colunas do "Excel para Rotas" de lib/export/excel.ts, mas os registros
+são convertidos em lotes Arrow (status categórico, latitude/longitude float,
+data e previsão como datas de verdade) e cada lote vai direto para as saídas:
+o XLSX é escrito linha a linha em modo de memória constante e o Parquet um
+row group por lote. A memória não cresce com o número de registros.
+
+Data ou previsão que não se consegue interpretar não é descartada: o texto
+original vai para date_original / predictionDate_original no Parquet e fica
+como texto na própria célula do XLSX.
+
+Uso:
+    python gerar_planilha.py ingest.jsonl                    # rotas_AAAA-MM-DD.xlsx e .parquet
+    python gerar_planilha.py backup.json -o auditoria.parquet
+    python gerar_planilha.py backup.json -o rotas.xlsx rotas.parquet --lote 20000
+
+Requer pyarrow e xlsxwriter.
+"""
+import argparse
+import datetime
+import time
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+import xlsxwriter
+
+import coordenadas
+import metadados
+
+LOTE = 50000
+LINHAS_POR_ABA = 1048575  # limite do Excel menos o cabeçalho
+FORMATO_DATA = 'dd/mm/yyyy hh:mm:ss'
+FORMATO_PREVISAO = 'dd/mm/yyyy'
+
+ESQUEMA = pa.schema([
+    ('Latitude', pa.float64()),
+    ('Longitude', pa.float64()),
+    ('index', pa.int64()),
+    ('name', pa.string()),
+    ('description', pa.string()),
+    ('status', pa.dictionary(pa.int32(), pa.string())),
+    ('fileSize', pa.string()),
+    ('fileType', pa.dictionary(pa.int32(), pa.string())),
+    ('date', pa.timestamp('s')),
+    ('predictionDate', pa.date32()),
+    ('date_original', pa.string()),
+    ('predictionDate_original', pa.string()),
+])
+COLUNAS_XLSX = ESQUEMA.names[:10]  # as do excel.ts
+LARGURAS = (15, 15, 8, 25, 30, 10, 10, 10, 20, 15)  # wscols do excel.ts
+
+def _coordenada(valor):
+    valor = coordenadas.normalizar_coordenada(valor)
+    return None if valor == "N/A" else float(valor)
+
+def _inteiro(valor):
+    try:
+        return int(valor)
+    except (TypeError, ValueError):
+        return None
+
+def _texto(valor):
+    return None if valor is None else str(valor)
+
+CONVERSORES = {
+    'Latitude': _coordenada,
+    'Longitude': _coordenada,
+    'index': _inteiro,
+    'date': metadados.ler_data,
+    'predictionDate': metadados.ler_previsao,
+}
+# Coluna de texto -> coluna de data: recebe o valor original quando ele não foi interpretado
+ORIGINAIS = {'date_original': 'date', 'predictionDate_original': 'predictionDate'}
+
+def lotes(registros, tamanho=LOTE):
+    """RecordBatches de até `tamanho` linhas no ESQUEMA (a thumbnail fica de fora)"""
+    colunas = {nome: [] for nome in ESQUEMA.names}
+    total = 0
+    for registro in registros:
+        for nome, valores in colunas.items():
+            if nome in ORIGINAIS:
+                campo = ORIGINAIS[nome]
+                bruto = registro.get(campo)
+                valores.append(_texto(bruto) if colunas[campo][-1] is None and bruto not in (None, '') else None)
+            else:
+                valores.append(CONVERSORES.get(nome, _texto)(registro.get(nome)))
+        total += 1
+        if total == tamanho:
+            yield pa.RecordBatch.from_pydict(colunas, schema=ESQUEMA)
+            colunas = {nome: [] for nome in ESQUEMA.names}
+            total = 0
+    if total:
+        yield pa.RecordBatch.from_pydict(colunas, schema=ESQUEMA)
+
+class PlanilhaXlsx:
+    """XLSX em modo constant_memory: cada linha vai para o disco assim que é escrita"""
+
+    def __init__(self, destino):
+        # strings_to_urls desligado: nomes e descrições são texto, e poupa um regex por célula
+        self.livro = xlsxwriter.Workbook(destino, {'constant_memory': True, 'strings_to_urls': False})
+        self.formatos = {
+            'date': self.livro.add_format({'num_format': FORMATO_DATA}),
+            'predictionDate': self.livro.add_format({'num_format': FORMATO_PREVISAO}),
+        }
+        self.aba = None
+        self.linha = LINHAS_POR_ABA
+        self.abas = 0
+
+    def _nova_aba(self):
+        # Acima do limite de linhas do Excel o restante continua em "Rotas 2", "Rotas 3"...
+        self.abas += 1
+        self.aba = self.livro.add_worksheet("Rotas" if self.abas == 1 else f"Rotas {self.abas}")
+        for coluna, largura in enumerate(LARGURAS):
+            self.aba.set_column(coluna, coluna, largura)
+        self.aba.write_row(0, 0, COLUNAS_XLSX)
+        self.linha = 0
+
+    def escrever(self, lote):
+        colunas = [lote.column(nome).to_pylist() for nome in ESQUEMA.names]
+        # Coordenada inválida vira 0, como no excel.ts
+        colunas[0] = [0 if v is None else v for v in colunas[0]]
+        colunas[1] = [0 if v is None else v for v in colunas[1]]
+        formato_data, formato_previsao = self.formatos['date'], self.formatos['predictionDate']
+        for valores in zip(*colunas):
+            if self.linha >= LINHAS_POR_ABA:
+                self._nova_aba()
+            self.linha += 1
+            aba, linha = self.aba, self.linha
+            aba.write_row(linha, 0, valores[:8])
+            if valores[8] is not None:
+                aba.write_datetime(linha, 8, valores[8], formato_data)
+            elif valores[10] is not None:
+                aba.write_string(linha, 8, valores[10])
+            if valores[9] is not None:
+                aba.write_datetime(linha, 9, valores[9], formato_previsao)
+            elif valores[11] is not None:
+                aba.write_string(linha, 9, valores[11])
+
+    def fechar(self):
+        if self.aba is None:
+            self._nova_aba()
+        self.livro.close()
+
+class TabelaParquet:
+    """Parquet com um row group por lote"""
+
+    def __init__(self, destino):
+        self.escritor = pq.ParquetWriter(destino, ESQUEMA, compression='zstd')
+
+    def escrever(self, lote):
+        self.escritor.write_batch(lote)
+
+    def fechar(self):
+        self.escritor.close()
+
+SAIDAS = {'.xlsx': PlanilhaXlsx, '.parquet': TabelaParquet}
+
+def exportar(registros, destinos, tamanho=LOTE):
+    """Escreve os registros em cada destino (.xlsx/.parquet) numa única passada
+
+    Devolve (linhas, tempos), com os segundos gastos por etapa: 'conversao'
+    (leitura do backup e montagem dos lotes) e um por destino.
+    """
+    saidas = {}
+    for destino in destinos:
+        extensao = '.' + destino.rpartition('.')[2].lower()
+        if extensao not in SAIDAS:
+            raise ValueError(f"formato não suportado: {destino} (use .xlsx ou .parquet)")
+        saidas[destino] = SAIDAS[extensao](destino)
+
+    tempos = dict.fromkeys(['conversao', *destinos], 0.0)
+    linhas = 0
+    try:
+        inicio = time.perf_counter()
+        for lote in lotes(registros, tamanho):
+            tempos['conversao'] += time.perf_counter() - inicio
+            linhas += lote.num_rows
+            for destino, saida in saidas.items():
+                inicio = time.perf_counter()
+                saida.escrever(lote)
+                tempos[destino] += time.perf_counter() - inicio
+            inicio = time.perf_counter()
+        tempos['conversao'] += time.perf_counter() - inicio
+    finally:
+        for destino, saida in saidas.items():
+            inicio = time.perf_counter()
+            saida.fechar()
+            tempos[destino] += time.perf_counter() - inicio
+    return linhas, tempos
+
+def _por_segundo(linhas, segundos):
+    return f"{linhas / segundos:,.0f} linhas/s" if segundos else "-"
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Exporta registros ImageMetadata para XLSX e Parquet")
+    parser.add_argument('backup', help="backup JSON/JSONL de ImageMetadata")
+    parser.add_argument('-o', '--saida', nargs='+', help="arquivos .xlsx e/ou .parquet (padrão: rotas_AAAA-MM-DD.xlsx e .parquet)")
+    parser.add_argument('--lote', type=int, default=LOTE, help=f"linhas por lote Arrow (padrão: {LOTE})")
+    args = parser.parse_args(argv)
+
+    base = f"rotas_{datetime.date.today().isoformat()}"
+    destinos = args.saida or [base + '.xlsx', base + '.parquet']
+    for destino in destinos:
+        if '.' + destino.rpartition('.')[2].lower() not in SAIDAS:
+            parser.error(f"formato não suportado: {destino} (use .xlsx ou .parquet)")
+
+    inicio = time.perf_counter()
+    linhas, tempos = exportar(metadados.iterar_registros(args.backup), destinos, args.lote)
+    total = time.perf_counter() - inicio
+    print(f"✅ {linhas} registros exportados em {total:.2f}s ({_por_segundo(linhas, total)})")
+    print(f"   leitura e conversão: {tempos.pop('conversao'):.2f}s")
+    for destino, segundos in tempos.items():
+        print(f"📁 Arquivo: {destino} ({segundos:.2f}s, {_por_segundo(linhas, segundos)})")
+
+if __name__ == '__main__':
+    main()
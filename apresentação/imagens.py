@@ -0,0 +1,105 @@
+"""Redimensionamento e recompressão de imagens antes de embutir nos documentos
+
+Fotos de campo vêm com vários megapixels; no slide de 16x9in elas ocupam uma
+área de poucos centímetros. Cada imagem é reduzida para a resolução da área
+onde será exibida (DPI alvo) e recomprimida uma única vez. O resultado fica em
+cache no disco, indexado pelo SHA-256 da imagem original + tamanho alvo, e é
+reaproveitado entre execuções e entre decks que mostram a mesma foto.
+
+Variáveis de ambiente:
+    RELATORIO_IMAGENS_DPI    DPI alvo (padrão 150)
+    RELATORIO_CACHE_IMAGENS  diretório do cache (padrão ~/.cache/relatoriopend/imagens)
+"""
+import binascii
+import hashlib
+import io
+import os
+import sys
+import tempfile
+
+import telemetria
+
+EMU_POR_POLEGADA = 914400
+
+DPI = int(os.environ.get('RELATORIO_IMAGENS_DPI', 150))
+QUALIDADE_JPEG = 85
+DIRETORIO_CACHE = os.environ.get('RELATORIO_CACHE_IMAGENS') or os.path.join(
+    os.path.expanduser('~'), '.cache', 'relatoriopend', 'imagens')
+
+# Thumbnail que não decodifica: base64 inválido (binascii.Error) ou bytes que não
+# são imagem (PIL.UnidentifiedImageError é subclasse de OSError)
+ERROS_IMAGEM = (binascii.Error, OSError)
+
+def avisar_invalida(nome, erro):
+    """Avisa no stderr que a foto do registro `nome` ficou de fora do documento"""
+    telemetria.contar('imagens_invalidas')
+    print(f"⚠️  {nome or 'Sem nome'}: imagem inválida ({erro}); segue sem imagem", file=sys.stderr)
+
+def tamanho_alvo(largura, altura, dpi=None):
+    """Pixels necessários para uma área em EMU no DPI alvo"""
+    dpi = dpi or DPI
+    return (max(1, round(largura * dpi / EMU_POR_POLEGADA)),
+            max(1, round(altura * dpi / EMU_POR_POLEGADA)))
+
+def _caminho_cache(chave, diretorio):
+    return os.path.join(diretorio, chave[:2], chave)
+
+def _gravar_atomico(caminho, dados):
+    """Grava via arquivo temporário para que workers concorrentes nunca leiam arquivo parcial"""
+    os.makedirs(os.path.dirname(caminho), exist_ok=True)
+    fd, temporario = tempfile.mkstemp(dir=os.path.dirname(caminho), suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(dados)
+        os.replace(temporario, caminho)
+    except BaseException:
+        os.unlink(temporario)
+        raise
+
+def _recomprimir(blob, tamanho):
+    """Reduz a imagem para caber em `tamanho` e recomprime (JPEG, ou PNG se houver transparência)"""
+    from PIL import Image, ImageOps  # Pillow só é carregado quando a foto não está no cache
+    with Image.open(io.BytesIO(blob)) as original:
+        orientacao = original.getexif().get(0x0112, 1)
+        if (original.width <= tamanho[0] and original.height <= tamanho[1]
+                and orientacao == 1 and original.format in ('JPEG', 'PNG')):
+            return blob  # já é pequena e sem rotação pendente: mantém os bytes originais
+        img = ImageOps.exif_transpose(original)
+        transparente = img.mode in ('RGBA', 'LA') or (img.mode == 'P' and 'transparency' in img.info)
+        img.thumbnail(tamanho, Image.LANCZOS)
+
+        saida = io.BytesIO()
+        if transparente:
+            img.save(saida, 'PNG', optimize=True)
+        else:
+            img.convert('RGB').save(saida, 'JPEG', quality=QUALIDADE_JPEG, optimize=True, progressive=True)
+        return saida.getvalue()
+
+def _arquivo_cache(blob, tamanho, diretorio):
+    diretorio = DIRETORIO_CACHE if diretorio is None else diretorio
+    if not diretorio:
+        return None
+    chave = '%s-%dx%d-q%d' % (hashlib.sha256(blob).hexdigest(), tamanho[0], tamanho[1], QUALIDADE_JPEG)
+    caminho = _caminho_cache(chave, diretorio)
+    if os.path.exists(caminho):
+        telemetria.contar('cache_imagens_acertos')
+    else:
+        telemetria.contar('cache_imagens_faltas')
+        _gravar_atomico(caminho, _recomprimir(blob, tamanho))
+    return caminho
+
+def arquivo_imagem(blob, largura, altura, dpi=None, diretorio=None):
+    """Caminho no cache da imagem reduzida para `largura` x `altura` EMU (gerada se preciso); None sem cache"""
+    return _arquivo_cache(blob, tamanho_alvo(largura, altura, dpi), diretorio)
+
+def reduzir_imagem(blob, tamanho, diretorio=None):
+    """Bytes da imagem reduzida para caber em `tamanho` pixels, via cache em disco"""
+    caminho = _arquivo_cache(blob, tamanho, diretorio)
+    if caminho is None:
+        return _recomprimir(blob, tamanho)
+    with open(caminho, 'rb') as f:
+        return f.read()
+
+def preparar_imagem(blob, largura, altura, dpi=None, diretorio=None):
+    """Bytes da imagem reduzida para uma área de `largura` x `altura` EMU, via cache em disco"""
+    return reduzir_imagem(blob, tamanho_alvo(largura, altura, dpi), diretorio)
@@ -0,0 +1,377 @@
+"""Reconstrução incremental: só refaz os slides cujos dados mudaram
+
+Ao lado do .pptx fica um manifesto (<saida>.manifest.json) com a impressão
+digital de cada slide: SHA-256 da spec do slide (as thumbnails de fotos estão
+embutidas nela), mais a versão do código de layout, do modelo e do DPI das
+imagens, e o tamanho e a data de modificação do .pptx gravado. Na execução
+seguinte só os slides com impressão digital diferente são montados, numa
+apresentação à parte; o pacote final é o zip anterior com esses slides trocados
+(e slides novos/removidos no fim ajustados), sem passar pelo python-pptx para
+os slides que não mudaram. As partes que não mudaram são copiadas do zip antigo
+com os bytes já comprimidos, sem descomprimir e comprimir de novo, e o
+docProps/app.xml é refeito com o número e os títulos dos slides. Se nenhum
+slide mudou, o .pptx não é regravado.
+"""
+import hashlib
+import json
+import os
+import posixpath
+import struct
+import tempfile
+import zipfile
+
+from lxml import etree
+
+import imagens
+import layout
+import montagem
+import pacote
+import telemetria
+
+VERSAO_MANIFESTO = 2
+ARQUIVOS_LAYOUT = ('montagem.py', 'componentes.py', 'estilo.py', 'imagens.py', 'layout.py')
+
+NS_REL = 'http://schemas.openxmlformats.org/package/2006/relationships'
+NS_CT = 'http://schemas.openxmlformats.org/package/2006/content-types'
+NS_R = 'http://schemas.openxmlformats.org/officeDocument/2006/relationships'
+NS_P = 'http://schemas.openxmlformats.org/presentationml/2006/main'
+RT_SLIDE = 'http://schemas.openxmlformats.org/officeDocument/2006/relationships/slide'
+CT_SLIDE = 'application/vnd.openxmlformats-officedocument.presentationml.slide+xml'
+RT_APP = 'http://schemas.openxmlformats.org/officeDocument/2006/relationships/extended-properties'
+NS_EP = 'http://schemas.openxmlformats.org/officeDocument/2006/extended-properties'
+NS_VT = 'http://schemas.openxmlformats.org/officeDocument/2006/docPropsVTypes'
+PARTE_APP = 'docProps/app.xml'
+BLOCO = 1 << 20
+
+def versao_layout(modelo=None):
+    """Hash do código e do modelo que desenham os slides: mudou, todo slide é refeito"""
+    h = hashlib.sha256()
+    for nome in ARQUIVOS_LAYOUT:
+        with open(os.path.join(os.path.dirname(os.path.abspath(__file__)), nome), 'rb') as f:
+            h.update(f.read())
+    if modelo:
+        h.update(montagem._bytes_modelo(modelo))
+    h.update(f'dpi={imagens.DPI};q={imagens.QUALIDADE_JPEG};fonte={layout.metricas().nome}'.encode())
+    return h.hexdigest()
+
+def impressao_digital(dados):
+    """SHA-256 da spec de um slide em JSON canônico"""
+    texto = json.dumps(dados, sort_keys=True, ensure_ascii=False, separators=(',', ':'), default=str)
+    return hashlib.sha256(texto.encode('utf-8')).hexdigest()
+
+def caminho_manifesto(saida):
+    return saida + '.manifest.json'
+
+def carimbo(saida):
+    """Tamanho e data de modificação de `saida`, ou None se o arquivo não existe"""
+    try:
+        info = os.stat(saida)
+    except FileNotFoundError:
+        return None
+    return [info.st_size, info.st_mtime_ns]
+
+def ler_manifesto(saida, versao):
+    """Impressões digitais do build anterior, ou [] se não houver build reaproveitável
+
+    O manifesto só vale para o .pptx que o gravou: se `saida` foi regravado depois
+    (por um build completo, por exemplo), o deck inteiro é refeito.
+    """
+    try:
+        with open(caminho_manifesto(saida), encoding='utf-8') as f:
+            manifesto = json.load(f)
+    except (FileNotFoundError, ValueError):
+        return []
+    if (manifesto.get('versao') != VERSAO_MANIFESTO or manifesto.get('layout') != versao
+            or manifesto.get('saida') != carimbo(saida)):
+        return []
+    return manifesto.get('slides', [])
+
+def _xml(elemento):
+    return etree.tostring(elemento, xml_declaration=True, encoding='UTF-8', standalone=True)
+
+def _rels_de(parte):
+    pasta, nome = posixpath.split(parte)
+    return posixpath.join(pasta, '_rels', nome + '.rels')
+
+def _alvo(parte, rel):
+    return posixpath.normpath(posixpath.join(posixpath.dirname(parte), rel.get('Target')))
+
+def _relacoes(elemento):
+    return elemento.iter(f'{{{NS_REL}}}Relationship')
+
+def _partes_slides(arquivo):
+    """Nomes das partes de slide no zip, na ordem da apresentação"""
+    rels = etree.fromstring(arquivo.read('ppt/_rels/presentation.xml.rels'))
+    alvos = {r.get('Id'): _alvo('ppt/presentation.xml', r) for r in _relacoes(rels)}
+    apresentacao = etree.fromstring(arquivo.read('ppt/presentation.xml'))
+    return [alvos[s.get(f'{{{NS_R}}}id')] for s in apresentacao.iter(f'{{{NS_P}}}sldId')]
+
+def _midia(arquivo, parte):
+    """Mídia (caminhos no zip) referenciada pelas relações de uma parte"""
+    rels = etree.fromstring(arquivo.read(_rels_de(parte)))
+    return {_alvo(parte, r) for r in _relacoes(rels)
+            if r.get('TargetMode') != 'External' and _alvo(parte, r).startswith('ppt/media/')}
+
+def _comprimir(nome):
+    """Mídia já comprimida (JPEG/PNG...) vai sem deflate"""
+    return zipfile.ZIP_DEFLATED if nome.endswith(('.xml', '.rels')) else zipfile.ZIP_STORED
+
+def _copiar_bruto(za, info, zd):
+    """Copia a parte `info` de `za` para `zd` com os bytes comprimidos como estão
+
+    O zipfile só copia descomprimindo e comprimindo de novo: aqui o cabeçalho
+    local é refeito a partir do ZipInfo antigo e os dados vão em blocos.
+    """
+    za.fp.seek(info.header_offset)
+    cabecalho = za.fp.read(zipfile.sizeFileHeader)
+    tamanho_nome, tamanho_extra = struct.unpack('<HH', cabecalho[26:30])
+    za.fp.seek(info.header_offset + zipfile.sizeFileHeader + tamanho_nome + tamanho_extra)
+    copia = zipfile.ZipInfo(info.filename, info.date_time)
+    copia.compress_type, copia.CRC = info.compress_type, info.CRC
+    copia.compress_size, copia.file_size = info.compress_size, info.file_size
+    copia.external_attr = info.external_attr
+    zip64 = max(info.compress_size, info.file_size) > zipfile.ZIP64_LIMIT
+    with zd._lock:
+        copia.header_offset = zd.fp.tell()
+        zd.fp.write(copia.FileHeader(zip64))
+        restante = info.compress_size
+        while restante:
+            dados = za.fp.read(min(BLOCO, restante))
+            if not dados:
+                raise zipfile.BadZipFile(f"{info.filename} truncado no pacote anterior")
+            zd.fp.write(dados)
+            restante -= len(dados)
+        zd.filelist.append(copia)
+        zd.NameToInfo[copia.filename] = copia
+        zd.start_dir = zd.fp.tell()
+        zd._didModify = True
+
+def _titulo(dados):
+    """Título do slide para o docProps/app.xml"""
+    titulo = dados.get('titulo') or dados.get('name') or ''
+    return ' '.join(titulo) if isinstance(titulo, list) else str(titulo)
+
+def _app_xml(dados, titulos):
+    """docProps/app.xml com o número de slides e os títulos em `titulos`"""
+    app = etree.fromstring(dados)
+    slides = app.find(f'{{{NS_EP}}}Slides')
+    if slides is not None:
+        slides.text = str(len(titulos))
+    pares = app.find(f'{{{NS_EP}}}HeadingPairs/{{{NS_VT}}}vector')
+    partes = app.find(f'{{{NS_EP}}}TitlesOfParts/{{{NS_VT}}}vector')
+    if pares is None or partes is None:
+        return _xml(app)
+    # HeadingPairs: pares (nome do grupo, quantos títulos) na ordem de TitlesOfParts
+    inicio, anteriores = 0, 0
+    variantes = list(pares)
+    for nome, contagem in zip(variantes[::2], variantes[1::2]):
+        quantos = contagem.find(f'{{{NS_VT}}}i4')
+        if nome.findtext(f'{{{NS_VT}}}lpstr') == 'Slide Titles':
+            anteriores = int(quantos.text)
+            quantos.text = str(len(titulos))
+            break
+        inicio += int(quantos.text)
+    else:
+        for tag, texto in (('lpstr', 'Slide Titles'), ('i4', str(len(titulos)))):
+            etree.SubElement(etree.SubElement(pares, f'{{{NS_VT}}}variant'), f'{{{NS_VT}}}{tag}').text = texto
+        pares.set('size', str(len(pares)))
+    for item in list(partes)[inicio:inicio + anteriores]:
+        partes.remove(item)
+    for j, titulo in enumerate(titulos):
+        item = etree.Element(f'{{{NS_VT}}}lpstr')
+        item.text = titulo
+        partes.insert(inicio + j, item)
+    partes.set('size', str(len(partes)))
+    return _xml(app)
+
+def _atualizar_app(prs, titulos):
+    """Põe os slides do deck no docProps/app.xml (o python-pptx mantém o do modelo)"""
+    try:
+        parte = prs.part.package.part_related_by(RT_APP)
+    except KeyError:
+        return
+    parte._blob = _app_xml(parte.blob, titulos)
+
+@telemetria.medir()
+def montar_pacote(antigo, novo, sujos, total, destino):
+    """Grava `destino`: o pacote `antigo` com os slides `sujos` vindos de `novo`
+
+    `novo` contém só os slides refeitos, na ordem de `sujos` (índices base 0 no
+    deck final de `total` slides), e o docProps/app.xml do deck final. Slides além
+    do fim do pacote antigo são acrescentados e os que sobram no antigo são
+    removidos; mídia que deixou de ser referenciada não é copiada, e mídia refeita
+    com o mesmo conteúdo de uma já existente aponta para a parte antiga em vez de
+    ser gravada outra vez. O resto vem do pacote antigo sem recompressão.
+    """
+    with zipfile.ZipFile(antigo) as za, zipfile.ZipFile(novo) as zn:
+        partes = _partes_slides(za)
+        partes_novas = dict(zip(sujos, _partes_slides(zn)))
+        removidas = partes[total:]
+        partes = partes[:total]
+
+        apresentacao = etree.fromstring(za.read('ppt/presentation.xml'))
+        rels_apresentacao = etree.fromstring(za.read('ppt/_rels/presentation.xml.rels'))
+        tipos = etree.fromstring(za.read('[Content_Types].xml'))
+
+        # Slides que sobram no pacote antigo saem de presentation.xml e do [Content_Types].xml
+        if removidas:
+            ids = {r.get('Id') for r in _relacoes(rels_apresentacao)
+                   if _alvo('ppt/presentation.xml', r) in removidas}
+            for r in list(_relacoes(rels_apresentacao)):
+                if r.get('Id') in ids:
+                    rels_apresentacao.remove(r)
+            for s in list(apresentacao.iter(f'{{{NS_P}}}sldId')):
+                if s.get(f'{{{NS_R}}}id') in ids:
+                    s.getparent().remove(s)
+            nomes = {'/' + p for p in removidas}
+            for o in list(tipos.iter(f'{{{NS_CT}}}Override')):
+                if o.get('PartName') in nomes:
+                    tipos.remove(o)
+
+        # Slides acrescentados no fim ganham parte, relação, sldId e Override novos
+        if total > len(partes):
+            existentes = set(za.namelist())
+            numero = 1
+            lista = apresentacao.find(f'{{{NS_P}}}sldIdLst')
+            proximo_id = max([int(s.get('id')) for s in lista] + [255]) + 1
+            proximo_rid = max([int(r.get('Id')[3:]) for r in _relacoes(rels_apresentacao)
+                               if r.get('Id', '').startswith('rId') and r.get('Id')[3:].isdigit()] + [0]) + 1
+            while len(partes) < total:
+                while f'ppt/slides/slide{numero}.xml' in existentes:
+                    numero += 1
+                parte = f'ppt/slides/slide{numero}.xml'
+                existentes.add(parte)
+                partes.append(parte)
+                etree.SubElement(rels_apresentacao, f'{{{NS_REL}}}Relationship', Id=f'rId{proximo_rid}',
+                                 Type=RT_SLIDE, Target=posixpath.relpath(parte, 'ppt'))
+                etree.SubElement(lista, f'{{{NS_P}}}sldId', {'id': str(proximo_id), f'{{{NS_R}}}id': f'rId{proximo_rid}'})
+                etree.SubElement(tipos, f'{{{NS_CT}}}Override', PartName='/' + parte, ContentType=CT_SLIDE)
+                proximo_id += 1
+                proximo_rid += 1
+
+        # Mídia antiga fica se alguma parte mantida a usa: slides não refeitos e também
+        # layouts, masters, tema e notas (só as relações dos slides trocados ou removidos saem)
+        trocadas = {partes[i] for i in partes_novas} | set(removidas)
+        midia_antiga = set()
+        for nome in za.namelist():
+            pasta, _, arquivo = nome.rpartition('/_rels/')
+            if not arquivo.endswith('.rels') or not pasta:
+                continue
+            parte = posixpath.join(pasta, arquivo[:-len('.rels')])
+            if parte not in trocadas:
+                midia_antiga |= _midia(za, parte)
+        # Conteúdo da mídia antiga por (CRC, tamanho), para não gravar de novo a mesma imagem
+        conteudo_antigo = {}
+        for nome in midia_antiga:
+            info = za.getinfo(nome)
+            conteudo_antigo.setdefault((info.CRC, info.file_size), []).append(nome)
+
+        def _midia_existente(caminho):
+            info = zn.getinfo(caminho)
+            candidatos = conteudo_antigo.get((info.CRC, info.file_size), ())
+            if candidatos:
+                dados = zn.read(caminho)
+                for nome in candidatos:
+                    if za.read(nome) == dados:
+                        return nome
+            return None
+
+        # XML dos slides refeitos; mídia nova é renomeada pelo conteúdo para não colidir com a antiga
+        substituir = {}
+        midia_nova = {}  # nome no destino -> nome no pacote novo
+        destino_midia = {}  # nome no pacote novo -> nome no destino
+        for i, origem in partes_novas.items():
+            alvo = partes[i]
+            substituir[alvo] = zn.read(origem)
+            rels = etree.fromstring(zn.read(_rels_de(origem)))
+            for r in _relacoes(rels):
+                if r.get('TargetMode') == 'External':
+                    continue
+                caminho = _alvo(origem, r)
+                if caminho.startswith('ppt/media/'):
+                    if caminho not in destino_midia:
+                        nome = _midia_existente(caminho)
+                        if nome is None:
+                            info = zn.getinfo(caminho)
+                            nome = 'ppt/media/img-%08x-%d%s' % (info.CRC, info.file_size, posixpath.splitext(caminho)[1])
+                            midia_nova[nome] = caminho
+                        destino_midia[caminho] = nome
+                    r.set('Target', posixpath.relpath(destino_midia[caminho], posixpath.dirname(alvo)))
+            substituir[_rels_de(alvo)] = _xml(rels)
+
+        existentes = {d.get('Extension').lower() for d in tipos.iter(f'{{{NS_CT}}}Default')}
+        for d in etree.fromstring(zn.read('[Content_Types].xml')).iter(f'{{{NS_CT}}}Default'):
+            if d.get('Extension').lower() not in existentes:
+                tipos.insert(0, d)
+
+        substituir['ppt/presentation.xml'] = _xml(apresentacao)
+        substituir['ppt/_rels/presentation.xml.rels'] = _xml(rels_apresentacao)
+        substituir['[Content_Types].xml'] = _xml(tipos)
+        if PARTE_APP in za.NameToInfo and PARTE_APP in zn.NameToInfo:
+            substituir[PARTE_APP] = zn.read(PARTE_APP)
+        descartar = set(removidas) | {_rels_de(p) for p in removidas}
+
+        with zipfile.ZipFile(destino, 'w') as zd:
+            zd.writestr('[Content_Types].xml', substituir.pop('[Content_Types].xml'), zipfile.ZIP_DEFLATED)
+            for info in za.infolist():
+                nome = info.filename
+                if nome in descartar or nome == '[Content_Types].xml':
+                    continue
+                if nome.startswith('ppt/media/') and nome not in midia_antiga:
+                    continue
+                if nome in substituir:
+                    zd.writestr(nome, substituir.pop(nome), _comprimir(nome))
+                else:
+                    _copiar_bruto(za, info, zd)
+            for nome, dados in substituir.items():  # partes de slides acrescentados
+                zd.writestr(nome, dados, _comprimir(nome))
+            for nome, caminho in midia_nova.items():
+                zd.writestr(nome, zn.read(caminho), zipfile.ZIP_STORED)
+
+def _gravar(saida, gravar):
+    """Chama gravar(caminho temporário) e troca `saida` atomicamente"""
+    fd, temporario = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(saida)), suffix='.pptx')
+    os.close(fd)
+    try:
+        gravar(temporario)
+        mascara = os.umask(0)
+        os.umask(mascara)
+        os.chmod(temporario, 0o666 & ~mascara)  # mkstemp cria com 0600
+        os.replace(temporario, saida)
+    except BaseException:
+        os.unlink(temporario)
+        raise
+
+def build_incremental(spec, saida):
+    """Monta o deck em `saida` reaproveitando os slides inalterados do build anterior
+
+    Devolve (total de slides, índices dos slides refeitos).
+    """
+    versao = versao_layout(spec.get('modelo'))
+    anteriores = ler_manifesto(saida, versao)
+
+    slides = list(layout.expandir(spec['slides'], montagem.LISTAS))
+    impressoes = [impressao_digital(dados) for dados in slides]
+    refeitos = [i for i, digital in enumerate(impressoes) if i >= len(anteriores) or anteriores[i] != digital]
+    if anteriores and not refeitos and len(impressoes) == len(anteriores):
+        return len(impressoes), refeitos  # nada mudou: o .pptx e o manifesto ficam como estão
+
+    prs = montagem.nova_apresentacao(spec.get('modelo'))
+    for i in refeitos:
+        montagem.build_slide(prs, slides[i], i)
+    _atualizar_app(prs, [_titulo(dados) for dados in slides])
+
+    if not anteriores:
+        _gravar(saida, lambda destino: pacote.salvar(prs, destino))
+    else:
+        fd, parcial = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(saida)), suffix='.pptx')
+        os.close(fd)
+        try:
+            pacote.salvar(prs, parcial)
+            _gravar(saida, lambda destino: montar_pacote(saida, parcial, refeitos, len(impressoes), destino))
+        finally:
+            os.unlink(parcial)
+
+    with open(caminho_manifesto(saida), 'w', encoding='utf-8') as f:
+        json.dump({'versao': VERSAO_MANIFESTO, 'layout': versao, 'saida': carimbo(saida), 'slides': impressoes}, f)
+    return len(impressoes), refeitos
@@ -0,0 +1,312 @@
+"""Layout automático: medida de texto, ajuste de fonte, grades e paginação
+
+Em vez de alturas fixas por slide, o texto é medido com as métricas da fonte
+do deck (Calibri, do tema do modelo padrão) e as caixas crescem, encolhem a
+fonte ou passam para o slide seguinte conforme o conteúdo.
+
+A fonte é carregada uma única vez, numa escala de 1000 unidades por em; a
+largura de cada caractere e de cada palavra fica em cache, então medir um
+texto é somar larguras já conhecidas. Sem Calibri (ou Carlito, compatível em
+métricas) no sistema, usa DejaVu Sans, que é mais larga: o texto sobra na
+caixa, mas não vaza. Outra fonte pode ser indicada por variável de ambiente.
+
+Spec de slide 'cards' (um card por item, quantos slides forem necessários):
+
+    {"tipo": "cards", "titulo": "Pendências", "colunas": 3,
+     "cards": [{"icone": "📍", "titulo": "Rua A", "texto": "Vazamento..."}, ...]}
+
+expandir() troca cada spec 'cards' pelas suas páginas já posicionadas, numa
+passada só; montagem.build_deck e incremental.build_incremental a aplicam.
+
+Os slides de lista (fluxo, visão geral, benefícios, tecnologia, roadmap)
+descrevem cada lista com uma Lista (montagem.LISTAS): a altura dos itens sai
+do texto medido e o que passa do fim da área continua num slide "(2/n)".
+
+Variáveis de ambiente:
+    RELATORIO_FONTE          arquivo .ttf da fonte do texto
+    RELATORIO_FONTE_NEGRITO  arquivo .ttf da variante negrito
+"""
+import functools
+import os
+
+from pptx.util import Inches, Pt
+
+UNIDADES_POR_EM = 1000
+ENTRELINHA = 1.2  # espaçamento simples do PowerPoint, em múltiplos do tamanho da fonte
+MARGEM_X, MARGEM_Y = Inches(0.1), Inches(0.05)  # margens internas padrão da caixa de texto
+FATOR_NEGRITO = 1.06  # quando não há arquivo da variante negrito
+
+FONTES = ('calibri.ttf', 'Carlito-Regular.ttf', 'DejaVuSans.ttf')
+FONTES_NEGRITO = ('calibrib.ttf', 'Carlito-Bold.ttf', 'DejaVuSans-Bold.ttf')
+
+# Área útil abaixo do cabeçalho (componentes.cabecalho) num slide de 16x9in
+AREA_LEFT, AREA_TOP = Inches(0.5), Inches(2)
+AREA_LARGURA, AREA_ALTURA = Inches(15), Inches(6.7)
+ESPACO = Inches(0.4)
+RECUO = Inches(0.2)  # do texto para a borda do card
+
+TAMANHO_ICONE, TAMANHO_TITULO, TAMANHO_TEXTO, TAMANHO_MINIMO = 36, 18, 14, 10
+
+def _carregar(env, candidatos):
+    from PIL import ImageFont  # Pillow já vem com o python-pptx
+    nomes = [os.environ[env]] if os.environ.get(env) else candidatos
+    for nome in nomes:
+        try:
+            return ImageFont.truetype(nome, UNIDADES_POR_EM)
+        except OSError:
+            pass
+    return None
+
+class Metricas:
+    """Larguras de caractere e de palavra de uma fonte, em ems, com cache"""
+
+    def __init__(self):
+        fonte = _carregar('RELATORIO_FONTE', FONTES)
+        negrito = _carregar('RELATORIO_FONTE_NEGRITO', FONTES_NEGRITO) if fonte else None
+        if fonte is None:
+            from PIL import ImageFont
+            fonte = ImageFont.load_default(UNIDADES_POR_EM)
+        self.nome = ' '.join(fonte.getname())
+        self._fontes = (fonte, negrito or fonte)
+        self._fatores = (1.0, 1.0 if negrito else FATOR_NEGRITO)
+        self._caracteres = ({}, {})
+
+    def caractere(self, c, negrito=False):
+        larguras = self._caracteres[negrito]
+        largura = larguras.get(c)
+        if largura is None:
+            largura = larguras[c] = (self._fontes[negrito].getlength(c) / UNIDADES_POR_EM
+                                     * self._fatores[negrito])
+        return largura
+
+    @functools.lru_cache(maxsize=1 << 16)
+    def palavra(self, texto, negrito=False):
+        """Largura de `texto` em ems (sem kerning: soma das larguras dos caracteres)"""
+        return sum(self.caractere(c, negrito) for c in texto)
+
+@functools.lru_cache(maxsize=1)
+def metricas():
+    """Métricas da fonte do deck, carregadas no primeiro uso"""
+    return Metricas()
+
+def _cortar(palavra, largura, negrito, m):
+    """Parte uma palavra maior que a linha, como o PowerPoint faz"""
+    pedacos, atual, usado = [], '', 0.0
+    for c in palavra:
+        w = m.caractere(c, negrito)
+        if atual and usado + w > largura:
+            pedacos.append(atual)
+            atual, usado = '', 0.0
+        atual += c
+        usado += w
+    return pedacos + [atual]
+
+@functools.lru_cache(maxsize=1 << 16)
+def quebrar(texto, largura, tamanho, negrito=False):
+    """Linhas de `texto` numa caixa de `largura` EMU com fonte de `tamanho` pt (tupla)"""
+    m = metricas()
+    limite = (largura - 2 * MARGEM_X) / Pt(tamanho)  # em ems
+    espaco = m.caractere(' ', negrito)
+    linhas = []
+    for paragrafo in str(texto).split('\n'):
+        atual, usado = [], 0.0
+        for palavra in paragrafo.split():
+            w = m.palavra(palavra, negrito)
+            if w > limite:
+                pedacos = _cortar(palavra, limite, negrito, m)
+                if atual:
+                    linhas.append(' '.join(atual))
+                linhas.extend(pedacos[:-1])
+                atual, usado = [pedacos[-1]], m.palavra(pedacos[-1], negrito)
+            elif atual and usado + espaco + w > limite:
+                linhas.append(' '.join(atual))
+                atual, usado = [palavra], w
+            else:
+                usado += (espaco if atual else 0) + w
+                atual.append(palavra)
+        linhas.append(' '.join(atual))
+    return tuple(linhas)
+
+def altura_linhas(linhas, tamanho):
+    """Altura em EMU da caixa de texto com `linhas` linhas"""
+    return int(linhas * ENTRELINHA * Pt(tamanho)) + 2 * MARGEM_Y
+
+def altura_texto(texto, largura, tamanho, negrito=False):
+    """Altura em EMU que o texto ocupa numa caixa de `largura` EMU"""
+    return altura_linhas(len(quebrar(texto, largura, tamanho, negrito)), tamanho)
+
+def excesso(texto, largura, tamanho, linhas, negrito=False):
+    """Altura em EMU que o texto pede além das `linhas` linhas que a caixa já comporta"""
+    return max(0, altura_texto(texto, largura, tamanho, negrito) - altura_linhas(linhas, tamanho))
+
+def ajustar_fonte(texto, largura, altura, tamanho, minimo=TAMANHO_MINIMO, negrito=False):
+    """Maior tamanho de fonte (pt, até `tamanho`) em que o texto cabe na caixa
+
+    Devolve (tamanho, texto): se nem em `minimo` couber, o texto volta cortado
+    com reticências no tamanho mínimo.
+    """
+    for pt in range(tamanho, minimo - 1, -1):
+        if altura_texto(texto, largura, pt, negrito) <= altura:
+            return pt, texto
+    return minimo, truncar(texto, largura, altura, minimo, negrito)
+
+def truncar(texto, largura, altura, tamanho, negrito=False):
+    """Primeiras linhas do texto que cabem na altura, com reticências no fim"""
+    linhas = quebrar(texto, largura, tamanho, negrito)
+    cabem = max(1, int((altura - 2 * MARGEM_Y) / (ENTRELINHA * Pt(tamanho))))
+    if len(linhas) <= cabem:
+        return texto
+    ultima = linhas[cabem - 1]
+    # Tira palavras do fim até as reticências caberem na última linha
+    while ultima and len(quebrar(ultima + '…', largura, tamanho, negrito)) > 1:
+        ultima = ultima.rpartition(' ')[0]
+    return '\n'.join(linhas[:cabem - 1] + (ultima.rstrip() + '…',))
+
+def grade(total, colunas, left, top, largura, altura, espaco_x=ESPACO, espaco_y=ESPACO):
+    """Posições (x, y) em EMU de `total` células de largura x altura, linha a linha"""
+    passo_x, passo_y = largura + espaco_x, altura + espaco_y
+    return [(left + (i % colunas) * passo_x, top + (i // colunas) * passo_y) for i in range(total)]
+
+def largura_coluna(colunas, largura=AREA_LARGURA, espaco=ESPACO):
+    """Largura de cada coluna para `colunas` colunas ocupando `largura`"""
+    return (largura - (colunas - 1) * espaco) // colunas
+
+# Cards
+
+def _card(card, largura, altura_maxima):
+    """Textos do card (papel, texto, deslocamento y, altura, pt, negrito) e altura total"""
+    interna = largura - 2 * RECUO
+    textos, y = [], RECUO // 2
+    if card.get('icone'):
+        h = altura_linhas(1, TAMANHO_ICONE)
+        textos.append(['icone', card['icone'], y, h, TAMANHO_ICONE, False])
+        y += h
+    if card.get('titulo'):
+        livre = altura_maxima - y - RECUO // 2
+        if card.get('texto'):
+            livre //= 2  # metade fica garantida para o texto
+        pt, titulo = TAMANHO_TITULO, card['titulo']
+        h = altura_texto(titulo, interna, pt, True)
+        if h > livre:
+            pt, titulo = ajustar_fonte(titulo, interna, livre, TAMANHO_TITULO, negrito=True)
+            h = altura_texto(titulo, interna, pt, True)
+        textos.append(['titulo', titulo, y, h, pt, True])
+        y += h
+    if card.get('texto'):
+        livre = altura_maxima - y - RECUO // 2
+        pt, texto = TAMANHO_TEXTO, card['texto']
+        h = altura_texto(texto, interna, pt)
+        if h > livre:  # não cabe nem sozinho num slide: encolhe a fonte e, no limite, corta
+            pt, texto = ajustar_fonte(texto, interna, livre, TAMANHO_TEXTO)
+            h = altura_texto(texto, interna, pt)
+        textos.append(['texto', texto, y, h, pt, False])
+        y += h
+    return textos, y + RECUO // 2
+
+def empilhar(alturas, top=AREA_TOP, espaco=ESPACO, fundo=AREA_TOP + AREA_ALTURA):
+    """Páginas de linhas empilhadas a partir de `top`: listas de (índice, y) que cabem até `fundo`"""
+    paginas, atual, y = [], [], top
+    for i, altura in enumerate(alturas):
+        if atual and y + altura > fundo:
+            paginas.append(atual)
+            atual, y = [], top
+        atual.append((i, y))
+        y += altura + espaco
+    paginas.append(atual)
+    return paginas
+
+def _sufixo(p, total):
+    return f" ({p + 1}/{total})" if total > 1 else ""
+
+def paginar_cards(dados):
+    """Páginas (specs de slide 'cards' posicionadas) dos cards de uma spec 'cards'
+
+    Os cards são dispostos em linhas de `colunas`; cada linha tem a altura do
+    maior card dela e vai para o slide seguinte quando não cabe mais no atual.
+    """
+    colunas = max(1, int(dados.get('colunas', 3)))
+    largura = largura_coluna(colunas)
+    cards = dados.get('cards') or []
+    linhas = [[_card(card, largura, AREA_ALTURA) for card in cards[inicio:inicio + colunas]]
+              for inicio in range(0, len(cards), colunas)]
+    alturas = [max(h for _, h in linha) for linha in linhas]
+    paginas = empilhar(alturas)
+
+    titulo = dados.get('titulo') or ""
+    for p, pagina in enumerate(paginas):
+        posicionados = [{'caixa': [AREA_LEFT + coluna * (largura + ESPACO), y, largura, alturas[k]], 'textos': textos}
+                        for k, y in pagina for coluna, (textos, _) in enumerate(linhas[k])]
+        yield {'tipo': 'cards', 'titulo': titulo + _sufixo(p, len(paginas)), 'posicionados': posicionados}
+
+# Listas
+
+class Lista:
+    """Itens de um campo da spec em grade de `colunas`, crescendo com o texto
+
+    `medir(item)` dá a altura (EMU) de que o item precisa; cada linha da grade
+    tem a maior entre `altura` e a dos seus itens, sem passar de uma página.
+    O que não cabe até `fundo` vai para o slide seguinte (paginar).
+    """
+
+    def __init__(self, left, top, largura, altura, medir, colunas=1, espaco_x=ESPACO, espaco_y=ESPACO,
+                 fundo=AREA_TOP + AREA_ALTURA):
+        self.left, self.top, self.largura, self.altura = left, top, largura, altura
+        self.medir, self.colunas = medir, colunas
+        self.espaco_x, self.espaco_y, self.fundo = espaco_x, espaco_y, fundo
+
+    def alturas(self, itens):
+        """Altura de cada linha da grade"""
+        teto = self.fundo - self.top
+        return [min(teto, max(self.altura, *map(self.medir, itens[inicio:inicio + self.colunas])))
+                for inicio in range(0, len(itens), self.colunas)]
+
+    def posicoes(self, itens):
+        """(x, y, largura, altura) de cada item, linha após linha (uma página já paginada)"""
+        alturas = self.alturas(itens)
+        xs = [x for x, _ in grade(self.colunas, self.colunas, self.left, 0, self.largura, 0, self.espaco_x)]
+        posicoes, y = [], self.top
+        for i in range(len(itens)):
+            linha, coluna = divmod(i, self.colunas)
+            if i and not coluna:
+                y += alturas[linha - 1] + self.espaco_y
+            posicoes.append((xs[coluna], y, self.largura, alturas[linha]))
+        return posicoes
+
+    def fatias(self, itens):
+        """Fatias de `itens` que cabem em cada slide"""
+        paginas = empilhar(self.alturas(itens), self.top, self.espaco_y, self.fundo)
+        return [slice(pagina[0][0] * self.colunas, (pagina[-1][0] + 1) * self.colunas) if pagina else slice(0, 0)
+                for pagina in paginas]
+
+def paginar(dados, listas):
+    """Páginas de uma spec com listas (campo -> Lista); cada lista pagina por conta própria
+
+    O slide se repete até a lista mais longa acabar; as demais ficam vazias
+    nas páginas que sobram. Spec que já cabe num slide passa como está.
+    """
+    fatias = {campo: lista.fatias(dados.get(campo) or []) for campo, lista in listas.items()}
+    total = max(len(f) for f in fatias.values())
+    if total == 1:
+        yield dados
+        return
+    for p in range(total):
+        pagina = dict(dados, titulo=(dados.get('titulo') or "") + _sufixo(p, total))
+        for campo, partes in fatias.items():
+            pagina[campo] = (dados.get(campo) or [])[partes[p]] if p < len(partes) else []
+        yield pagina
+
+def expandir(slides, listas=None):
+    """Specs de slide com cada 'cards' trocado pelas suas páginas e as listas paginadas
+
+    `listas` mapeia tipo de slide -> {campo: Lista} (montagem.LISTAS); specs
+    já paginadas passam direto.
+    """
+    listas = listas or {}
+    for dados in slides:
+        tipo = dados.get('tipo')
+        if tipo == 'cards' and 'posicionados' not in dados:
+            yield from paginar_cards(dados)
+        elif tipo in listas:
+            yield from paginar(dados, listas[tipo])
+        else:
+            yield dados
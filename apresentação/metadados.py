@@ -0,0 +1,82 @@
+"""Leitura de registros ImageMetadata (types/image-metadata.ts)
+
+Aceita o backup JSON exportado pela aplicação web (lib/export/json.ts, um
+array de objetos) ou JSONL (um objeto por linha). O arquivo é lido em blocos
+e cada registro é decodificado isoladamente, então um backup de centenas de MB
+nunca é carregado inteiro na memória.
+"""
+import base64
+import datetime
+import json
+
+STATUS = ("Pendente", "Concluido", "Atrasado")
+
+BLOCO = 1 << 16  # 64 KiB
+_SEPARADORES = frozenset(' \t\r\n,[]')
+_decoder = json.JSONDecoder()
+
+def iterar_registros(caminho, bloco=BLOCO):
+    """Gera cada objeto do array JSON (ou do JSONL) sem carregar o arquivo todo"""
+    with open(caminho, encoding='utf-8') as f:
+        buffer = ''
+        pos = 0
+        fim_arquivo = False
+        while True:
+            # Pula separadores entre objetos: espaços, vírgulas e colchetes do array
+            while pos < len(buffer) and buffer[pos] in _SEPARADORES:
+                pos += 1
+            if pos == len(buffer):
+                if fim_arquivo:
+                    return
+                buffer, pos = f.read(bloco), 0
+                fim_arquivo = not buffer
+                continue
+            try:
+                registro, pos = _decoder.raw_decode(buffer, pos)
+            except json.JSONDecodeError:
+                if fim_arquivo:
+                    raise
+                # Objeto incompleto no buffer: lê mais, no mínimo o tamanho já acumulado,
+                # para que thumbnails de vários MB não sejam reanalisados a cada bloco
+                mais = f.read(max(bloco, len(buffer) - pos))
+                fim_arquivo = not mais
+                buffer = buffer[pos:] + mais
+                pos = 0
+                continue
+            yield registro
+
+def decodificar_thumbnail(data_uri):
+    """Bytes da imagem de um data URI base64 (ou base64 puro)"""
+    if not data_uri:
+        return b''
+    _, _, dados = data_uri.rpartition(',')
+    return base64.b64decode(dados)
+
+def ler_data(texto):
+    """Data do toLocaleString("pt-BR") do image-processor.ts ("18/10/2026, 10:00:00") ou ISO"""
+    if not texto:
+        return None
+    for formato in ('%d/%m/%Y, %H:%M:%S', '%d/%m/%Y %H:%M:%S', '%d/%m/%Y'):
+        try:
+            return datetime.datetime.strptime(texto, formato)
+        except ValueError:
+            pass
+    try:
+        return datetime.datetime.fromisoformat(texto)
+    except ValueError:
+        return None
+
+def ler_previsao(texto):
+    """predictionDate ("AAAA-MM-DD", do input type="date")"""
+    try:
+        return datetime.date.fromisoformat(texto[:10])
+    except (TypeError, ValueError):
+        return None
+
+def adicionar_dias_uteis(data, dias):
+    """Data `dias` dias úteis depois de `data`, pulando sábados e domingos (lib/date-utils.ts)"""
+    while dias > 0:
+        data += datetime.timedelta(days=1)
+        if data.weekday() < 5:
+            dias -= 1
+    return data
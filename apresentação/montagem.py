@@ -0,0 +1,466 @@
+"""Montagem dos slides com python-pptx (tipos de slide da spec, modelo e fotos)
+
+Separado do gerar_pptx.py para que a CLI só importe python-pptx, lxml e Pillow
+quando uma renderização de fato começa.
+"""
+from pptx import Presentation
+from pptx.util import Inches
+from pptx.dml.color import RGBColor
+from pptx.oxml.ns import qn
+import functools
+import io
+import os
+import time
+
+import pptx
+
+from estilo import COR_FUNDO, COR_AZUL, COR_CIANO, COR_BRANCO, COR_TEXTO, COR_VERDE, COR_VERMELHO, COR_STATUS, LARGURA_FOTO, ALTURA_FOTO
+import componentes
+import coordenadas
+import imagens
+import layout
+import metadados
+import pacote
+import telemetria
+
+_RUN = qn('a:r')  # runs de texto contados na telemetria por slide
+
+# Listas dos slides que crescem com o texto e paginam (layout.Lista), por tipo e campo.
+# A altura mínima de cada item é a do desenho original; o texto variável mede o resto.
+# Nas descrições em caixa fixa, o item só cresce pelo que passa das linhas que o desenho
+# original já comporta (layout.excesso), para o deck do deck_brk.json não mudar de geometria.
+LISTAS = {
+    'visao_geral': {'features': layout.Lista(
+        Inches(0.5), Inches(4), Inches(4.8), Inches(2), colunas=3,
+        medir=lambda f: Inches(1) + layout.altura_texto(f[1], Inches(4.8), 16))},
+    'fluxo': {'steps': layout.Lista(
+        Inches(0.8), Inches(1.9), Inches(14.7), Inches(0.8), espaco_y=Inches(0.4),
+        medir=lambda p: Inches(0.8) + layout.excesso(p[2], Inches(13), 14, 2))},
+    'beneficios': {'ganhos': layout.Lista(
+        Inches(0.5), Inches(2.7), Inches(7), Inches(0.7), espaco_y=Inches(0.2),
+        medir=lambda g: Inches(0.2) + layout.altura_texto(g, Inches(6.5), 16))},
+    'tecnologia': {
+        'stack': layout.Lista(
+            Inches(0.5), Inches(2.7), Inches(7), Inches(0.7), espaco_y=Inches(0.2),
+            medir=lambda item: Inches(0.2) + layout.altura_texto(item, Inches(6.5), 15)),
+        'seg_boxes': layout.Lista(
+            Inches(8.5), Inches(2.7), Inches(7), Inches(1.3), espaco_y=Inches(0.2),
+            medir=lambda b: Inches(1.3) + layout.excesso(b[1], Inches(6.5), 14, 3)),
+    },
+    'roadmap': {
+        'roadmap': layout.Lista(
+            Inches(0.8), Inches(2.2), Inches(7.2), Inches(1), espaco_y=Inches(0.3),
+            medir=lambda r: Inches(1) + layout.excesso(r[2], Inches(5.5), 15, 2)),
+        'visao_itens': layout.Lista(  # dentro da caixa da visão, que termina em 7,7in
+            Inches(8.7), Inches(4), Inches(6.5), Inches(0.5), espaco_y=Inches(0.2), fundo=Inches(7.7),
+            medir=lambda item: layout.altura_texto(item, Inches(6.5), 16)),
+    },
+}
+
+@telemetria.medir()
+def add_blank_slide(prs):
+    """Adiciona slide em branco"""
+    blank_layout = prs.slide_layouts[6]  # Layout em branco
+    slide = prs.slides.add_slide(blank_layout)
+    # Fundo escuro
+    background = slide.background
+    fill = background.fill
+    fill.solid()
+    fill.fore_color.rgb = COR_FUNDO
+    # Ids de forma incrementais, sem varrer o slide a cada forma nova
+    slide.shapes.turbo_add_enabled = True
+    return slide
+
+def add_header(slide, titulo, subtitulo=""):
+    """Adiciona cabeçalho corporativo"""
+    return componentes.cabecalho(slide, titulo, subtitulo)
+
+def add_text_box(slide, text, left, top, width, height, font_size=18, bold=False, color=COR_BRANCO):
+    """Adiciona caixa de texto"""
+    return componentes.texto(slide, text, left, top, width, height, font_size, bold, color)
+
+def add_metric_card(slide, number, label, left, top):
+    """Adiciona card de métrica"""
+    componentes.cartao_metrica(slide, number, label, left, top)
+
+def add_box(slide, left, top, width, height, fill=COR_AZUL, line=COR_CIANO, line_width=2, forma=1):
+    """Adiciona caixa preenchida com borda"""
+    return componentes.caixa(slide, left, top, width, height, fill, line, line_width, forma)
+
+@telemetria.medir()
+def add_picture_fit(slide, blob, left, top, width, height):
+    """Adiciona imagem centralizada dentro da área, mantendo a proporção"""
+    # Reduz a foto para a resolução da área antes de embutir (cache em disco)
+    caminho = imagens.arquivo_imagem(blob, width, height)
+    if caminho is None:
+        pic = pacote.adicionar_imagem(slide, left, top, dados=imagens.preparar_imagem(blob, width, height))
+    else:
+        pic = pacote.adicionar_imagem(slide, left, top, caminho)  # mesma foto, mesma parte do pacote
+    telemetria.contar('imagens')
+    escala = min(width / pic.width, height / pic.height)
+    pic.width = int(pic.width * escala)
+    pic.height = int(pic.height * escala)
+    pic.left = left + (width - pic.width) // 2
+    pic.top = top + (height - pic.height) // 2
+    return pic
+
+# Modelo
+
+@functools.lru_cache(maxsize=None)
+def _bytes_modelo(caminho):
+    """Lê o arquivo .pptx do modelo uma única vez por processo"""
+    with open(caminho, 'rb') as f:
+        return f.read()
+
+@telemetria.medir('modelo')
+def nova_apresentacao(modelo=None):
+    """Cria apresentação 16x9 a partir do modelo já carregado em memória"""
+    caminho = modelo or os.path.join(os.path.dirname(pptx.__file__), 'templates', 'default.pptx')
+    prs = Presentation(io.BytesIO(_bytes_modelo(caminho)))
+    prs.slide_width = Inches(16)
+    prs.slide_height = Inches(9)
+    return prs
+
+# SLIDE 1 - CAPA
+def slide_capa(prs, dados):
+    slide = add_blank_slide(prs)
+    # Header azul
+    add_box(slide, Inches(0), Inches(0), Inches(16), Inches(2), line=None)
+
+    # Título
+    for i, linha in enumerate(dados['titulo']):
+        add_text_box(slide, linha, Inches(0.5), Inches(0.3 + i * 0.8), Inches(12), Inches(0.8), 48, True, COR_BRANCO)
+
+    # Badge prêmio
+    if dados.get('selo'):
+        add_box(slide, Inches(12.5), Inches(0.2), Inches(3), Inches(0.8), fill=COR_CIANO, line=None)
+        add_text_box(slide, dados['selo'], Inches(12.5), Inches(0.25), Inches(3), Inches(0.7), 14, True, COR_FUNDO)
+
+    # Subtítulo
+    add_text_box(slide, dados['subtitulo'], Inches(0.5), Inches(2.3), Inches(15), Inches(1), 22, False, COR_TEXTO)
+
+    # Métricas
+    for i, (number, label) in enumerate(dados['metricas']):
+        add_metric_card(slide, number, label, Inches(1 + i * 5), Inches(4.5))
+    return slide
+
+# SLIDE 2 - CONTEXTO
+def slide_contexto(prs, dados):
+    slide = add_blank_slide(prs)
+    add_header(slide, dados['titulo'])
+
+    # Coluna Problema
+    add_box(slide, Inches(0.5), Inches(2), Inches(7), Inches(5.5), fill=RGBColor(127, 29, 29), line=COR_VERMELHO, line_width=3)
+    add_text_box(slide, dados['desafios_titulo'], Inches(0.7), Inches(2.2), Inches(6.5), Inches(0.6), 28, True, COR_BRANCO)
+    add_text_box(slide, "\n\n".join(dados['desafios']), Inches(0.7), Inches(3), Inches(6.5), Inches(4), 16, False, COR_BRANCO)
+
+    # Coluna Solução
+    add_box(slide, Inches(8.5), Inches(2), Inches(7), Inches(5.5), fill=RGBColor(20, 83, 45), line=RGBColor(34, 197, 94), line_width=3)
+    add_text_box(slide, dados['solucoes_titulo'], Inches(8.7), Inches(2.2), Inches(6.5), Inches(0.6), 28, True, COR_BRANCO)
+    add_text_box(slide, "\n\n".join(dados['solucoes']), Inches(8.7), Inches(3), Inches(6.5), Inches(4), 16, False, COR_BRANCO)
+    return slide
+
+# SLIDE 3 - VISÃO GERAL
+def slide_visao_geral(prs, dados):
+    slide = add_blank_slide(prs)
+    add_header(slide, dados['titulo'])
+
+    # Info box principal
+    add_box(slide, Inches(0.5), Inches(2), Inches(15), Inches(1.2), line_width=4)
+    add_text_box(slide, dados['destaque_titulo'], Inches(0.7), Inches(2.1), Inches(14.5), Inches(0.4), 24, True, COR_CIANO)
+    add_text_box(slide, dados['destaque_texto'], Inches(0.7), Inches(2.6), Inches(14.5), Inches(0.6), 18, False, COR_TEXTO)
+
+    # Boxes de características (3 por linha, altura pelo texto)
+    features = dados['features']
+    for (titulo, desc), (x, y, largura, altura) in zip(features, LISTAS['visao_geral']['features'].posicoes(features)):
+        add_box(slide, x, y, largura, altura)
+        add_text_box(slide, titulo, x, y + Inches(0.2), largura, Inches(0.6), 22, True, COR_CIANO)
+        tamanho, desc = layout.ajustar_fonte(desc, largura, altura - Inches(1), 16)
+        add_text_box(slide, desc, x, y + Inches(0.9), largura, altura - Inches(1), tamanho, False, COR_TEXTO)
+    return slide
+
+# SLIDE 4 - FLUXO OPERACIONAL
+def slide_fluxo(prs, dados):
+    slide = add_blank_slide(prs)
+    add_header(slide, dados['titulo'])
+
+    steps = dados['steps']
+    for (num, titulo, desc), (_, y, _, altura) in zip(steps, LISTAS['fluxo']['steps'].posicoes(steps)):
+        orcamento = layout.altura_linhas(2, 14) + altura - Inches(0.8)
+        tamanho, desc = layout.ajustar_fonte(desc, Inches(13), orcamento, 14)
+        componentes.passo_numerado(slide, num, titulo, desc, y + Inches(0.1), altura=altura, tamanho_desc=tamanho)
+    return slide
+
+# SLIDE 5 - APLICAÇÕES
+def slide_aplicacoes(prs, dados):
+    slide = add_blank_slide(prs)
+    add_header(slide, dados['titulo'])
+
+    posicoes = layout.grade(len(dados['apps']), 3, Inches(0.5), Inches(2), Inches(4.8), Inches(2), Inches(0.4), Inches(0.5))
+    for (icon, titulo, desc), (x, y) in zip(dados['apps'], posicoes):
+        add_box(slide, x, y, Inches(4.8), Inches(2))
+        add_text_box(slide, icon, x + Inches(2), y + Inches(0.1), Inches(1), Inches(0.5), 36, False, COR_BRANCO)
+        add_text_box(slide, titulo, x + Inches(0.2), y + Inches(0.7), Inches(4.4), Inches(0.4), 18, True, COR_CIANO)
+        add_text_box(slide, desc, x + Inches(0.2), y + Inches(1.2), Inches(4.4), Inches(0.7), 14, False, COR_TEXTO)
+    return slide
+
+# SLIDE 6 - BENEFÍCIOS E ROI
+def slide_beneficios(prs, dados):
+    slide = add_blank_slide(prs)
+    add_header(slide, dados['titulo'])
+
+    # Ganhos operacionais (esquerda)
+    add_text_box(slide, dados['ganhos_titulo'], Inches(0.5), Inches(2), Inches(7), Inches(0.5), 24, True, COR_CIANO)
+
+    ganhos = dados['ganhos']
+    for ganho, (x, y, largura, altura) in zip(ganhos, LISTAS['beneficios']['ganhos'].posicoes(ganhos)):
+        add_box(slide, x, y, largura, altura)
+        tamanho, ganho = layout.ajustar_fonte(ganho, Inches(6.5), altura - Inches(0.2), 16)
+        add_text_box(slide, ganho, x + Inches(0.2), y + Inches(0.15), Inches(6.5), altura - Inches(0.2), tamanho, False, COR_BRANCO)
+
+    # ROI Box (direita)
+    add_box(slide, Inches(8.5), Inches(2), Inches(7), Inches(3), fill=RGBColor(6, 95, 70), line=COR_VERDE, line_width=4)
+    add_text_box(slide, dados['roi_titulo'], Inches(8.5), Inches(2.2), Inches(7), Inches(0.5), 28, True, COR_BRANCO)
+    add_text_box(slide, dados['roi_valor'], Inches(8.5), Inches(2.9), Inches(7), Inches(0.9), 72, True, COR_VERDE)
+    add_text_box(slide, "\n".join(dados['itens_roi']), Inches(8.7), Inches(4), Inches(6.5), Inches(1), 16, False, RGBColor(209, 250, 229))
+
+    # Análise comparativa
+    add_box(slide, Inches(8.5), Inches(5.5), Inches(7), Inches(1.5))
+    add_text_box(slide, dados['comparativo_titulo'], Inches(8.7), Inches(5.65), Inches(6.5), Inches(0.4), 20, True, COR_CIANO)
+    add_text_box(slide, dados['comparativo_texto'], Inches(8.7), Inches(6.1), Inches(6.5), Inches(0.8), 14, False, COR_TEXTO)
+    return slide
+
+# SLIDE 7 - TECNOLOGIA E SEGURANÇA
+def slide_tecnologia(prs, dados):
+    slide = add_blank_slide(prs)
+    add_header(slide, dados['titulo'])
+
+    # Stack Tecnológico (esquerda)
+    add_text_box(slide, dados['stack_titulo'], Inches(0.5), Inches(2), Inches(7), Inches(0.5), 24, True, COR_CIANO)
+
+    stack = dados['stack']
+    for item, (x, y, largura, altura) in zip(stack, LISTAS['tecnologia']['stack'].posicoes(stack)):
+        add_box(slide, x, y, largura, altura)
+        tamanho, item = layout.ajustar_fonte(item, Inches(6.5), altura - Inches(0.2), 15)
+        add_text_box(slide, item, x + Inches(0.2), y + Inches(0.15), Inches(6.5), altura - Inches(0.2), tamanho, False, COR_BRANCO)
+
+    # Segurança (direita)
+    add_text_box(slide, dados['seguranca_titulo'], Inches(8.5), Inches(2), Inches(7), Inches(0.5), 24, True, COR_CIANO)
+
+    seg_boxes = dados['seg_boxes']
+    for (titulo, desc), (x, y, largura, altura) in zip(seg_boxes, LISTAS['tecnologia']['seg_boxes'].posicoes(seg_boxes)):
+        add_box(slide, x, y, largura, altura)
+        add_text_box(slide, titulo, Inches(8.7), y + Inches(0.1), Inches(6.5), Inches(0.4), 18, True, COR_CIANO)
+        orcamento = layout.altura_linhas(3, 14) + altura - Inches(1.3)
+        tamanho, desc = layout.ajustar_fonte(desc, Inches(6.5), orcamento, 14)
+        add_text_box(slide, desc, Inches(8.7), y + Inches(0.5), Inches(6.5), altura - Inches(0.6), tamanho, False, COR_TEXTO)
+    return slide
+
+# SLIDE 8 - DIFERENCIAIS
+def slide_diferenciais(prs, dados):
+    slide = add_blank_slide(prs)
+    add_header(slide, dados['titulo'])
+
+    # Cards principais
+    y_top = Inches(2)
+    for i, (icon, titulo, desc) in enumerate(dados['difs_principais']):
+        x = Inches(0.5 + i * 5.2)
+        add_box(slide, x, y_top, Inches(4.8), Inches(2))
+        add_text_box(slide, icon, x + Inches(2), y_top + Inches(0.1), Inches(1), Inches(0.5), 48, False, COR_BRANCO)
+        add_text_box(slide, titulo, x + Inches(0.2), y_top + Inches(0.8), Inches(4.4), Inches(0.4), 22, True, COR_BRANCO)
+        add_text_box(slide, desc, x + Inches(0.2), y_top + Inches(1.3), Inches(4.4), Inches(0.6), 16, False, COR_TEXTO)
+
+    # Lista de diferenciais
+    add_text_box(slide, dados['lista_titulo'], Inches(0.5), Inches(4.5), Inches(15), Inches(0.5), 26, True, COR_CIANO)
+
+    componentes.lista_duas_colunas(slide, dados['difs_lista'], Inches(5.2))
+    return slide
+
+# SLIDE 9 - ROADMAP
+def slide_roadmap(prs, dados):
+    slide = add_blank_slide(prs)
+    add_header(slide, dados['titulo'])
+
+    roadmap = dados['roadmap']
+    for (trimestre, titulo, desc), (x, y, _, altura) in zip(roadmap, LISTAS['roadmap']['roadmap'].posicoes(roadmap)):
+        # Circle trimestre
+        add_box(slide, x, y, Inches(0.7), Inches(0.7), fill=COR_CIANO, line=None, forma=3)
+        add_text_box(slide, trimestre, x, y + Inches(0.05), Inches(0.7), Inches(0.6), 20, True, COR_FUNDO)
+
+        # Content
+        add_box(slide, x + Inches(1.2), y, Inches(6), altura)
+        add_text_box(slide, titulo, x + Inches(1.4), y + Inches(0.1), Inches(5.5), Inches(0.4), 20, True, COR_CIANO)
+        orcamento = layout.altura_linhas(2, 15) + altura - Inches(1)
+        tamanho, desc = layout.ajustar_fonte(desc, Inches(5.5), orcamento, 15)
+        add_text_box(slide, desc, x + Inches(1.4), y + Inches(0.5), Inches(5.5), altura - Inches(0.6), tamanho, False, COR_TEXTO)
+
+    # Visão de longo prazo (direita)
+    add_box(slide, Inches(8.5), Inches(2.2), Inches(7), Inches(5.5))
+    add_text_box(slide, dados['visao_titulo'], Inches(8.7), Inches(2.4), Inches(6.5), Inches(0.5), 22, True, COR_CIANO)
+    add_text_box(slide, dados['visao_texto'], Inches(8.7), Inches(3), Inches(6.5), Inches(0.8), 16, False, COR_TEXTO)
+
+    itens = dados['visao_itens']
+    for item, (x, y, largura, altura) in zip(itens, LISTAS['roadmap']['visao_itens'].posicoes(itens)):
+        tamanho, item = layout.ajustar_fonte(item, largura, altura, 16)
+        add_text_box(slide, item, x, y, largura, altura, tamanho, False, COR_BRANCO)
+    return slide
+
+# SLIDE 10 - CONCLUSÃO
+def slide_conclusao(prs, dados):
+    slide = add_blank_slide(prs)
+    add_header(slide, dados['titulo'])
+
+    # Métricas principais
+    for i, (number, label) in enumerate(dados['metricas']):
+        add_metric_card(slide, number, label, Inches(1 + i * 5), Inches(2.5))
+
+    # Box destaque
+    add_box(slide, Inches(1.5), Inches(5), Inches(13), Inches(2), fill=RGBColor(6, 95, 70), line=COR_VERDE, line_width=4)
+    add_text_box(slide, dados['destaque_titulo'], Inches(1.5), Inches(5.2), Inches(13), Inches(0.6), 36, True, COR_BRANCO)
+    add_text_box(slide, dados['destaque_texto'], Inches(1.5), Inches(6), Inches(13), Inches(1), 20, False, RGBColor(209, 250, 229))
+
+    # Link de acesso
+    add_text_box(slide, dados['chamada'], Inches(0.5), Inches(7.5), Inches(15), Inches(0.4), 28, True, COR_CIANO)
+    add_box(slide, Inches(4.5), Inches(8), Inches(7), Inches(0.6), line_width=3)
+    add_text_box(slide, dados['link'], Inches(4.5), Inches(8.05), Inches(7), Inches(0.5), 24, True, COR_CIANO)
+    return slide
+
+# SLIDE 11 - AGRADECIMENTO
+def slide_agradecimento(prs, dados):
+    slide = add_blank_slide(prs)
+
+    add_text_box(slide, dados['titulo'], Inches(0.5), Inches(2.5), Inches(15), Inches(1), 72, True, COR_BRANCO)
+    add_text_box(slide, dados['texto'], Inches(0.5), Inches(3.8), Inches(15), Inches(1), 26, False, COR_TEXTO)
+
+    # Cards finais
+    for i, (icon, titulo, desc) in enumerate(dados['final_cards']):
+        x = Inches(1.5 + i * 4.5)
+        y = Inches(5.5)
+
+        add_box(slide, x, y, Inches(4), Inches(2))
+        add_text_box(slide, icon, x + Inches(1.5), y + Inches(0.1), Inches(1), Inches(0.5), 48, False, COR_BRANCO)
+        add_text_box(slide, titulo, x + Inches(0.2), y + Inches(0.8), Inches(3.6), Inches(0.4), 20, True, COR_CIANO)
+        add_text_box(slide, desc, x + Inches(0.2), y + Inches(1.3), Inches(3.6), Inches(0.6), 16, False, COR_TEXTO)
+    return slide
+
+# SLIDE DE FOTO - um registro ImageMetadata
+def slide_foto(prs, dados):
+    slide = add_blank_slide(prs)
+    add_header(slide, dados.get('name') or "Sem nome", dados.get('date') or "")
+
+    # Foto (esquerda)
+    add_box(slide, Inches(0.5), Inches(2), Inches(9), Inches(6.5))
+    try:
+        blob = metadados.decodificar_thumbnail(dados.get('thumbnail'))
+        foto = blob and add_picture_fit(slide, blob, Inches(0.6), Inches(2.1), LARGURA_FOTO, ALTURA_FOTO)
+    except imagens.ERROS_IMAGEM as erro:
+        imagens.avisar_invalida(dados.get('name'), erro)
+        foto = None
+    if not foto:
+        add_text_box(slide, "Sem imagem", Inches(0.5), Inches(4.9), Inches(9), Inches(0.6), 24, False, COR_TEXTO)
+
+    # Detalhes (direita)
+    add_box(slide, Inches(10), Inches(2), Inches(5.5), Inches(6.5))
+    status = dados.get('status') or "Pendente"
+    campos = [
+        ("Status", status, COR_STATUS.get(status, COR_BRANCO)),
+        ("Previsão", dados.get('predictionDate') or "Não definida", COR_BRANCO),
+        ("GPS", coordenadas.formatar_gps(dados.get('Latitude'), dados.get('Longitude')), COR_BRANCO),
+        ("Coordenadas UTM", coordenadas.calcular_utm(dados.get('Latitude'), dados.get('Longitude')), COR_BRANCO),
+    ]
+    y = Inches(2.2)
+    for rotulo, valor, cor in campos:
+        add_text_box(slide, rotulo, Inches(10.2), y, Inches(5.1), Inches(0.35), 14, True, COR_CIANO)
+        add_text_box(slide, valor, Inches(10.2), y + Inches(0.35), Inches(5.1), Inches(0.45), 18, True, cor)
+        y += Inches(0.95)
+
+    add_text_box(slide, "Descrição", Inches(10.2), y, Inches(5.1), Inches(0.35), 14, True, COR_CIANO)
+    # Descrição longa encolhe a fonte (e, no limite, é cortada) para não vazar da caixa
+    tamanho, descricao = layout.ajustar_fonte(dados.get('description') or "-", Inches(5.1), Inches(2), 16)
+    add_text_box(slide, descricao, Inches(10.2), y + Inches(0.35), Inches(5.1), Inches(2), tamanho, False, COR_TEXTO)
+    return slide
+
+# SLIDE DE GRUPOS - um card de resumo por agrupamento espacial de fotos
+def slide_grupos(prs, dados):
+    slide = add_blank_slide(prs)
+    add_header(slide, dados['titulo'])
+
+    posicoes = layout.grade(len(dados['grupos']), 3, Inches(0.5), Inches(2), Inches(4.8), Inches(2.7), Inches(0.4), Inches(0.3))
+    for grupo, (x, y) in zip(dados['grupos'], posicoes):
+        add_box(slide, x, y, Inches(4.8), Inches(2.7))
+        add_text_box(slide, f"{grupo['nome']} · {grupo['total']} fotos", x + Inches(0.2), y + Inches(0.1), Inches(4.4), Inches(0.4), 20, True, COR_CIANO)
+
+        y_status = y + Inches(0.6)
+        for status in ("Atrasado", "Pendente", "Concluido"):
+            quantidade = grupo['status'].get(status, 0)
+            if quantidade:
+                add_text_box(slide, f"{status}: {quantidade}", x + Inches(0.2), y_status, Inches(4.4), Inches(0.3), 14, True, COR_STATUS[status])
+                y_status += Inches(0.35)
+
+        lat, lon = grupo['centro']
+        detalhes = f"Centro: {coordenadas.formatar_gps(lat, lon)}\nRaio: {grupo['raio_m']:.0f} m"
+        if grupo.get('previsao_min'):
+            detalhes += f"\nPrevisões: {grupo['previsao_min']} a {grupo['previsao_max']}"
+        add_text_box(slide, detalhes, x + Inches(0.2), y + Inches(1.7), Inches(4.4), Inches(0.9), 12, False, COR_TEXTO)
+    return slide
+
+# SLIDE DE CARDS - uma página de cards posicionada por layout.paginar_cards
+CORES_CARD = {'icone': COR_BRANCO, 'titulo': COR_CIANO, 'texto': COR_TEXTO}
+
+def slide_cards(prs, dados):
+    slide = add_blank_slide(prs)
+    add_header(slide, dados['titulo'])
+
+    for card in dados['posicionados']:
+        x, y, largura, altura = card['caixa']
+        add_box(slide, x, y, largura, altura)
+        for papel, texto, dy, h, tamanho, negrito in card['textos']:
+            add_text_box(slide, texto, x + layout.RECUO, y + dy, largura - 2 * layout.RECUO, h, tamanho, negrito, CORES_CARD[papel])
+    return slide
+
+# Tipos de slide aceitos no campo "tipo" da spec
+SLIDE_BUILDERS = {
+    'capa': slide_capa,
+    'contexto': slide_contexto,
+    'visao_geral': slide_visao_geral,
+    'fluxo': slide_fluxo,
+    'aplicacoes': slide_aplicacoes,
+    'beneficios': slide_beneficios,
+    'tecnologia': slide_tecnologia,
+    'diferenciais': slide_diferenciais,
+    'roadmap': slide_roadmap,
+    'conclusao': slide_conclusao,
+    'agradecimento': slide_agradecimento,
+    'foto': slide_foto,
+    'grupos': slide_grupos,
+    'cards': slide_cards,
+}
+
+def build_slide(prs, dados, i):
+    """Adiciona o slide `i` (base 0) descrito por `dados`"""
+    builder = SLIDE_BUILDERS.get(dados.get('tipo'))
+    if builder is None:
+        raise ValueError(f"Slide {i + 1}: tipo desconhecido {dados.get('tipo')!r}")
+    if not telemetria.ativa():
+        builder(prs, dados)
+        return
+
+    inicio = time.perf_counter()
+    with telemetria.etapa(builder.__name__):
+        slide = builder(prs, dados)
+    segundos = time.perf_counter() - inicio
+    # Contagens por slide: formas na árvore e runs de texto no XML
+    formas = len(slide.shapes)
+    runs = sum(1 for _ in slide._element.iter(_RUN))
+    telemetria.contar('slides')
+    telemetria.contar('formas', formas)
+    telemetria.contar('runs', runs)
+    telemetria.registrar_slide({'slide': i + 1, 'tipo': dados.get('tipo'), 'total_s': round(segundos, 4),
+                                'formas': formas, 'runs': runs})
+
+def build_deck(spec):
+    """Monta a apresentação a partir de uma spec (dict com lista de slides)"""
+    prs = nova_apresentacao(spec.get('modelo'))
+    for i, dados in enumerate(layout.expandir(spec['slides'], LISTAS)):
+        build_slide(prs, dados, i)
+    return prs
@@ -0,0 +1,178 @@
+"""Gravação do .pptx em fluxo, parte por parte
+
+O python-pptx guarda os bytes de toda imagem embutida na memória até o save,
+e o save comprime de novo JPEG/PNG que já estão comprimidos. Aqui as imagens
+vindas do cache em disco (imagens.arquivo_imagem) entram só pelo caminho: cada
+arquivo é aberto na gravação, copiado e fechado, então nem os bytes nem um
+descritor por foto ficam presos até o save. O pacote é gravado direto no zip
+de destino (arquivo, pipe ou stdout) uma parte por vez: XML com deflate, mídia
+sem recompressão (ZIP_STORED), em blocos. O pico de memória fica limitado pela
+maior parte XML, não pelo tamanho do deck.
+
+As imagens entram por adicionar_imagem, que mantém por pacote um registro
+endereçado pelo conteúdo: a mesma imagem usada em vários slides vira uma única
+parte em ppt/media, referenciada por todos eles. O python-pptx também evita a
+duplicata, mas procurando o SHA-1 em todas as partes do pacote a cada imagem
+(e de novo para achar o próximo nome livre), o que deixa decks com muitas
+fotos quadráticos; aqui a busca é um dicionário.
+"""
+import functools
+import hashlib
+import os
+import shutil
+import sys
+import time
+import weakref
+import zipfile
+
+from pptx.opc.constants import RELATIONSHIP_TYPE as RT
+from pptx.opc.oxml import serialize_part_xml
+from pptx.opc.packuri import CONTENT_TYPES_URI, PACKAGE_URI, PackURI
+from pptx.opc.serialized import _ContentTypesItem
+from pptx.parts.image import Image, ImagePart
+
+import telemetria
+
+# Extensões que já chegam comprimidas: deflate só gasta CPU
+JA_COMPRIMIDAS = frozenset(('jpg', 'jpeg', 'png', 'gif', 'tif', 'tiff', 'mp4', 'm4v', 'mov', 'mp3', 'm4a', 'wdp'))
+BLOCO = 1 << 20
+
+EMU_POR_POLEGADA = 914400
+
+class ParteArquivo(ImagePart):
+    """ImagePart cujos bytes ficam no arquivo do cache, lido só quando pedido"""
+
+    def __init__(self, partname, content_type, package, caminho, filename, tamanho_nativo):
+        self.caminho = caminho
+        self.tamanho_nativo = tamanho_nativo
+        super().__init__(partname, content_type, package, None, filename)
+
+    @property
+    def _native_size(self):
+        return self.tamanho_nativo  # o ImagePart releria o arquivo a cada uso para achar o cabeçalho
+
+    @property
+    def _blob(self):
+        with open(self.caminho, 'rb') as f:
+            return f.read()
+
+    @_blob.setter
+    def _blob(self, blob):
+        pass  # o conteúdo é sempre o do arquivo
+
+class RegistroMidia:
+    """Imagens já embutidas num pacote, pela chave de conteúdo"""
+
+    def __init__(self, pacote):
+        self.pacote = pacote
+        # caminho no cache ou SHA-1 dos bytes -> (ImagePart, largura, altura nativas em EMU, bytes)
+        self.partes = {}
+        # Numeração segue a das imagens que o modelo já tiver
+        indices = [parte.partname.idx for parte in pacote.iter_parts()
+                   if parte.partname.startswith('/ppt/media/image') and parte.partname.idx]
+        self.proximo = max(indices, default=0) + 1
+
+    def nova_parte(self, blob, tipo, ext, tamanho_px, dpi, nome, caminho=None, tamanho=None):
+        """Entrada do registro para uma parte nova com os bytes `blob` ou, com `caminho`, os do arquivo"""
+        partname = PackURI('/ppt/media/image%d.%s' % (self.proximo, ext))
+        self.proximo += 1
+        # Mesmo cálculo do ImagePart._native_size, sem reabrir o cabeçalho a cada uso
+        largura = int(EMU_POR_POLEGADA * tamanho_px[0] / dpi[0])
+        altura = int(EMU_POR_POLEGADA * tamanho_px[1] / dpi[1])
+        if caminho:
+            parte = ParteArquivo(partname, tipo, self.pacote, caminho, nome, (largura, altura))
+            return parte, largura, altura, tamanho
+        return ImagePart(partname, tipo, self.pacote, blob, nome), largura, altura, len(blob)
+
+_registros = weakref.WeakKeyDictionary()
+
+def registro_midia(pacote):
+    """RegistroMidia do pacote (criado no primeiro uso)"""
+    registro = _registros.get(pacote)
+    if registro is None:
+        registro = _registros[pacote] = RegistroMidia(pacote)
+    return registro
+
+@functools.lru_cache(maxsize=4096)
+def _cabecalho_arquivo(caminho):
+    """Tipo, extensão, tamanho em px, DPI e nome de uma imagem do cache
+
+    Os arquivos do cache de imagens são nomeados pelo hash do conteúdo e nunca
+    mudam, então o cabeçalho é lido uma vez por processo e vale para todos os
+    decks (gerar_lote e servidor renderizam vários no mesmo worker).
+    """
+    imagem = Image.from_file(caminho)
+    return imagem.content_type, imagem.ext, imagem.size, imagem.dpi, imagem.filename
+
+def adicionar_imagem(slide, left, top, caminho=None, dados=None):
+    """Insere no slide, em tamanho nativo, a imagem do arquivo `caminho` ou dos bytes `dados`
+
+    Cada conteúdo vira uma única parte do pacote. Imagens do cache em disco
+    entram pelo caminho: os bytes ficam no disco até a gravação.
+    """
+    registro = registro_midia(slide.part.package)
+    chave = caminho or hashlib.sha1(dados).hexdigest()
+    existente = registro.partes.get(chave)
+    if existente is None:
+        if caminho:
+            existente = registro.nova_parte(None, *_cabecalho_arquivo(caminho), caminho=caminho,
+                                            tamanho=os.path.getsize(caminho))
+        else:
+            imagem = Image.from_blob(dados)
+            existente = registro.nova_parte(dados, imagem.content_type, imagem.ext, imagem.size,
+                                            imagem.dpi, imagem.filename)
+        registro.partes[chave] = existente
+        telemetria.contar('midia_unicas')
+        telemetria.contar('midia_bytes_unicos', existente[3])
+    else:
+        telemetria.contar('midia_reaproveitadas')
+        telemetria.contar('midia_bytes_poupados', existente[3])  # sem reler o arquivo
+    parte, largura, altura, _ = existente
+    rId = slide.part.relate_to(parte, RT.IMAGE)
+    return slide.shapes._shape_factory(slide.shapes._add_pic_from_image_part(parte, rId, left, top, largura, altura))
+
+def _info(nome, data):
+    info = zipfile.ZipInfo(nome, data)
+    comprimida = nome.rpartition('.')[2].lower() in JA_COMPRIMIDAS
+    info.compress_type = zipfile.ZIP_STORED if comprimida else zipfile.ZIP_DEFLATED
+    return info
+
+def _gravar_arquivo(zd, nome, caminho, data):
+    """Copia em blocos uma mídia do cache; o arquivo fica aberto só durante a cópia"""
+    tamanho = os.path.getsize(caminho)
+    telemetria.contar('partes')
+    telemetria.contar('bytes_partes', tamanho)
+    with open(caminho, 'rb') as origem, \
+            zd.open(_info(nome, data), 'w', force_zip64=tamanho > zipfile.ZIP64_LIMIT) as dst:
+        shutil.copyfileobj(origem, dst, BLOCO)
+
+def _gravar_parte(zd, nome, blob, data):
+    telemetria.contar('partes')
+    telemetria.contar('bytes_partes', len(blob))
+    info = _info(nome, data)
+    if info.compress_type == zipfile.ZIP_STORED:
+        dados = memoryview(blob)
+        with zd.open(info, 'w', force_zip64=len(dados) > zipfile.ZIP64_LIMIT) as dst:
+            for inicio in range(0, len(dados), BLOCO):
+                dst.write(dados[inicio:inicio + BLOCO])
+    else:
+        zd.writestr(info, blob)
+
+@telemetria.medir()
+def salvar(prs, destino):
+    """Grava `prs` em `destino` (caminho, objeto arquivo ou '-' para stdout) parte por parte"""
+    pacote = prs.part.package
+    partes = tuple(pacote.iter_parts())
+    data = time.localtime()[:6]
+    saida = sys.stdout.buffer if destino == '-' else destino
+    with zipfile.ZipFile(saida, 'w', zipfile.ZIP_DEFLATED) as zd:
+        _gravar_parte(zd, CONTENT_TYPES_URI.membername,
+                      serialize_part_xml(_ContentTypesItem.xml_for(partes)), data)
+        _gravar_parte(zd, PACKAGE_URI.rels_uri.membername, pacote._rels.xml, data)
+        for parte in partes:
+            if isinstance(parte, ParteArquivo):
+                _gravar_arquivo(zd, parte.partname.membername, parte.caminho, data)
+            else:
+                _gravar_parte(zd, parte.partname.membername, parte.blob, data)
+            if parte._rels:
+                _gravar_parte(zd, parte.partname.rels_uri.membername, parte.rels.xml, data)
@@ -0,0 +1,343 @@
+"""Servidor local de renderização de decks (HTTP ou socket Unix)
+
+Mantém processos de renderização já aquecidos: python-pptx importado, modelo
+carregado e caches de componentes preenchidos por um deck de aquecimento. Um
+pedido pequeno custa só a montagem e a gravação, sem o import e a leitura do
+modelo de cada `python gerar_pptx.py`.
+
+Uso:
+    python servidor.py                           # http://127.0.0.1:8765
+    python servidor.py --porta 9000 -w 4 --fila 16
+    python servidor.py --socket /tmp/render.sock
+
+Rotas:
+    POST /deck      spec do deck em JSON ({"slides": [...]})  -> .pptx
+    POST /fotos     ImageMetadata em JSON ou JSONL            -> .pptx (relatório fotográfico)
+                    (?agrupar=METROS&min_fotos=N, como --agrupar/--min-fotos)
+    GET  /metricas  pedidos, fila e latências p50/p99 em JSON
+    GET  /saude     {"ok": true}
+
+    curl --data-binary @deck_brk.json http://127.0.0.1:8765/deck -o deck.pptx
+    curl --unix-socket /tmp/render.sock http://local/metricas
+
+A resposta de cada deck traz a telemetria da renderização (etapas e contadores,
+telemetria.py) em JSON compacto no cabeçalho X-Telemetria.
+
+Os pedidos vão para um pool de processos com no máximo `workers` decks em
+montagem e `fila` esperando; acima disso o servidor responde 503 na hora. Não
+há nenhuma dependência de rede: tudo roda na máquina local.
+"""
+from concurrent.futures import ProcessPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import argparse
+import collections
+import json
+import multiprocessing
+import os
+import shutil
+import signal
+import socketserver
+import tempfile
+import threading
+import time
+import urllib.parse
+
+import gerar_pptx
+import imagens
+import montagem
+import pacote
+import telemetria
+
+PORTA = 8765
+FILA = 8
+JANELA_METRICAS = 1000  # latências guardadas para os percentis
+LIMITE_CORPO_MB = 512
+ESPERA_AQUECIMENTO_S = 600  # teto para todos os workers subirem e aquecerem
+TIPO_PPTX = 'application/vnd.openxmlformats-officedocument.presentationml.presentation'
+
+# Processos de renderização
+
+_barreira = None  # barreira do aquecimento, uma por pool (em cada worker)
+
+def _inicializar_worker(modelo, dpi, barreira):
+    """Importa python-pptx, carrega o modelo e aquece os caches com um deck descartável"""
+    global _barreira
+    _barreira = barreira
+    if dpi:
+        imagens.DPI = dpi
+    montagem.nova_apresentacao(modelo)
+    spec = gerar_pptx.carregar_spec(gerar_pptx.SPEC_PADRAO)
+    spec['modelo'] = modelo
+    with tempfile.TemporaryFile() as f:
+        pacote.salvar(montagem.build_deck(spec), f)
+
+def _aquecido():
+    """Espera os outros workers na barreira: só passa com uma tarefa em cada processo"""
+    _barreira.wait(ESPERA_AQUECIMENTO_S)
+    return os.getpid()
+
+def iniciar_pool(workers, modelo=None, dpi=None):
+    """Pool de `workers` processos, todos já aquecidos quando a função volta
+
+    Uma tarefa por worker não basta: um processo que termina cedo pegaria a
+    tarefa de outro ainda aquecendo. Cada tarefa espera numa barreira de
+    `workers` partes, que só abre com todas rodando em processos distintos.
+    """
+    contexto = multiprocessing.get_context()
+    pool = ProcessPoolExecutor(max_workers=workers, mp_context=contexto, initializer=_inicializar_worker,
+                               initargs=(modelo, dpi, contexto.Barrier(workers)))
+    pids = {futuro.result() for futuro in [pool.submit(_aquecido) for _ in range(workers)]}
+    if len(pids) != workers:
+        pool.shutdown(cancel_futures=True)
+        raise RuntimeError(f"aquecimento em {len(pids)} de {workers} workers")
+    return pool
+
+def renderizar(rota, entrada, destino, opcoes):
+    """Monta o deck do arquivo `entrada` e grava em `destino`; devolve (slides, segundos, telemetria)"""
+    inicio = time.perf_counter()
+    if rota == '/fotos':
+        spec = gerar_pptx.spec_fotos(entrada, opcoes.get('agrupar'), opcoes.get('min_fotos', 5))
+    else:
+        spec = gerar_pptx.carregar_spec(entrada)
+        if not isinstance(spec, dict) or not isinstance(spec.get('slides'), list):
+            raise ValueError('a spec precisa de uma lista "slides"')
+    spec['modelo'] = opcoes.get('modelo')  # sempre o modelo já carregado no worker, nas duas rotas
+    with telemetria.sessao() as medicao:
+        prs = montagem.build_deck(spec)
+        pacote.salvar(prs, destino)
+    return len(prs.slides), time.perf_counter() - inicio, medicao.relatorio(por_slide=False)
+
+# Métricas
+
+def percentil(valores, p):
+    """Percentil pelo posto mais próximo (valores já ordenados)"""
+    if not valores:
+        return 0.0
+    return valores[min(len(valores) - 1, max(0, -(-len(valores) * p // 100) - 1))]
+
+class Metricas:
+    """Contadores e janela das últimas latências, compartilhados entre as threads"""
+
+    def __init__(self):
+        self.trava = threading.Lock()
+        self.inicio = time.time()
+        self.contagem = collections.Counter()
+        self.latencias = collections.deque(maxlen=JANELA_METRICAS)
+        self.renderizacoes = collections.deque(maxlen=JANELA_METRICAS)
+
+    def contar(self, chave):
+        with self.trava:
+            self.contagem[chave] += 1
+
+    def registrar(self, total_s, render_s):
+        with self.trava:
+            self.contagem['concluidos'] += 1
+            self.latencias.append(total_s)
+            self.renderizacoes.append(render_s)
+
+    def resumo(self, pendentes):
+        with self.trava:
+            latencias = sorted(self.latencias)
+            renderizacoes = sorted(self.renderizacoes)
+            contagem = dict(self.contagem)
+
+        def ms(valores):
+            return {
+                'p50': round(percentil(valores, 50) * 1000, 1),
+                'p99': round(percentil(valores, 99) * 1000, 1),
+                'max': round(valores[-1] * 1000, 1) if valores else 0.0,
+            }
+        return {
+            'ativo_s': round(time.time() - self.inicio, 1),
+            'pedidos': contagem.get('pedidos', 0),
+            'concluidos': contagem.get('concluidos', 0),
+            'erros': contagem.get('erros', 0),
+            'recusados': contagem.get('recusados', 0),
+            'pendentes': pendentes,  # aceitos e sem resposta: em montagem, na fila ou enviando o corpo
+            'amostras': len(latencias),
+            'latencia_ms': ms(latencias),
+            'renderizacao_ms': ms(renderizacoes),
+        }
+
+# HTTP
+
+class Renderizador(BaseHTTPRequestHandler):
+    server_version = 'RelatorioRender/1.0'
+    protocol_version = 'HTTP/1.1'
+
+    def address_string(self):
+        # No socket Unix não há endereço do cliente
+        return self.client_address[0] if self.client_address else 'unix'
+
+    def _json(self, status, dados):
+        corpo = json.dumps(dados, ensure_ascii=False).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Content-Length', str(len(corpo)))
+        if status == 503:
+            self.send_header('Retry-After', '1')
+        if status >= 400:
+            # O corpo de um POST recusado pode não ter sido lido: não reaproveita a conexão
+            self.send_header('Connection', 'close')
+            self.close_connection = True
+        self.end_headers()
+        self.wfile.write(corpo)
+
+    def do_GET(self):
+        rota = urllib.parse.urlsplit(self.path).path
+        if rota == '/metricas':
+            self._json(200, self.server.metricas.resumo(self.server.pendentes()))
+        elif rota == '/saude':
+            self._json(200, {'ok': True})
+        else:
+            self._json(404, {'erro': f'rota desconhecida: {rota}'})
+
+    def do_POST(self):
+        inicio = time.perf_counter()
+        url = urllib.parse.urlsplit(self.path)
+        servidor = self.server
+        if url.path not in ('/deck', '/fotos'):
+            self._json(404, {'erro': f'rota desconhecida: {url.path}'})
+            return
+        try:
+            tamanho = int(self.headers.get('Content-Length') or 0)
+            opcoes = _opcoes(url.query)
+        except ValueError as e:
+            self._json(400, {'erro': str(e)})
+            return
+        if tamanho > servidor.limite_corpo:
+            self._json(413, {'erro': f'corpo maior que {servidor.limite_corpo // 2**20} MB'})
+            return
+
+        servidor.metricas.contar('pedidos')
+        if not servidor.reservar():
+            servidor.metricas.contar('recusados')
+            self._json(503, {'erro': 'fila cheia'})
+            return
+        try:
+            with tempfile.TemporaryDirectory(dir=servidor.pasta) as pasta:
+                # O corpo vai para disco: o worker lê o backup em fluxo e não há pickle de MBs
+                entrada = os.path.join(pasta, 'entrada.json')
+                with open(entrada, 'wb') as f:
+                    _copiar(self.rfile, f, tamanho)
+                destino = os.path.join(pasta, 'deck.pptx')
+                opcoes['modelo'] = servidor.modelo
+                futuro = servidor.pool.submit(renderizar, url.path, entrada, destino, opcoes)
+                try:
+                    slides, render_s, medicao = futuro.result()
+                except Exception as e:
+                    servidor.metricas.contar('erros')
+                    self._json(422 if isinstance(e, (ValueError, KeyError, TypeError)) else 500,
+                               {'erro': f'{type(e).__name__}: {e}'})
+                    return
+
+                self.send_response(200)
+                self.send_header('Content-Type', TIPO_PPTX)
+                self.send_header('Content-Length', str(os.path.getsize(destino)))
+                self.send_header('Content-Disposition', 'attachment; filename="relatorio.pptx"')
+                self.send_header('X-Slides', str(slides))
+                self.send_header('X-Telemetria', json.dumps(medicao, separators=(',', ':')))
+                self.end_headers()
+                with open(destino, 'rb') as f:
+                    shutil.copyfileobj(f, self.wfile, pacote.BLOCO)
+            servidor.metricas.registrar(time.perf_counter() - inicio, render_s)
+        finally:
+            servidor.liberar()
+
+def _opcoes(query):
+    """Parâmetros de /fotos: agrupar (metros) e min_fotos"""
+    parametros = urllib.parse.parse_qs(query)
+    opcoes = {}
+    try:
+        if 'agrupar' in parametros:
+            opcoes['agrupar'] = float(parametros['agrupar'][-1])
+        if 'min_fotos' in parametros:
+            opcoes['min_fotos'] = int(parametros['min_fotos'][-1])
+    except ValueError:
+        raise ValueError('agrupar e min_fotos precisam ser números') from None
+    return opcoes
+
+def _copiar(origem, destino, tamanho):
+    while tamanho > 0:
+        dados = origem.read(min(pacote.BLOCO, tamanho))
+        if not dados:
+            raise ConnectionError('corpo do pedido incompleto')
+        destino.write(dados)
+        tamanho -= len(dados)
+
+class _Estado:
+    """Pool, fila e métricas pendurados no servidor (HTTP ou Unix)"""
+
+    def configurar(self, pool, workers, fila, modelo, limite_corpo):
+        self.pool = pool
+        self.modelo = modelo
+        self.limite_corpo = limite_corpo
+        self.capacidade = workers + fila
+        self.ocupadas = 0
+        self.trava = threading.Lock()
+        self.metricas = Metricas()
+        self.pasta = tempfile.mkdtemp(prefix='render_')
+
+    def reservar(self):
+        """Ocupa uma vaga de worker ou de fila; False se estiver tudo cheio"""
+        with self.trava:
+            if self.ocupadas >= self.capacidade:
+                return False
+            self.ocupadas += 1
+            return True
+
+    def liberar(self):
+        with self.trava:
+            self.ocupadas -= 1
+
+    def pendentes(self):
+        return self.ocupadas
+
+class ServidorHttp(_Estado, ThreadingHTTPServer):
+    daemon_threads = True
+
+class ServidorUnix(_Estado, socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Servidor local que gera .pptx a partir de specs ou de ImageMetadata")
+    parser.add_argument('--host', default='127.0.0.1', help="endereço (padrão: 127.0.0.1)")
+    parser.add_argument('--porta', type=int, default=PORTA, help=f"porta HTTP (padrão: {PORTA})")
+    parser.add_argument('--socket', help="escuta neste socket Unix em vez da porta TCP")
+    parser.add_argument('-w', '--workers', type=int, help="decks montados ao mesmo tempo (padrão: núcleos da máquina)")
+    parser.add_argument('--fila', type=int, default=FILA, help=f"pedidos esperando além dos workers antes de responder 503 (padrão: {FILA})")
+    parser.add_argument('--modelo', help="modelo .pptx usado como base")
+    parser.add_argument('--dpi', type=int, help=f"resolução das fotos embutidas (padrão: {imagens.DPI})")
+    parser.add_argument('--limite-mb', type=int, default=LIMITE_CORPO_MB, help=f"tamanho máximo do corpo do pedido (padrão: {LIMITE_CORPO_MB})")
+    args = parser.parse_args(argv)
+
+    workers = args.workers or os.cpu_count() or 1
+    inicio = time.perf_counter()
+    pool = iniciar_pool(workers, args.modelo, args.dpi)  # todos aquecidos antes de aceitar pedidos
+
+    if args.socket:
+        if os.path.exists(args.socket):
+            os.unlink(args.socket)
+        servidor = ServidorUnix(args.socket, Renderizador)
+        endereco = args.socket
+    else:
+        servidor = ServidorHttp((args.host, args.porta), Renderizador)
+        endereco = f"http://{args.host}:{servidor.server_address[1]}"
+    servidor.configurar(pool, workers, args.fila, args.modelo, args.limite_mb * 2**20)
+    print(f"✅ Servidor pronto em {time.perf_counter() - inicio:.2f}s com {workers} workers (fila {args.fila})", flush=True)
+    print(f"🌐 Endereço: {endereco}", flush=True)
+    # kill/systemd param o servidor como Ctrl+C, passando pela limpeza abaixo
+    signal.signal(signal.SIGTERM, signal.default_int_handler)
+    try:
+        servidor.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        servidor.server_close()
+        pool.shutdown(cancel_futures=True)
+        shutil.rmtree(servidor.pasta, ignore_errors=True)
+        if args.socket and os.path.exists(args.socket):
+            os.unlink(args.socket)
+
+if __name__ == '__main__':
+    main()
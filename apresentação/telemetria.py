@@ -0,0 +1,149 @@
+"""Telemetria da renderização: tempo por etapa e por slide, contadores e perfil opcional
+
+As funções de montagem (montagem.py, componentes.py, pacote.salvar) são
+decoradas com @telemetria.medir. Dentro de uma sessão cada chamada soma seu
+tempo à etapa de mesmo nome; fora dela o custo é um teste de None.
+
+    with telemetria.sessao(perfil='cprofile', destino_perfil='deck.prof') as t:
+        prs = montagem.build_deck(spec)
+        pacote.salvar(prs, 'deck.pptx')
+    json.dump(t.relatorio(), f)
+
+Os tempos das etapas são acumulados (uma etapa inclui as que chama: cabecalho
+inclui caixa e texto). Perfis: 'cprofile' grava o pstats em `destino_perfil`;
+'pyinstrument' (opcional, pip install pyinstrument) grava o HTML.
+"""
+import collections
+import contextlib
+import functools
+import time
+
+VERSAO_RELATORIO = 1
+PERFIS = ('cprofile', 'pyinstrument')
+FUNCOES_NO_RELATORIO = 15
+
+_atual = None
+
+class Telemetria:
+    """Medições de uma renderização"""
+
+    def __init__(self):
+        self.inicio = time.perf_counter()
+        self.duracao = None
+        self.etapas = collections.defaultdict(lambda: [0, 0.0])  # nome -> [chamadas, segundos]
+        self.contadores = collections.Counter()
+        self.slides = []
+        self.perfil = None
+
+    def relatorio(self, por_slide=True):
+        """Dicionário serializável em JSON com etapas, contadores, slides e perfil"""
+        duracao = self.duracao if self.duracao is not None else time.perf_counter() - self.inicio
+        etapas = sorted(self.etapas.items(), key=lambda item: -item[1][1])
+        relatorio = {
+            'versao': VERSAO_RELATORIO,
+            'duracao_s': round(duracao, 4),
+            'etapas': {nome: {'chamadas': chamadas, 'total_s': round(segundos, 4)}
+                       for nome, (chamadas, segundos) in etapas},
+            'contadores': dict(self.contadores),
+        }
+        if por_slide:
+            relatorio['slides'] = self.slides
+        if self.perfil:
+            relatorio['perfil'] = self.perfil
+        return relatorio
+
+def ativa():
+    """Há uma sessão aberta? (para medições que custam mais que um contador)"""
+    return _atual is not None
+
+def contar(nome, quantidade=1):
+    if _atual is not None:
+        _atual.contadores[nome] += quantidade
+
+def registrar_slide(dados):
+    if _atual is not None:
+        _atual.slides.append(dados)
+
+@contextlib.contextmanager
+def etapa(nome):
+    """Cronometra o bloco como a etapa `nome`"""
+    telemetria = _atual
+    if telemetria is None:
+        yield
+        return
+    inicio = time.perf_counter()
+    try:
+        yield
+    finally:
+        registro = telemetria.etapas[nome]
+        registro[0] += 1
+        registro[1] += time.perf_counter() - inicio
+
+def medir(nome=None):
+    """Decorador: cada chamada conta como a etapa `nome` (padrão: nome da função)"""
+    def decorador(funcao):
+        rotulo = nome or funcao.__name__
+
+        @functools.wraps(funcao)
+        def medida(*args, **kwargs):
+            telemetria = _atual
+            if telemetria is None:
+                return funcao(*args, **kwargs)
+            inicio = time.perf_counter()
+            try:
+                return funcao(*args, **kwargs)
+            finally:
+                registro = telemetria.etapas[rotulo]
+                registro[0] += 1
+                registro[1] += time.perf_counter() - inicio
+        return medida
+    return decorador
+
+def _cprofile(destino):
+    import cProfile
+    import pstats
+    perfilador = cProfile.Profile()
+    perfilador.enable()
+
+    def parar():
+        perfilador.disable()
+        perfilador.dump_stats(destino)
+        # Por tempo próprio, sem os invólucros de medir(): o acumulado só repetiria build_deck
+        estatisticas = [item for item in pstats.Stats(perfilador).stats.items() if item[0][0] != __file__]
+        lentas = sorted(estatisticas, key=lambda item: -item[1][2])[:FUNCOES_NO_RELATORIO]
+        return [{'funcao': f'{arquivo}:{linha}({funcao})', 'chamadas': chamadas,
+                 'proprio_s': round(proprio, 4), 'acumulado_s': round(acumulado, 4)}
+                for (arquivo, linha, funcao), (_, chamadas, proprio, acumulado, _) in lentas]
+    return parar
+
+def _pyinstrument(destino):
+    from pyinstrument import Profiler  # opcional: só com perfil='pyinstrument'
+    perfilador = Profiler()
+    perfilador.start()
+
+    def parar():
+        perfilador.stop()
+        with open(destino, 'w', encoding='utf-8') as f:
+            f.write(perfilador.output_html())
+        return None
+    return parar
+
+@contextlib.contextmanager
+def sessao(perfil=None, destino_perfil=None):
+    """Abre uma sessão de telemetria (e, se pedido, um perfil) durante o bloco"""
+    global _atual
+    if perfil not in (None, *PERFIS):
+        raise ValueError(f"perfil desconhecido: {perfil!r} (use {' ou '.join(PERFIS)})")
+    parar = (_cprofile if perfil == 'cprofile' else _pyinstrument)(destino_perfil) if perfil else None
+    anterior, _atual = _atual, Telemetria()
+    telemetria = _atual
+    try:
+        yield telemetria
+    finally:
+        _atual = anterior
+        telemetria.duracao = time.perf_counter() - telemetria.inicio
+        if parar:
+            telemetria.perfil = {'tipo': perfil, 'arquivo': destino_perfil}
+            mais_lentas = parar()
+            if mais_lentas:
+                telemetria.perfil['mais_lentas'] = mais_lentas
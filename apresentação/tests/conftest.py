@@ -0,0 +1,35 @@
+import base64
+import io
+import os
+import sys
+
+import pytest
+
+# Os módulos de apresentação/ são importados pelo nome, como nos scripts
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import imagens  # noqa: E402
+
+@pytest.fixture(autouse=True)
+def cache_temporario(tmp_path, monkeypatch):
+    """Cache de imagens do teste, fora do cache do usuário"""
+    monkeypatch.setattr(imagens, 'DIRETORIO_CACHE', str(tmp_path / 'cache'))
+
+@pytest.fixture
+def data_uri():
+    """Fábrica de imagens lisas 640x480 como data URI (thumbnail dos registros)"""
+    from PIL import Image
+
+    def _data_uri(cor, formato='JPEG'):
+        dados = io.BytesIO()
+        Image.new('RGB', (640, 480), cor).save(dados, formato)
+        return f'data:image/{formato.lower()};base64,' + base64.b64encode(dados.getvalue()).decode()
+    return _data_uri
+
+@pytest.fixture
+def foto(data_uri):
+    """Fábrica de registros de foto com GPS e thumbnail JPEG"""
+    def _foto(nome='IMG_1.jpg', cor='green', **campos):
+        return {'name': nome, 'status': 'Pendente', 'date': '18/10/2026, 10:00:00',
+                'Latitude': -25.43, 'Longitude': -49.27, 'thumbnail': data_uri(cor), **campos}
+    return _foto
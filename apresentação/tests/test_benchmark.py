@@ -0,0 +1,25 @@
+"""benchmark: o executor roda os casos em processos novos e grava o JSON"""
+import json
+
+import benchmark
+
+def test_dez_slides_com_e_sem_fotos(tmp_path, capsys):
+    saida = tmp_path / 'resultado.json'
+    assert benchmark.main(['-t', '10', '-o', str(saida)]) == 0
+    resultado = json.loads(saida.read_text(encoding='utf-8'))
+    casos = {caso['fotos']: caso for caso in resultado['casos']}
+    assert set(casos) == {False, True}
+    for caso in casos.values():
+        assert caso['slides'] == 10 and caso['bytes'] > 0 and caso['total_s'] > 0
+    assert casos[True]['telemetria']['contadores']['imagens'] == 10
+    assert 'Resultados' in capsys.readouterr().out
+
+def test_comparar_acusa_piora(tmp_path):
+    saida = tmp_path / 'resultado.json'
+    benchmark.main(['-t', '10', '--so-texto', '-o', str(saida)])
+    anterior = json.loads(saida.read_text(encoding='utf-8'))
+    for caso in anterior['casos']:
+        caso['rss_pico_mb'] /= 2  # o anterior usava metade da memória
+    base = tmp_path / 'base.json'
+    base.write_text(json.dumps(anterior), encoding='utf-8')
+    assert benchmark.main(['-t', '10', '--so-texto', '-o', str(saida), '--comparar', str(base)]) == 1
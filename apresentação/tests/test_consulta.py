@@ -0,0 +1,50 @@
+"""consulta: filtros da linha de comando e uma consulta só para várias saídas"""
+import json
+import zipfile
+
+import pytest
+
+import consulta
+
+def _banco(tmp_path):
+    registros = [{'status': 'Pendente', 'date': f'2025-06-{dia:02d} 10:00:00', 'description': f'Ponto {dia}',
+                  'Latitude': -25.43 + dia / 1000, 'Longitude': -49.27} for dia in range(1, 11)]
+    caminho = str(tmp_path / 'fotos.sqlite')
+    consulta.indexar(consulta.conectar(caminho), registros)
+    return caminho
+
+def test_ultimos_dias_exclui_data_de(tmp_path, capsys):
+    with pytest.raises(SystemExit):
+        consulta.main(['buscar', '--banco', _banco(tmp_path), '--data-de', '2025-06-01', '--ultimos-dias', '7'])
+    assert 'not allowed with' in capsys.readouterr().err
+
+def test_consulta_unica_para_varias_saidas(tmp_path, monkeypatch):
+    banco = _banco(tmp_path)
+    chamadas = []
+    buscar = consulta.buscar
+    monkeypatch.setattr(consulta, 'buscar', lambda *a, **k: chamadas.append(k) or buscar(*a, **k))
+    jsonl, kmz = tmp_path / 'pontos.jsonl', tmp_path / 'pontos.kmz'
+    consulta.main(['buscar', '--banco', banco, '--data-de', '2025-06-05', '-o', str(jsonl), '--kmz', str(kmz)])
+    assert len(chamadas) == 1
+    linhas = [json.loads(linha) for linha in jsonl.read_text(encoding='utf-8').splitlines()]
+    assert [r['description'] for r in linhas] == [f'Ponto {dia}' for dia in range(5, 11)]
+    with zipfile.ZipFile(kmz) as arquivo:
+        kml = arquivo.read('doc.kml').decode('utf-8')
+    assert kml.count('<Placemark') == 6
+
+def test_indexar_de_novo_nao_duplica(tmp_path):
+    caminho = str(tmp_path / 'fotos.sqlite')
+    registros = [{'name': f'IMG_{i}.jpg', 'status': 'Pendente', 'date': f'2025-06-0{i} 10:00:00',
+                  'Latitude': -25.43 + i / 1000, 'Longitude': -49.27} for i in range(1, 6)]
+    consulta.indexar(consulta.conectar(caminho), registros)
+    # O mesmo backup outra vez, com um registro alterado e um que perdeu o GPS
+    registros[1] = dict(registros[1], status='Concluido')
+    registros[3] = dict(registros[3], Latitude='N/A')
+    conexao = consulta.conectar(caminho)
+    consulta.indexar(conexao, registros)
+
+    assert [conexao.execute(f'SELECT count(*) FROM {tabela}').fetchone()[0]
+            for tabela in ('registros', 'dados', 'posicoes')] == [5, 5, 4]
+    assert [r['name'] for r in consulta.buscar(conexao)] == [r['name'] for r in registros]
+    assert [r['name'] for r in consulta.buscar(conexao, status=['Concluido'])] == ['IMG_2.jpg']
+    assert consulta.contar(conexao, raio=(-25.426, -49.27, 50)) == 0
@@ -0,0 +1,59 @@
+"""espacial: consultas do índice contra força bruta e rótulos do agrupamento"""
+import numpy as np
+import pytest
+
+import espacial
+import geodesia
+
+METROS_POR_GRAU_LAT = 111195.0
+
+def _pontos(n=5000, semente=7):
+    rng = np.random.default_rng(semente)
+    lat = -25.43 + rng.uniform(-0.05, 0.05, n)
+    lon = -49.27 + rng.uniform(-0.05, 0.05, n)
+    lat[::97] = np.nan  # registros sem coordenada
+    return lat, lon
+
+@pytest.mark.parametrize('raio_m', [50.0, 400.0, 3000.0])
+def test_raio_igual_a_forca_bruta(raio_m):
+    lat, lon = _pontos()
+    indice = espacial.IndiceEspacial(lat, lon, celula_m=500.0)
+    for centro_lat, centro_lon in [(-25.43, -49.27), (-25.47, -49.31), (-25.38, -49.22)]:
+        d = geodesia.haversine(centro_lat, centro_lon, lat, lon)
+        esperado = np.flatnonzero(d <= raio_m)
+        achados = indice.raio(centro_lat, centro_lon, raio_m)
+        assert sorted(achados) == sorted(esperado)
+        assert np.all(np.diff(d[achados]) >= 0)  # do mais próximo ao mais distante
+
+def test_retangulo_igual_a_forca_bruta():
+    lat, lon = _pontos()
+    indice = espacial.IndiceEspacial(lat, lon, celula_m=300.0)
+    for caixa in [(-25.44, -49.28, -25.42, -49.26), (-25.5, -49.4, -25.3, -49.1), (-25.0, -48.0, -24.9, -47.9)]:
+        lat_min, lon_min, lat_max, lon_max = caixa
+        esperado = np.flatnonzero((lat >= lat_min) & (lat <= lat_max) & (lon >= lon_min) & (lon <= lon_max))
+        assert list(indice.retangulo(*caixa)) == list(esperado)
+
+def _deslocar(lat, lon, norte_m, leste_m):
+    return lat + norte_m / METROS_POR_GRAU_LAT, lon + leste_m / (METROS_POR_GRAU_LAT * np.cos(np.radians(lat)))
+
+@pytest.mark.parametrize('por_nucleo', [10, 200])  # 200 passa de DENSA: distância pelas subcélulas
+def test_agrupar_nucleo_borda_e_ruido(por_nucleo):
+    base = (-25.43, -49.27)
+    outro = _deslocar(*base, 0, 2000)
+    pontos = [base] * por_nucleo + [outro] * por_nucleo + [
+        _deslocar(*base, 90, 0),     # borda: a 90 m do primeiro núcleo
+        _deslocar(*outro, 0, -60),   # borda do segundo
+        _deslocar(*base, 0, 1000),   # ruído: longe dos dois
+        _deslocar(*base, -180, 0),   # ruído: além de 1,25·eps
+        (float('nan'), float('nan')),
+    ]
+    lat, lon = np.array(pontos).T
+    rotulos = espacial.agrupar(lat, lon, eps_m=100.0, min_pontos=por_nucleo)
+    primeiro, segundo = rotulos[0], rotulos[por_nucleo]
+    assert primeiro >= 0 and segundo >= 0 and primeiro != segundo
+    assert set(rotulos[:por_nucleo]) == {primeiro} and set(rotulos[por_nucleo:2 * por_nucleo]) == {segundo}
+    assert list(rotulos[2 * por_nucleo:]) == [primeiro, segundo, -1, -1, -1]
+
+def test_sem_nucleo_tudo_ruido():
+    lat, lon = _pontos(200)
+    assert set(espacial.agrupar(lat, lon, eps_m=10.0, min_pontos=50)) == {-1}
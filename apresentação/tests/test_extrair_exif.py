@@ -0,0 +1,80 @@
+"""extrair_exif: registros de fotos com EXIF GPS"""
+import io
+
+from PIL import Image
+import pytest
+
+import extrair_exif
+
+def _jpeg_com_gps(caminho, truncar=False):
+    exif = Image.Exif()
+    exif[0x8825] = {1: 'S', 2: (25.0, 25.0, 48.0), 3: 'W', 4: (49.0, 16.0, 12.0)}  # GPSInfo
+    dados = io.BytesIO()
+    Image.new('RGB', (800, 600), 'blue').save(dados, 'JPEG', exif=exif)
+    dados = dados.getvalue()
+    if truncar:
+        dados = dados[:len(dados) // 2]  # cabeçalho e EXIF inteiros, imagem cortada
+    with open(caminho, 'wb') as f:
+        f.write(dados)
+
+def test_reduzida(tmp_path):
+    caminho = str(tmp_path / 'ok.jpg')
+    _jpeg_com_gps(caminho)
+    r = extrair_exif.registro(caminho, 0, '2026-10-27', 'reduzida')
+    assert r['thumbnail'].startswith('data:image/jpeg;base64,')
+    assert r['Latitude'] == pytest.approx(-(25 + 25 / 60 + 48 / 3600))
+
+def test_reduzida_com_imagem_corrompida_mantem_o_registro(tmp_path):
+    caminho = str(tmp_path / 'truncada.jpg')
+    _jpeg_com_gps(caminho, truncar=True)
+    avisos, falhas = [], []
+    registros = list(extrair_exif.extrair([caminho], workers=1, miniatura='reduzida', previsao='2026-10-27',
+                                          ao_falhar=lambda c, e: falhas.append(c),
+                                          ao_avisar=lambda c, e: avisos.append(c)))
+    assert falhas == [] and avisos == [caminho]
+    assert len(registros) == 1
+    r = registros[0]
+    assert r['thumbnail'] == ""
+    assert r['Latitude'] == pytest.approx(-(25 + 25 / 60 + 48 / 3600))
+    assert r['Longitude'] == pytest.approx(-(49 + 16 / 60 + 12 / 3600))
+    assert r['date']
+
+def _gps():
+    exif = Image.Exif()
+    exif[0x8825] = {1: 'S', 2: (25.0, 25.0, 48.0), 3: 'W', 4: (49.0, 16.0, 12.0)}
+    return exif
+
+@pytest.mark.parametrize('formato', ['png', 'webp', 'tif'])
+def test_gps_de_formato_que_nao_e_jpeg(tmp_path, formato):
+    caminho = str(tmp_path / f'foto.{formato}')
+    exif = _gps()
+    Image.new('RGB', (80, 60), 'blue').save(caminho, exif=exif.tobytes() if formato == 'tif' else exif)
+    sem_exif = []
+    r = extrair_exif.registro(caminho, 0, '2026-10-27', 'reduzida', ao_sem_exif=lambda c, m: sem_exif.append(c))
+    assert sem_exif == []
+    assert r['Latitude'] == pytest.approx(-(25 + 25 / 60 + 48 / 3600))
+    assert r['Longitude'] == pytest.approx(-(49 + 16 / 60 + 12 / 3600))
+    assert r['thumbnail'].startswith('data:image/jpeg;base64,')
+
+def test_gps_de_heic_com_o_plugin(tmp_path):
+    pillow_heif = pytest.importorskip('pillow_heif')
+    caminho = str(tmp_path / 'foto.heic')
+    pillow_heif.from_pillow(Image.new('RGB', (80, 60), 'blue')).save(caminho, exif=_gps().tobytes())
+    sem_exif = []
+    r = extrair_exif.registro(caminho, 0, '2026-10-27', 'reduzida', ao_sem_exif=lambda c, m: sem_exif.append(c))
+    assert sem_exif == []
+    assert r['Latitude'] == pytest.approx(-(25 + 25 / 60 + 48 / 3600))
+    assert r['thumbnail'].startswith('data:image/jpeg;base64,')
+
+def test_sem_exif_e_avisado(tmp_path):
+    png = str(tmp_path / 'captura.png')
+    Image.new('RGB', (80, 60), 'blue').save(png)
+    heic = str(tmp_path / 'foto.heic')
+    with open(heic, 'wb') as f:
+        f.write(b'\x00\x00\x00\x18ftypheic' + bytes(100))  # HEIC sem o plugin pillow-heif
+    motivos = {}
+    registros = list(extrair_exif.extrair([png, heic], workers=1, previsao='2026-10-27',
+                                          ao_sem_exif=lambda c, m: motivos.setdefault(c, m)))
+    assert [r['Latitude'] for r in registros] == ["N/A", "N/A"]
+    assert motivos[png] == "EXIF não encontrado"
+    assert motivos[heic].startswith("formato não lido pelo Pillow")
@@ -0,0 +1,70 @@
+"""geodesia e coordenadas contra as saídas TypeScript de geodesia_referencia.json"""
+import json
+import sys
+
+import numpy as np
+import pytest
+
+import coordenadas
+import geodesia
+
+with open(geodesia.REFERENCIA, encoding='utf-8') as f:
+    REFERENCIA = json.load(f)
+
+def _colunas(pares, chaves):
+    return [np.array([p[k] for p in pares]) for k in chaves]
+
+def test_utm():
+    pontos = REFERENCIA['utm']
+    _, _, easting, northing = geodesia.utm([p['lat'] for p in pontos], [p['lon'] for p in pontos])
+    esperado = np.array([[float(v) for v in p['calculateUTM'].split(',')] for p in pontos])
+    np.testing.assert_allclose(easting, esperado[:, 0], rtol=0, atol=geodesia.TOLERANCIA_M)
+    np.testing.assert_allclose(northing, esperado[:, 1], rtol=0, atol=geodesia.TOLERANCIA_M)
+
+def test_calcular_utm_usa_geodesia():
+    for p in REFERENCIA['utm']:
+        assert coordenadas.calcular_utm(p['lat'], p['lon']) == p['calculateUTM']
+    assert coordenadas.calcular_utm("N/A", -49.2) == "N/A"
+
+def test_haversine_e_inversa():
+    pares = REFERENCIA['distancias']
+    colunas = _colunas(pares, ('lat1', 'lon1', 'lat2', 'lon2'))
+    np.testing.assert_allclose(geodesia.haversine(*colunas), [p['calculateDistance'] for p in pares],
+                               rtol=0, atol=geodesia.TOLERANCIA_M)
+    s12, azi1, azi2 = geodesia.inversa_esferica(*colunas)
+    np.testing.assert_allclose(s12, [p['Inverse']['s12'] for p in pares], rtol=0, atol=geodesia.TOLERANCIA_M)
+    np.testing.assert_allclose(azi1, [p['Inverse']['azi1'] for p in pares], rtol=0, atol=1e-9)
+    np.testing.assert_allclose(azi2, [p['Inverse']['azi2'] for p in pares], rtol=0, atol=1e-9)
+
+def test_direta():
+    diretas = REFERENCIA['diretas']
+    lat2, lon2, azi2 = geodesia.direta_esferica(*_colunas(diretas, ('lat1', 'lon1', 'azi1', 's12')))
+    for chave, valores in (('lat2', lat2), ('lon2', lon2), ('azi2', azi2)):
+        np.testing.assert_allclose(valores, [p['Direct'][chave] for p in diretas], rtol=0, atol=1e-8)
+
+def test_vincenty_exemplo_classico():
+    # Flinders Peak -> Buninyong (Vincenty, 1975)
+    s12, azi1, _ = geodesia.vincenty(-(37 + 57 / 60 + 3.72030 / 3600), 144 + 25 / 60 + 29.52440 / 3600,
+                                     -(37 + 39 / 60 + 10.15610 / 3600), 143 + 55 / 60 + 35.38390 / 3600)
+    assert abs(s12 - 54972.271) < geodesia.TOLERANCIA_M
+    assert abs(azi1 % 360 - (306 + 52 / 60 + 5.37 / 3600)) < 1e-5
+
+def test_vincenty_sem_geographiclib(monkeypatch):
+    # Escalares e arrays convergem pela própria iteração, sem o fallback de Karney
+    monkeypatch.setitem(sys.modules, 'geographiclib', None)
+    monkeypatch.setitem(sys.modules, 'geographiclib.geodesic', None)
+    lat1, lon1 = -(37 + 57 / 60 + 3.72030 / 3600), 144 + 25 / 60 + 29.52440 / 3600
+    lat2, lon2 = -(37 + 39 / 60 + 10.15610 / 3600), 143 + 55 / 60 + 35.38390 / 3600
+    s12, azi1, azi2 = geodesia.vincenty(lat1, lon1, lat2, lon2)
+    assert np.ndim(s12) == 0 and abs(s12 - 54972.271) < geodesia.TOLERANCIA_M
+    assert np.isfinite(azi1) and np.isfinite(azi2)
+    s12, _, _ = geodesia.vincenty([[lat1], [lat1]], [[lon1], [lon1]], lat2, lon2)
+    assert s12.shape == (2, 1)
+    np.testing.assert_allclose(s12, 54972.271, rtol=0, atol=geodesia.TOLERANCIA_M)
+
+def test_vincenty_pares_de_referencia():
+    Geodesic = pytest.importorskip('geographiclib.geodesic').Geodesic
+    pares = REFERENCIA['distancias']
+    s12, _, _ = geodesia.vincenty(*_colunas(pares, ('lat1', 'lon1', 'lat2', 'lon2')))
+    esperado = [Geodesic.WGS84.Inverse(p['lat1'], p['lon1'], p['lat2'], p['lon2'])['s12'] for p in pares]
+    np.testing.assert_allclose(s12, esperado, rtol=0, atol=geodesia.TOLERANCIA_M)
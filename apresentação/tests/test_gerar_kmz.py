@@ -0,0 +1,62 @@
+"""gerar_kmz: placemarks, fotos em images/ e registros sem GPS"""
+import base64
+import io
+import zipfile
+
+from lxml import etree
+from PIL import Image
+import pytest
+
+import gerar_kmz
+
+NS = {'k': gerar_kmz.NS_KML}
+
+@pytest.fixture
+def registros(data_uri):
+    return [
+        {'name': 'IMG_1.jpg', 'status': 'Atrasado', 'Latitude': -25.43, 'Longitude': -49.27, 'thumbnail': data_uri('blue')},
+        {'name': 'IMG_2.jpg', 'status': 'Concluido', 'Latitude': '-25.5', 'Longitude': '-49', 'thumbnail': data_uri('green', 'PNG')},
+        {'name': 'SEM_GPS.jpg', 'Latitude': 'N/A', 'Longitude': None, 'thumbnail': data_uri('red')},
+        {'name': 'IMG_3.jpg', 'Latitude': -25.44, 'Longitude': -49.28, 'thumbnail': data_uri('blue')},  # mesma foto do 1
+        {'name': 'IMG_4.jpg', 'Latitude': -25.45, 'Longitude': -49.29, 'thumbnail': 'data:image/jpeg;base64,abc'},
+        {'name': 'IMG_5.jpg', 'Latitude': -25.46, 'Longitude': -49.3},
+    ]
+
+def _placemarks(kml):
+    raiz = etree.fromstring(kml)
+    return raiz.findall('.//k:Placemark', NS)
+
+def test_kmz(tmp_path, registros, capsys):
+    destino = str(tmp_path / 'pontos.kmz')
+    assert gerar_kmz.gerar_kmz(iter(registros), destino) == 5
+    with zipfile.ZipFile(destino) as z:
+        assert z.namelist()[-1] == 'doc.kml'
+        fotos = sorted(n for n in z.namelist() if n.startswith('images/'))
+        assert fotos == ['images/img_0.jpg', 'images/img_1.png']
+        assert z.read('images/img_0.jpg') == base64.b64decode(registros[0]['thumbnail'].partition(',')[2])
+        placemarks = _placemarks(z.read('doc.kml'))
+
+    assert [p.findtext('k:name', namespaces=NS) for p in placemarks] == ['IMG_1.jpg', 'IMG_2.jpg', 'IMG_3.jpg', 'IMG_4.jpg', 'IMG_5.jpg']
+    assert [p.findtext('k:Point/k:coordinates', namespaces=NS) for p in placemarks] == [
+        '-49.27,-25.43', '-49,-25.5', '-49.28,-25.44', '-49.29,-25.45', '-49.3,-25.46']
+    assert [p.findtext('k:styleUrl', namespaces=NS) for p in placemarks] == [
+        '#atrasado', '#concluido', '#pendente', '#pendente', '#pendente']
+    descricoes = [p.findtext('k:description', namespaces=NS) for p in placemarks]
+    # A foto repetida aponta para o arquivo já gravado; sem foto (ou foto inválida), sem <img>
+    assert 'src="images/img_0.jpg"' in descricoes[0] and 'src="images/img_0.jpg"' in descricoes[2]
+    assert 'src="images/img_1.png"' in descricoes[1]
+    assert '<img' not in descricoes[3] and '<img' not in descricoes[4]
+    assert 'IMG_4.jpg' in capsys.readouterr().err
+
+def test_kml_com_miniaturas(tmp_path, registros):
+    destino = str(tmp_path / 'pontos.kml')
+    assert gerar_kmz.gerar_kml(iter(registros), destino) == 5
+    with open(destino, 'rb') as f:
+        placemarks = _placemarks(f.read())
+    descricao = placemarks[0].findtext('k:description', namespaces=NS)
+    src = descricao.split('src="')[1].split('"')[0]
+    cabecalho, _, dados = src.partition(',')
+    assert cabecalho == 'data:image/jpeg;base64'
+    with Image.open(io.BytesIO(base64.b64decode(dados))) as miniatura:
+        assert miniatura.width <= 300 and miniatura.height <= 200
+    assert '<img' not in placemarks[3].findtext('k:description', namespaces=NS)
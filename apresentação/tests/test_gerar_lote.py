@@ -0,0 +1,42 @@
+"""gerar_lote: decks em paralelo, no modelo passado com --modelo"""
+import json
+
+from pptx import Presentation
+import pytest
+
+import gerar_lote
+
+@pytest.fixture
+def modelo(tmp_path):
+    """Modelo padrão com o layout em branco renomeado, fácil de reconhecer nos decks"""
+    prs = Presentation()
+    prs.slide_layouts[6].name = 'Em branco da obra'
+    caminho = str(tmp_path / 'modelo.pptx')
+    prs.save(caminho)
+    return caminho
+
+def _specs(tmp_path, total):
+    origem = tmp_path / 'decks.jsonl'
+    with open(origem, 'w', encoding='utf-8') as f:
+        for i in range(total):
+            cards = [{'titulo': 'Rua A', 'texto': 'Vazamento'}]
+            spec = {'nome': f'municipio_{i}', 'slides': [{'tipo': 'cards', 'titulo': f'Município {i}', 'cards': cards}]}
+            f.write(json.dumps(spec, ensure_ascii=False) + '\n')
+    return str(origem)
+
+def test_lote_usa_o_modelo(tmp_path, modelo):
+    resumo = gerar_lote.gerar_lote(_specs(tmp_path, 3), str(tmp_path / 'saida'), workers=2, modelo=modelo)
+    assert resumo['erros'] == [] and resumo['decks'] == 3
+    for resultado in resumo['resultados']:
+        prs = Presentation(resultado['arquivo'])
+        assert resultado['slides'] == len(prs.slides) == 1
+        assert prs.slides[0].slide_layout.name == 'Em branco da obra'
+
+def test_modelo_da_spec_prevalece(tmp_path, modelo):
+    proprio = Presentation()
+    proprio.slide_layouts[6].name = 'Em branco do deck'
+    proprio.save(str(tmp_path / 'proprio.pptx'))
+    spec = {'slides': [{'tipo': 'cards', 'titulo': 'Outro', 'cards': [{'titulo': 'Rua B'}]}],
+            'modelo': str(tmp_path / 'proprio.pptx')}
+    resultado = gerar_lote.renderizar('deck', spec, str(tmp_path), modelo=modelo)
+    assert Presentation(resultado['arquivo']).slides[0].slide_layout.name == 'Em branco do deck'
@@ -0,0 +1,24 @@
+"""gerar_pdf: blocos renderizados em paralelo e concatenados na ordem"""
+from pypdf import PdfReader
+import pytest
+
+import gerar_pdf
+
+@pytest.fixture
+def registros(data_uri):
+    status = ['Concluido', 'Pendente', 'Atrasado']
+    registros = [{'name': f'IMG_{i:02d}', 'status': status[i % 3], 'date': '18/10/2026, 10:00:00',
+                  'Latitude': -25.43, 'Longitude': -49.27, 'thumbnail': data_uri((i * 20, 0, 0))} for i in range(11)]
+    registros[4]['thumbnail'] = 'data:image/jpeg;base64,abc'  # inválida: página sem foto
+    return registros
+
+@pytest.mark.parametrize('workers', [1, 2])
+def test_paginas_em_ordem_de_status(tmp_path, registros, workers):
+    destino = str(tmp_path / 'relatorio.pdf')
+    assert gerar_pdf.gerar_pdf(iter(registros), destino, workers=workers, por_bloco=3) == len(registros)
+
+    esperado = [r['name'] for s in gerar_pdf.ORDEM_STATUS for r in registros if r['status'] == s]
+    leitor = PdfReader(destino)
+    assert len(leitor.pages) == len(registros)
+    for numero, (pagina, nome) in enumerate(zip(leitor.pages, esperado), 1):
+        assert f"{numero}. {nome}" in pagina.extract_text()
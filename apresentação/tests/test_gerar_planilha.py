@@ -0,0 +1,65 @@
+"""gerar_planilha: colunas do XLSX, esquema do Parquet e datas que não se interpretam"""
+import datetime
+
+import openpyxl
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+import gerar_planilha
+
+REGISTROS = [
+    {'index': i, 'name': f'IMG_{i}.jpg', 'description': f'Ponto {i}', 'status': 'Pendente', 'fileSize': '1.2 MB',
+     'fileType': 'image/jpeg', 'Latitude': -25.43 + i / 1000, 'Longitude': -49.27,
+     'date': '18/10/2026, 10:00:00', 'predictionDate': '2026-10-27', 'thumbnail': 'data:image/jpeg;base64,AAAA'}
+    for i in range(5)
+]
+REGISTROS[2] = dict(REGISTROS[2], date='ontem à tarde', predictionDate='sem previsão', Latitude='N/A', status='Atrasado')
+
+def test_xlsx(tmp_path, monkeypatch):
+    monkeypatch.setattr(gerar_planilha, 'LINHAS_POR_ABA', 3)
+    destino = str(tmp_path / 'rotas.xlsx')
+    linhas, _ = gerar_planilha.exportar(iter(REGISTROS), [destino], tamanho=2)
+    assert linhas == 5
+
+    livro = openpyxl.load_workbook(destino)
+    assert livro.sheetnames == ['Rotas', 'Rotas 2']
+    linhas = []
+    for aba in livro.worksheets:
+        cabecalho, *dados = aba.iter_rows(values_only=True)
+        assert list(cabecalho) == gerar_planilha.COLUNAS_XLSX
+        linhas.extend(dados)
+    assert [linha[3] for linha in linhas] == [r['name'] for r in REGISTROS]
+    assert linhas[0][8] == datetime.datetime(2026, 10, 18, 10, 0, 0)
+    assert linhas[0][9] == datetime.datetime(2026, 10, 27)
+    # Coordenada inválida vira 0; datas que não se interpretam ficam como texto
+    assert linhas[2][0] == 0
+    assert (linhas[2][8], linhas[2][9]) == ('ontem à tarde', 'sem previsão')
+
+def test_parquet(tmp_path):
+    destino = str(tmp_path / 'rotas.parquet')
+    linhas, _ = gerar_planilha.exportar(iter(REGISTROS), [destino], tamanho=2)
+    assert linhas == 5
+
+    arquivo = pq.ParquetFile(destino)
+    assert arquivo.metadata.num_rows == 5 and arquivo.metadata.num_row_groups == 3
+    tabela = arquivo.read()
+    assert tabela.schema.field('Latitude').type == pa.float64()
+    assert tabela.schema.field('index').type == pa.int64()
+    assert tabela.schema.field('status').type == pa.dictionary(pa.int32(), pa.string())
+    assert pa.types.is_timestamp(tabela.schema.field('date').type)  # o Parquet não tem segundos: volta em ms
+    assert tabela.schema.field('predictionDate').type == pa.date32()
+    assert 'thumbnail' not in tabela.schema.names
+
+    colunas = tabela.to_pydict()
+    assert colunas['date'][0] == datetime.datetime(2026, 10, 18, 10, 0, 0)
+    assert colunas['date'][2] is None and colunas['Latitude'][2] is None
+    assert colunas['date_original'] == [None, None, 'ontem à tarde', None, None]
+    assert colunas['predictionDate_original'] == [None, None, 'sem previsão', None, None]
+    assert colunas['status'] == ['Pendente', 'Pendente', 'Atrasado', 'Pendente', 'Pendente']
+
+def test_parquet_com_muitos_tipos_de_arquivo(tmp_path):
+    registros = [dict(REGISTROS[0], index=i, fileType=f'image/x-tipo-{i}') for i in range(300)]
+    destino = str(tmp_path / 'rotas.parquet')
+    linhas, _ = gerar_planilha.exportar(iter(registros), [destino])
+    assert linhas == 300
+    assert pq.read_table(destino).column('fileType').to_pylist() == [r['fileType'] for r in registros]
@@ -0,0 +1,126 @@
+"""Build incremental: pacote válido e mídia gravada uma vez só"""
+import io
+import json
+import posixpath
+import zipfile
+
+from lxml import etree
+from PIL import Image
+from pptx import Presentation
+from pptx.oxml.shapes.picture import CT_Picture
+from pptx.util import Inches
+import pytest
+
+import gerar_pptx
+import incremental
+
+def _png(cor):
+    dados = io.BytesIO()
+    Image.new('RGB', (64, 48), cor).save(dados, 'PNG')
+    return dados.getvalue()
+
+def _modelo_com_imagem_no_layout(caminho):
+    """Modelo padrão com um logotipo no layout em branco (o usado pelos slides)"""
+    prs = Presentation()
+    layout = prs.slide_layouts[6]
+    _, rId = layout.part.get_or_add_image_part(io.BytesIO(_png('red')))
+    pic = CT_Picture.new_pic(99, 'Logo', '', rId, Inches(15), Inches(8), Inches(0.5), Inches(0.4))
+    layout.shapes._spTree.append(pic)
+    prs.save(caminho)
+
+@pytest.fixture
+def slide_foto(foto):
+    return lambda nome, cor: foto(nome, cor, tipo='foto')
+
+def _verificar_pacote(caminho):
+    """Toda relação interna aponta para uma parte que existe e nenhuma mídia se repete"""
+    with zipfile.ZipFile(caminho) as z:
+        assert z.testzip() is None
+        nomes = set(z.namelist())
+        for nome in nomes:
+            pasta, _, arquivo = nome.rpartition('/_rels/')
+            if not pasta or not arquivo.endswith('.rels'):
+                continue
+            parte = posixpath.join(pasta, arquivo[:-len('.rels')])
+            for r in etree.fromstring(z.read(nome)).iter(f'{{{incremental.NS_REL}}}Relationship'):
+                if r.get('TargetMode') != 'External':
+                    assert incremental._alvo(parte, r) in nomes, (nome, r.get('Target'))
+        midia = [z.read(n) for n in nomes if n.startswith('ppt/media/')]
+    assert len(midia) == len(set(midia))
+    Presentation(caminho)
+
+def test_modelo_com_midia_no_layout(tmp_path, slide_foto):
+    modelo = str(tmp_path / 'modelo.pptx')
+    _modelo_com_imagem_no_layout(modelo)
+    saida = str(tmp_path / 'deck.pptx')
+    slides = [slide_foto('A', 'blue'), slide_foto('B', 'green'), slide_foto('C', 'blue')]
+
+    total, refeitos = incremental.build_incremental({'modelo': modelo, 'slides': slides}, saida)
+    assert refeitos == [0, 1, 2]
+    _verificar_pacote(saida)
+
+    # Só o texto muda: a foto refeita é a mesma e o logotipo do layout continua no pacote
+    slides[1] = dict(slides[1], name='B2')
+    total, refeitos = incremental.build_incremental({'modelo': modelo, 'slides': slides}, saida)
+    assert (total, refeitos) == (3, [1])
+    _verificar_pacote(saida)
+
+    # Troca a foto e remove um slide
+    slides = [slides[0], slide_foto('B3', 'yellow')]
+    total, refeitos = incremental.build_incremental({'modelo': modelo, 'slides': slides}, saida)
+    assert (total, refeitos) == (2, [1])
+    _verificar_pacote(saida)
+    prs = Presentation(saida)
+    assert [s.shapes[1].text_frame.paragraphs[0].text for s in prs.slides] == ['A', 'B3']
+
+def test_saida_regravada_por_build_completo(tmp_path, slide_foto):
+    saida = str(tmp_path / 'deck.pptx')
+    spec_a = {'slides': [slide_foto('A1', 'blue'), slide_foto('A2', 'green')]}
+    spec_b = tmp_path / 'b.json'
+    spec_b.write_text(json.dumps({'slides': [slide_foto('B1', 'red'), slide_foto('B2', 'yellow')]}), encoding='utf-8')
+
+    incremental.build_incremental(spec_a, saida)
+    gerar_pptx.main([str(spec_b), '-o', saida])
+    # O manifesto descreve o build A, mas o arquivo agora é o B: tudo é refeito
+    total, refeitos = incremental.build_incremental(spec_a, saida)
+    assert (total, refeitos) == (2, [0, 1])
+    prs = Presentation(saida)
+    assert [s.shapes[1].text_frame.paragraphs[0].text for s in prs.slides] == ['A1', 'A2']
+
+def _app(caminho):
+    with zipfile.ZipFile(caminho) as z:
+        app = etree.fromstring(z.read('docProps/app.xml'))
+    titulos = [e.text for e in app.find(f'{{{incremental.NS_EP}}}TitlesOfParts').iter(f'{{{incremental.NS_VT}}}lpstr')]
+    return int(app.findtext(f'{{{incremental.NS_EP}}}Slides')), titulos
+
+def test_remover_slide_refaz_app_xml_e_copia_o_resto_sem_recomprimir(tmp_path, slide_foto):
+    saida = str(tmp_path / 'deck.pptx')
+    slides = [slide_foto('A', 'blue'), slide_foto('B', 'green'), slide_foto('C', 'red')]
+    incremental.build_incremental({'slides': slides}, saida)
+    assert _app(saida) == (3, ['Office Theme', 'A', 'B', 'C'])
+    with zipfile.ZipFile(saida) as z:
+        antes = {i.filename: (i.CRC, i.compress_type, i.compress_size) for i in z.infolist()}
+
+    total, refeitos = incremental.build_incremental({'slides': slides[:2]}, saida)
+    assert (total, refeitos) == (2, [])
+    _verificar_pacote(saida)
+    assert _app(saida) == (2, ['Office Theme', 'A', 'B'])
+    assert len(Presentation(saida).slides) == 2
+    with zipfile.ZipFile(saida) as z:
+        depois = {i.filename: (i.CRC, i.compress_type, i.compress_size) for i in z.infolist()}
+    for nome in ('ppt/slides/slide1.xml', 'ppt/slides/slide2.xml', 'ppt/slideMasters/slideMaster1.xml'):
+        assert depois[nome] == antes[nome]
+    assert 'ppt/slides/slide3.xml' not in depois
+
+def test_sem_mudanca_nao_regrava(tmp_path, slide_foto):
+    saida = str(tmp_path / 'deck.pptx')
+    spec = {'slides': [slide_foto('A', 'blue'), slide_foto('B', 'green')]}
+    incremental.build_incremental(spec, saida)
+    carimbo = incremental.carimbo(saida)
+    with open(incremental.caminho_manifesto(saida), encoding='utf-8') as f:
+        manifesto = f.read()
+
+    assert incremental.build_incremental(spec, saida) == (2, [])
+    assert incremental.carimbo(saida) == carimbo
+    with open(incremental.caminho_manifesto(saida), encoding='utf-8') as f:
+        assert f.read() == manifesto
@@ -0,0 +1,55 @@
+"""Partida da CLI: --help não carrega dependências pesadas e o deck trivial cabe no orçamento"""
+import json
+import subprocess
+import sys
+
+import benchmark
+import gerar_pptx
+
+PESADOS = ('pptx', 'lxml', 'PIL', 'numpy', 'yaml')
+
+# Roda num processo novo: na suíte, outros testes já importaram esses módulos
+VERIFICAR = """
+import sys
+import gerar_pptx
+if sys.argv[1] == 'ajuda':
+    try:
+        gerar_pptx.main(['--help'])
+    except SystemExit:
+        pass
+elif sys.argv[1] != 'import':
+    gerar_pptx.main([sys.argv[1], '-o', sys.argv[1] + '.pptx'])
+print(','.join(sorted({m.split('.')[0] for m in sys.modules} & set(sys.argv[2:]))))
+"""
+
+# Folga sobre o orçamento: máquinas de CI são mais lentas e variam; o benchmark mede o valor exato
+MARGEM_ORCAMENTO = 3
+
+def _carregados(etapa):
+    resultado = subprocess.run([sys.executable, '-c', VERIFICAR, etapa, *PESADOS], cwd=gerar_pptx.DIRETORIO,
+                               capture_output=True, text=True, check=True)
+    return resultado.stdout.splitlines()[-1]
+
+def test_import_nao_carrega_dependencias_pesadas():
+    assert _carregados('import') == ''
+
+def test_ajuda_nao_carrega_dependencias_pesadas():
+    assert _carregados('ajuda') == ''
+
+def test_build_deck_importa_montagem_sob_demanda():
+    spec = gerar_pptx.carregar_spec(gerar_pptx.SPEC_PADRAO)
+    prs = gerar_pptx.build_deck(spec)
+    assert len(prs.slides) == len(spec['slides'])
+    assert len(gerar_pptx.nova_apresentacao().slides) == 0
+
+def test_deck_trivial_so_carrega_o_que_renderiza(tmp_path):
+    with open(gerar_pptx.SPEC_PADRAO, encoding='utf-8') as f:
+        capa = json.load(f)['slides'][0]
+    spec = tmp_path / 'trivial.json'
+    spec.write_text(json.dumps({'slides': [capa]}), encoding='utf-8')
+    assert _carregados(str(spec)) == 'PIL,lxml,pptx'
+
+def test_deck_trivial_cabe_no_orcamento_a_frio():
+    tempos = benchmark.medir_inicio(repeticoes=3)
+    assert tempos['deck_trivial_s'] <= MARGEM_ORCAMENTO * gerar_pptx.ORCAMENTO_INICIO_S
+    assert tempos['ajuda_s'] <= MARGEM_ORCAMENTO * gerar_pptx.ORCAMENTO_AJUDA_S
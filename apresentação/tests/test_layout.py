@@ -0,0 +1,75 @@
+"""Cards: título e texto longos ficam dentro do card e do slide"""
+import os
+
+from pptx import Presentation
+from pptx.util import Inches
+
+import gerar_pptx
+import layout
+import montagem
+
+REFERENCIA = os.path.join(gerar_pptx.DIRETORIO, 'Apresentacao_BRK_Atitude_Inovacao_2025.pptx')
+
+def test_titulo_longo_cabe_no_card():
+    card = {'icone': '📍', 'titulo': 'Rua muito comprida ' * 200, 'texto': 'Vazamento na calçada ' * 50}
+    largura = layout.largura_coluna(3)
+    textos, altura = layout._card(card, largura, layout.AREA_ALTURA)
+    assert altura <= layout.AREA_ALTURA
+    titulo = next(t for t in textos if t[0] == 'titulo')
+    assert titulo[1].endswith('…') and titulo[4] == layout.TAMANHO_MINIMO
+    assert any(t[0] == 'texto' for t in textos)
+
+def test_titulo_curto_fica_intacto():
+    card = {'titulo': 'Rua A', 'texto': 'Vazamento'}
+    textos, _ = layout._card(card, layout.largura_coluna(3), layout.AREA_ALTURA)
+    papel, texto, _, _, tamanho, negrito = textos[0]
+    assert (papel, texto, tamanho, negrito) == ('titulo', 'Rua A', layout.TAMANHO_TITULO, True)
+
+def test_paginas_nao_passam_da_area():
+    cards = [{'titulo': 'T' * 3000, 'texto': 'x ' * 2000}] * 4
+    for pagina in layout.paginar_cards({'tipo': 'cards', 'titulo': 'P', 'cards': cards}):
+        for card in pagina['posicionados']:
+            x, y, largura, altura = card['caixa']
+            assert y + altura <= layout.AREA_TOP + layout.AREA_ALTURA
+
+def _fundo(slide):
+    return max(forma.top + forma.height for forma in slide.shapes)
+
+def test_fluxo_longo_pagina():
+    steps = [[str(i), f'Etapa {i}', f'Descrição da etapa {i}\nsegunda linha'] for i in range(1, 11)]
+    prs = montagem.build_deck({'slides': [{'tipo': 'fluxo', 'titulo': 'Fluxo', 'steps': steps}]})
+    assert len(prs.slides) > 1
+    for slide in prs.slides:
+        assert _fundo(slide) <= prs.slide_height
+    textos = [forma.text_frame.text for slide in prs.slides for forma in slide.shapes if forma.has_text_frame]
+    assert textos[1].startswith('Fluxo (1/') and sum(t.startswith('Etapa ') for t in textos) == 10
+
+def test_colunas_pagina_cada_uma():
+    dados = {'tipo': 'tecnologia', 'titulo': 'Tecnologia', 'stack_titulo': 'Stack', 'seguranca_titulo': 'Segurança',
+             'stack': [f'Item {i}' for i in range(20)], 'seg_boxes': [['LGPD', 'Dados criptografados']]}
+    paginas = list(layout.expandir([dados], montagem.LISTAS))
+    assert [len(p['stack']) for p in paginas] == [6, 6, 6, 2]
+    assert [len(p['seg_boxes']) for p in paginas] == [1, 0, 0, 0]
+    assert list(layout.expandir(paginas, montagem.LISTAS)) == paginas
+
+def test_linha_da_grade_cresce_com_o_texto():
+    lista = montagem.LISTAS['visao_geral']['features']
+    features = [['A', 'curta'], ['B', 'longa ' * 60], ['C', 'curta'], ['D', 'curta']]
+    posicoes = lista.posicoes(features)
+    assert posicoes[0][3] == posicoes[1][3] > lista.altura
+    assert posicoes[3] == (lista.left, posicoes[0][1] + posicoes[0][3] + lista.espaco_y, lista.largura, lista.altura)
+
+def _geometria(slides):
+    return [[(forma.left, forma.top, forma.width, forma.height, forma.text_frame.text if forma.has_text_frame else None)
+             for forma in slide.shapes] for slide in slides]
+
+def test_deck_padrao_mantem_a_geometria_original():
+    prs = montagem.build_deck(gerar_pptx.carregar_spec(gerar_pptx.SPEC_PADRAO))
+    assert _geometria(prs.slides) == _geometria(Presentation(REFERENCIA).slides)
+
+def test_descricao_so_cresce_pelo_que_transborda():
+    lista = montagem.LISTAS['roadmap']['roadmap']
+    roadmap = [['Q1', 'Curta', 'Uma linha'], ['Q2', 'Longa', 'texto comprido ' * 30]]
+    curta, longa = lista.posicoes(roadmap)
+    assert curta[3] == lista.altura
+    assert longa[3] == lista.altura + layout.excesso(roadmap[1][2], Inches(5.5), 15, 2) > lista.altura
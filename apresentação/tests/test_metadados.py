@@ -0,0 +1,36 @@
+"""metadados: leitura em blocos de backups JSON e JSONL"""
+import json
+
+import pytest
+
+import metadados
+
+REGISTROS = [
+    {'name': 'IMG_1.jpg', 'description': 'Tampa [quebrada], ver {foto}', 'status': 'Atrasado'},
+    {'name': 'IMG_2.jpg', 'description': 'Aspas \\"escapadas\\" e ]] soltos [[', 'Latitude': -25.43},
+    {'name': 'Calçada é ação', 'description': '', 'thumbnail': 'data:image/jpeg;base64,' + 'A' * 5000},
+    {'name': 'IMG_4.jpg', 'tags': [[1, 2], {'a': ','}], 'status': None},
+]
+
+@pytest.mark.parametrize('formato', ['array', 'array_indentado', 'jsonl'])
+@pytest.mark.parametrize('bloco', [1, 3, 16, 1 << 16])
+def test_iterar_registros_em_blocos(tmp_path, formato, bloco):
+    caminho = tmp_path / 'backup.json'
+    if formato == 'jsonl':
+        texto = ''.join(json.dumps(r, ensure_ascii=False) + '\n' for r in REGISTROS)
+    else:
+        texto = json.dumps(REGISTROS, ensure_ascii=False, indent=2 if formato == 'array_indentado' else None)
+    caminho.write_text(texto, encoding='utf-8')
+    assert list(metadados.iterar_registros(str(caminho), bloco)) == REGISTROS
+
+def test_arquivo_vazio_e_array_vazio(tmp_path):
+    for texto in ('', '[]', ' [ \n ] '):
+        caminho = tmp_path / 'vazio.json'
+        caminho.write_text(texto, encoding='utf-8')
+        assert list(metadados.iterar_registros(str(caminho), 2)) == []
+
+def test_objeto_truncado_falha(tmp_path):
+    caminho = tmp_path / 'truncado.json'
+    caminho.write_text(json.dumps(REGISTROS)[:-40], encoding='utf-8')
+    with pytest.raises(json.JSONDecodeError):
+        list(metadados.iterar_registros(str(caminho), 8))
@@ -0,0 +1,22 @@
+"""montagem: slide de foto com thumbnail corrompida"""
+import base64
+
+from pptx.enum.shapes import MSO_SHAPE_TYPE
+import pytest
+
+import montagem
+
+@pytest.mark.parametrize('thumbnail', [
+    'data:image/jpeg;base64,abc',  # base64 com padding inválido
+    'data:image/jpeg;base64,' + base64.b64encode(b'isto nao e uma imagem').decode(),
+])
+def test_thumbnail_invalida_vira_sem_imagem(thumbnail, capsys):
+    registros = [{'tipo': 'foto', 'name': 'IMG_RUIM.jpg', 'thumbnail': thumbnail},
+                 {'tipo': 'foto', 'name': 'IMG_SEM.jpg'}]
+    prs = montagem.build_deck({'slides': registros})
+    assert len(prs.slides) == 2
+    for slide in prs.slides:
+        textos = [s.text_frame.text for s in slide.shapes if s.has_text_frame]
+        assert "Sem imagem" in textos
+        assert not any(s.shape_type == MSO_SHAPE_TYPE.PICTURE for s in slide.shapes)
+    assert 'IMG_RUIM.jpg' in capsys.readouterr().err
@@ -0,0 +1,61 @@
+"""pacote: mídia do cache em disco gravada sem prender um descritor por imagem"""
+import io
+import os
+import resource
+import zipfile
+
+from PIL import Image
+from pptx import Presentation
+from pptx.util import Inches
+
+import pacote
+import telemetria
+
+def _fotos(diretorio, total):
+    caminhos = []
+    for i in range(total):
+        caminho = str(diretorio / f'{i:04d}.png')
+        Image.new('RGB', (8, 8), (i % 256, i // 256, 0)).save(caminho)
+        caminhos.append(caminho)
+    return caminhos
+
+def test_mais_imagens_que_descritores(tmp_path):
+    caminhos = _fotos(tmp_path, 300)
+    abertos = len(os.listdir('/proc/self/fd'))
+    suave, rigido = resource.getrlimit(resource.RLIMIT_NOFILE)
+    resource.setrlimit(resource.RLIMIT_NOFILE, (abertos + 100, rigido))
+    try:
+        prs = Presentation()
+        slide = prs.slides.add_slide(prs.slide_layouts[6])
+        for i, caminho in enumerate(caminhos):
+            pacote.adicionar_imagem(slide, Inches(i % 20 * 0.5), Inches(i // 20 * 0.5), caminho)
+        destino = io.BytesIO()
+        pacote.salvar(prs, destino)
+    finally:
+        resource.setrlimit(resource.RLIMIT_NOFILE, (suave, rigido))
+    with zipfile.ZipFile(destino) as zd:
+        midia = sorted(n for n in zd.namelist() if n.startswith('ppt/media/'))
+        assert len(midia) == 300
+        with open(caminhos[0], 'rb') as f:
+            assert zd.read('ppt/media/image1.png') == f.read()
+
+def test_registro_reaproveita_sem_abrir_arquivos(tmp_path, monkeypatch):
+    caminhos = _fotos(tmp_path, 3)
+    prs = Presentation()
+    slides = [prs.slides.add_slide(prs.slide_layouts[6]) for _ in range(4)]
+    abertos = len(os.listdir('/proc/self/fd'))
+    with telemetria.sessao() as medicao:
+        for slide in slides[:1]:
+            for caminho in caminhos:
+                pacote.adicionar_imagem(slide, 0, 0, caminho)
+        aberturas = []
+        monkeypatch.setattr(pacote, 'open', lambda *a, **k: aberturas.append(a) or open(*a, **k), raising=False)
+        for slide in slides[1:]:
+            for caminho in caminhos:
+                pacote.adicionar_imagem(slide, 0, 0, caminho)
+    assert aberturas == []
+    assert len(os.listdir('/proc/self/fd')) == abertos
+    assert len(pacote.registro_midia(prs.part.package).partes) == 3
+    contadores = medicao.relatorio()['contadores']
+    assert contadores['midia_unicas'] == 3 and contadores['midia_reaproveitadas'] == 9
+    assert contadores['midia_bytes_poupados'] == 3 * sum(os.path.getsize(c) for c in caminhos)
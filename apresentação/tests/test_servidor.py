@@ -0,0 +1,42 @@
+"""servidor.renderizar: as duas rotas usam o modelo do servidor"""
+import json
+
+from pptx import Presentation
+import pytest
+
+import servidor
+
+@pytest.fixture
+def modelo(tmp_path):
+    """Modelo padrão com título próprio, fácil de reconhecer no deck gerado"""
+    prs = Presentation()
+    prs.core_properties.title = 'Modelo da obra'
+    caminho = str(tmp_path / 'modelo.pptx')
+    prs.save(caminho)
+    return caminho
+
+@pytest.mark.parametrize('rota, corpo', [
+    ('/fotos', lambda foto: [foto(), foto()]),
+    ('/deck', lambda foto: {'slides': [foto(tipo='foto')]}),
+])
+def test_rotas_usam_o_modelo(tmp_path, modelo, foto, rota, corpo):
+    entrada = str(tmp_path / 'entrada.json')
+    with open(entrada, 'w', encoding='utf-8') as f:
+        json.dump(corpo(foto), f)
+    destino = str(tmp_path / 'deck.pptx')
+
+    slides, _, medicao = servidor.renderizar(rota, entrada, destino, {'modelo': modelo})
+
+    prs = Presentation(destino)
+    assert slides == len(prs.slides) >= 1
+    assert prs.core_properties.title == 'Modelo da obra'
+    assert medicao['contadores']['imagens'] == slides
+
+def test_pool_volta_com_todos_os_workers_aquecidos():
+    pool = servidor.iniciar_pool(2)
+    try:
+        # _aquecido depende da barreira posta pelo aquecimento: falharia num worker não aquecido
+        pids = {futuro.result() for futuro in [pool.submit(servidor._aquecido) for _ in range(2)]}
+        assert len(pids) == 2
+    finally:
+        pool.shutdown()
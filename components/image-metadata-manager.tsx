@@ -46,7 +46,15 @@ export default function ImageMetadataManager() {
     async (file: File) => {
       try {
         const text = await file.text()
-        const jsonData = JSON.parse(text) as ImageMetadata[]
+        // Backup da aplicação (array JSON) ou JSONL gerado pelo extrair_exif.py
+        const jsonData = (
+          text.trimStart().startsWith("[")
+            ? JSON.parse(text)
+            : text
+                .split("\n")
+                .filter((line) => line.trim())
+                .map((line) => JSON.parse(line))
+        ) as ImageMetadata[]
 
         // Validar e normalizar coordenadas
         const normalizedData = jsonData.map((item, idx) => ({
@@ -111,7 +111,7 @@ export function IntroSection({ onFilesUpload, onJsonUpload, isProcessing }: Intr
                 onClick={() => {
                   const input = document.createElement("input")
                   input.type = "file"
-                  input.accept = ".json"
+                  input.accept = ".json,.jsonl"
                   input.onchange = (e) => {
                     const file = (e.target as HTMLInputElement).files?.[0]
                     if (file) onJsonUpload(file)